@@ -0,0 +1,112 @@
+"""
+Boss special abilities.
+
+Each ability is an Ability object registered under an integer id;
+ABILITIES, indexed by id, is the dispatch table. A Boss resolves its
+ability's name once, when it is given one, and from then on calls the
+Ability directly, so using an ability costs the same however many are
+registered. Damage multipliers come from constants.py.
+
+A new ability plugs in with register(), or with an Ability subclass that
+overrides damage() for a different formula; Boss needs no changes.
+"""
+from typing import Dict, List, Optional
+
+from constants import (
+    ABILITY_FIRE_BREATH_DAMAGE, ABILITY_ICE_NOVA_DAMAGE, ABILITY_SHADOW_STRIKE_DAMAGE
+)
+
+
+class Ability:
+    """A boss special ability dealing a fraction of the boss's base damage."""
+    __slots__ = ("id", "name", "scale")
+
+    def __init__(self, ability_id: int, name: Optional[str], scale: float):
+        """
+        Initialise an ability; use register() to add one to the table.
+
+        Args:
+            ability_id (int): Index into ABILITIES
+            name (str, optional): Name shown in game text; None for no ability
+            scale (float): Fraction of the boss's base damage dealt
+        """
+        self.id = ability_id
+        self.name = name
+        self.scale = scale
+
+    def damage(self, base_damage: float, intelligence: int) -> float:
+        """
+        Work out the ability's damage.
+
+        Args:
+            base_damage (float): The boss's base damage
+            intelligence (int): The boss's intelligence; 1% more damage per point
+
+        Returns:
+            float: Damage dealt by one use
+        """
+        return base_damage * self.scale * (1 + intelligence / 100)
+
+    def with_scale(self, scale: float) -> 'Ability':
+        """
+        Copy the ability with a different damage multiplier, e.g. to try out
+        a balance change on one boss.
+
+        Args:
+            scale (float): The new fraction of base damage
+
+        Returns:
+            Ability: The copy, with the same id and name
+        """
+        return type(self)(self.id, self.name, scale)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.id}, {self.name!r}, {self.scale})"
+
+
+# Ability id -> ability
+ABILITIES: List[Ability] = []
+_BY_NAME: Dict[Optional[str], Ability] = {}
+
+
+def register(name: Optional[str], scale: float, ability_class: type = Ability) -> Ability:
+    """
+    Add an ability to the table under the next free id.
+
+    Args:
+        name (str, optional): Ability name, as given to Boss
+        scale (float): Fraction of the boss's base damage dealt
+        ability_class (type): Ability or a subclass with its own damage()
+
+    Returns:
+        Ability: The registered ability
+    """
+    if name in _BY_NAME:
+        raise ValueError(f"Ability already registered: {name}")
+    ability = ability_class(len(ABILITIES), name, scale)
+    ABILITIES.append(ability)
+    _BY_NAME[name] = ability
+    return ability
+
+
+def get_ability(name: Optional[str]) -> Ability:
+    """
+    Look up an ability by name.
+
+    Args:
+        name (str, optional): Ability name; None for no ability
+
+    Returns:
+        Ability: The registered ability; NO_ABILITY for None
+    """
+    ability = _BY_NAME.get(name)
+    if ability is None:
+        raise ValueError(f"Unknown special ability: {name}; add it with abilities.register")
+    return ability
+
+
+# Id 0, which is false, so `if boss.ability.id` tests for an ability
+NO_ABILITY = register(None, 0.0)
+FIRE_BREATH = register("Fire Breath", ABILITY_FIRE_BREATH_DAMAGE)
+ICE_NOVA = register("Ice Nova", ABILITY_ICE_NOVA_DAMAGE)
+SHADOW_STRIKE = register("Shadow Strike", ABILITY_SHADOW_STRIKE_DAMAGE)
@@ -0,0 +1,383 @@
+"""
+Automated balance tuner for the constants in constants.py.
+
+Searches boss health and damage, boss ability strength and weapon damage
+for a set of values that brings the Hero's win rate close to a target for
+every boss and weapon pairing.
+
+The search is a (1 + lambda) local search: each generation proposes a few
+candidates next to the current best set and races them against it.
+
+- Common random numbers: within a generation every candidate is simulated
+  with the same random streams as the current best set, so the
+  differences between them come from the parameters rather than luck.
+- Early stopping: candidates are simulated in stages of growing size, and
+  one that is clearly worse than the current best after a stage is
+  dropped instead of being simulated in full.
+- Candidates are simulated on a process pool.
+
+The result is a proposed block of constants, the exact win rates it gives
+(from solver.py) and the convergence history of the search.
+"""
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import constants
+from character import BOSS_TYPES
+from weapon import Weapon, WEAPON_TYPES
+from simulation import FightSpec, create_player, create_boss, spec_from_characters, run_fights
+from parallel_simulation import derive_seed
+from solver import solve
+
+# Constants each boss's matchups depend on: health, damage, ability strength
+BOSS_PARAMETERS = {
+    "goblin_king": ("BOSS_GOBBLIN_KING_HEALTH", "BOSS_GOBBLIN_KING_DAMAGE",
+                    "ABILITY_FIRE_BREATH_DAMAGE"),
+    "ice_sorcerer": ("BOSS_ICE_SORCERER_HEALTH", "BOSS_ICE_SORCERER_DAMAGE",
+                     "ABILITY_ICE_NOVA_DAMAGE"),
+    "shadow_knight": ("BOSS_SHADOW_KNIGHT_HEALTH", "BOSS_SHADOW_KNIGHT_DAMAGE",
+                      "ABILITY_SHADOW_STRIKE_DAMAGE"),
+}
+
+WEAPON_PARAMETERS = {
+    "rock": "WEAPON_ROCK_DAMAGE",
+    "paper": "WEAPON_PAPER_DAMAGE",
+    "scissors": "WEAPON_SCISSORS_DAMAGE",
+    "sword": "WEAPON_SWORD_DAMAGE",
+    "bow": "WEAPON_BOW_DAMAGE",
+    "staff": "WEAPON_STAFF_DAMAGE",
+}
+
+# Search space: constant name -> (lowest value, highest value, step)
+PARAMETER_SPACE: Dict[str, Tuple[float, float, float]] = {}
+for _health, _damage, _ability in BOSS_PARAMETERS.values():
+    PARAMETER_SPACE[_health] = (20, 150, 1)
+    PARAMETER_SPACE[_damage] = (2, 20, 1)
+    PARAMETER_SPACE[_ability] = (0.0, 1.5, 0.05)
+for _weapon in WEAPON_PARAMETERS.values():
+    PARAMETER_SPACE[_weapon] = (1, 15, 1)
+
+PARAMETER_NAMES = tuple(PARAMETER_SPACE)
+
+# Target win rate for each boss, whichever weapon the Hero picks
+DEFAULT_TARGETS = {
+    "goblin_king": 0.70,
+    "ice_sorcerer": 0.60,
+    "shadow_knight": 0.50,
+}
+
+# Fights per pairing in each racing stage; a candidate must survive one
+# stage to be simulated in the next
+DEFAULT_STAGES = (1_000, 4_000, 16_000)
+
+# A candidate is dropped when its loss is this many standard errors above
+# the current best set's loss
+DROP_MARGIN = 2.0
+
+# Pairings in a fixed order: every (boss, weapon)
+Pairing = Tuple[str, str]
+PAIRINGS: List[Pairing] = [(boss_type, weapon_type)
+                           for boss_type in BOSS_TYPES for weapon_type in WEAPON_TYPES]
+
+# Candidate parameter values, in PARAMETER_NAMES order
+Candidate = Tuple[float, ...]
+
+
+class GenerationRecord(NamedTuple):
+    """Convergence history entry for one generation of the search."""
+    generation: int
+    # Loss of the best set after this generation, measured in its final stage
+    loss: float
+    accepted: bool
+    candidates: int
+    stopped_early: int
+    fights: int
+    elapsed: float
+
+
+class TuningResult(NamedTuple):
+    """Outcome of a tuning run."""
+    parameters: Dict[str, float]
+    targets: Dict[Pairing, float]
+    history: List[GenerationRecord]
+
+
+def current_parameters() -> Dict[str, float]:
+    """
+    Read the tunable values currently set in constants.py.
+
+    Returns:
+        Dict[str, float]: Value of every constant in PARAMETER_SPACE
+    """
+    return {name: getattr(constants, name) for name in PARAMETER_NAMES}
+
+
+def pairing_targets(per_boss: Optional[Dict[str, float]] = None) -> Dict[Pairing, float]:
+    """
+    Expand per-boss target win rates to every pairing.
+
+    Args:
+        per_boss (Dict[str, float], optional): Target win rate per boss;
+            defaults to DEFAULT_TARGETS
+
+    Returns:
+        Dict[Pairing, float]: Target win rate keyed by (boss, weapon)
+    """
+    per_boss = per_boss or DEFAULT_TARGETS
+    return {(boss_type, weapon_type): per_boss[boss_type] for boss_type, weapon_type in PAIRINGS}
+
+
+def build_specs(parameters: Dict[str, float]) -> Dict[Pairing, List[FightSpec]]:
+    """
+    Build the fight specs of every pairing for a set of parameter values.
+
+    The characters are created as the game creates them and then given the
+    candidate values, so every other rule still comes from the real classes.
+
+    Args:
+        parameters (Dict[str, float]): Value of every constant in PARAMETER_SPACE
+
+    Returns:
+        Dict[Pairing, List[FightSpec]]: One spec per boss weapon, keyed by (boss, weapon)
+    """
+    weapons = {weapon_type: Weapon(WEAPON_TYPES[weapon_type]().name, parameters[name])
+               for weapon_type, name in WEAPON_PARAMETERS.items()}
+    specs = {}
+    for boss_type, weapon_type in PAIRINGS:
+        health, damage, ability = BOSS_PARAMETERS[boss_type]
+        matchup = []
+        for boss_weapon in WEAPON_TYPES:
+            player = create_player(weapon_type)
+            player.weapon = weapons[weapon_type]
+            boss = create_boss(boss_type, boss_weapon)
+            boss.weapon = weapons[boss_weapon]
+            boss.health = parameters[health]
+            boss.base_damage = parameters[damage]
+            boss.ability = boss.ability.with_scale(parameters[ability])
+            matchup.append(spec_from_characters(player, boss))
+        specs[(boss_type, weapon_type)] = matchup
+    return specs
+
+
+def evaluate(task: Tuple[Candidate, int, int]) -> Tuple[int, ...]:
+    """
+    Simulate one candidate; executed inside the worker processes.
+
+    Every pairing's random stream depends only on the stage seed and the
+    pairing, never on the candidate, which is what makes the random
+    numbers common to all candidates in a stage.
+
+    Args:
+        task (Tuple[Candidate, int, int]): Candidate values, fights per
+            pairing and stage seed
+
+    Returns:
+        Tuple[int, ...]: Wins per pairing, in PAIRINGS order
+    """
+    candidate, fights, stage_seed = task
+    specs = build_specs(dict(zip(PARAMETER_NAMES, candidate)))
+    return tuple(
+        run_fights(specs[pairing], fights, random.Random(derive_seed(stage_seed, *pairing))).wins
+        for pairing in PAIRINGS
+    )
+
+
+def score(wins: Sequence[int], fights: int, targets: Sequence[float]) -> Tuple[float, float]:
+    """
+    Loss of a simulated candidate and its standard error.
+
+    The loss is the mean squared distance between each pairing's win rate
+    and its target.
+
+    Args:
+        wins (Sequence[int]): Wins per pairing
+        fights (int): Fights per pairing
+        targets (Sequence[float]): Target win rate per pairing, in the same order
+
+    Returns:
+        Tuple[float, float]: Loss and its standard error
+    """
+    loss = variance = 0.0
+    for won, target in zip(wins, targets):
+        rate = won / fights
+        error = rate - target
+        sampling = rate * (1 - rate) / fights
+        loss += error * error
+        # Variance of a squared binomial proportion estimate
+        variance += 4 * error * error * sampling + 2 * sampling * sampling
+    count = len(targets)
+    return loss / count, math.sqrt(variance) / count
+
+
+def mutate(candidate: Candidate, rng: random.Random, max_changes: int = 3) -> Candidate:
+    """
+    Propose a neighbouring candidate by stepping a few parameters up or down.
+
+    Args:
+        candidate (Candidate): Values to start from
+        rng (random.Random): Source of randomness
+        max_changes (int): Most parameters changed at once
+
+    Returns:
+        Candidate: The new values, kept within PARAMETER_SPACE
+    """
+    values = list(candidate)
+    for index in rng.sample(range(len(values)), rng.randint(1, max_changes)):
+        low, high, step = PARAMETER_SPACE[PARAMETER_NAMES[index]]
+        value = values[index] + step * rng.choice((-2, -1, 1, 2))
+        # Keep fractional steps free of rounding drift
+        values[index] = min(high, max(low, round(value, 6)))
+    return tuple(values)
+
+
+def tune(generations: int = 30, population: int = 8, seed: int = 0,
+         workers: Optional[int] = None, targets: Optional[Dict[Pairing, float]] = None,
+         start: Optional[Dict[str, float]] = None,
+         stages: Sequence[int] = DEFAULT_STAGES, tolerance: float = 0.0,
+         progress=None) -> TuningResult:
+    """
+    Search for constants that bring every pairing close to its target win rate.
+
+    Args:
+        generations (int): Most generations to run
+        population (int): Candidates proposed per generation
+        seed (int): Master seed; the search is reproducible for a given seed
+            whatever the number of workers
+        workers (int, optional): Number of processes; defaults to the CPU
+            count. With one worker everything runs in this process.
+        targets (Dict[Pairing, float], optional): Target win rate per
+            (boss, weapon); defaults to pairing_targets()
+        start (Dict[str, float], optional): Values to start from; defaults
+            to the current constants
+        stages (Sequence[int]): Fights per pairing in each racing stage
+        tolerance (float): Stop once the best set's loss is at or below this
+        progress (callable, optional): Called with each GenerationRecord
+
+    Returns:
+        TuningResult: The best values found and the convergence history
+    """
+    targets = targets or pairing_targets()
+    target_list = [targets[pairing] for pairing in PAIRINGS]
+    start = start or current_parameters()
+    best: Candidate = tuple(start[name] for name in PARAMETER_NAMES)
+    rng = random.Random(derive_seed(seed, "mutations"))
+    workers = workers or os.cpu_count() or 1
+    history: List[GenerationRecord] = []
+
+    pool: Optional[Executor] = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for generation in range(1, generations + 1):
+            started = time.perf_counter()
+            candidates = list(dict.fromkeys(mutate(best, rng) for _ in range(population)))
+            candidates = [candidate for candidate in candidates if candidate != best]
+            # The current best set races too, on the same random streams
+            alive = [best] + candidates
+            fights_run = 0
+            stopped = 0
+            for stage, fights in enumerate(stages):
+                stage_seed = derive_seed(seed, generation, stage)
+                tasks = [(candidate, fights, stage_seed) for candidate in alive]
+                wins = list(pool.map(evaluate, tasks) if pool else map(evaluate, tasks))
+                fights_run += fights * len(PAIRINGS) * len(alive)
+                scores = [score(won, fights, target_list) for won in wins]
+                best_loss, best_error = scores[0]
+                survivors = [best]
+                survivor_scores = [scores[0]]
+                for candidate, (loss, error) in zip(alive[1:], scores[1:]):
+                    if loss - best_loss > DROP_MARGIN * math.hypot(error, best_error):
+                        stopped += 1
+                    else:
+                        survivors.append(candidate)
+                        survivor_scores.append((loss, error))
+                alive, scores = survivors, survivor_scores
+
+            # Only candidates that survived every stage can replace the best set
+            winner = min(range(len(alive)), key=lambda index: scores[index][0])
+            accepted = winner != 0
+            best = alive[winner]
+            record = GenerationRecord(generation, scores[winner][0], accepted, len(candidates),
+                                      stopped, fights_run, time.perf_counter() - started)
+            history.append(record)
+            if progress:
+                progress(record)
+            if record.loss <= tolerance:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return TuningResult(dict(zip(PARAMETER_NAMES, best)), targets, history)
+
+
+def exact_win_rates(parameters: Dict[str, float]) -> Dict[Pairing, float]:
+    """
+    Exact win rate of every pairing for a set of parameter values.
+
+    Args:
+        parameters (Dict[str, float]): Value of every constant in PARAMETER_SPACE
+
+    Returns:
+        Dict[Pairing, float]: Win probability keyed by (boss, weapon)
+    """
+    return {
+        pairing: sum(solve(spec).win for spec in matchup) / len(matchup)
+        for pairing, matchup in build_specs(parameters).items()
+    }
+
+
+def format_constants(parameters: Dict[str, float]) -> str:
+    """
+    Write parameter values as lines to paste into constants.py.
+
+    Args:
+        parameters (Dict[str, float]): Value of every constant in PARAMETER_SPACE
+
+    Returns:
+        str: One NAME = value line per constant
+    """
+    return "\n".join(f"{name} = {value:g}" for name, value in parameters.items())
+
+
+def main() -> None:
+    """Tune from the command line and print the proposal and its history."""
+    generations = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    output = sys.argv[4] if len(sys.argv) > 4 else None
+
+    print(f"{'Gen':>4}{'Loss':>10}{'Accepted':>10}{'Stopped':>9}{'Fights':>12}{'Time':>8}")
+
+    def show(record: GenerationRecord) -> None:
+        print(f"{record.generation:>4}{record.loss:>10.5f}{'yes' if record.accepted else '':>10}"
+              f"{record.stopped_early:>5}/{record.candidates:<3}{record.fights:>12,}"
+              f"{record.elapsed:>7.2f}s")
+
+    result = tune(generations, seed=seed, workers=workers, progress=show)
+    before = exact_win_rates(current_parameters())
+    after = exact_win_rates(result.parameters)
+
+    print("\nProposed constants:")
+    print(format_constants(result.parameters))
+    print(f"\n{'Boss':<15}{'Weapon':<10}{'Target':>8}{'Before':>8}{'After':>8}")
+    for pairing in PAIRINGS:
+        print(f"{pairing[0]:<15}{pairing[1]:<10}{result.targets[pairing]:>8.3f}"
+              f"{before[pairing]:>8.3f}{after[pairing]:>8.3f}")
+
+    if output:
+        with open(output, "w") as report:
+            json.dump({
+                "parameters": result.parameters,
+                "exact_win_rates": {f"{boss}/{weapon}": rate for (boss, weapon), rate in after.items()},
+                "history": [record._asdict() for record in result.history],
+            }, report, indent=2)
+        print(f"\nWrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Vectorised battle simulator.
+
+Stores many duels as NumPy arrays (one array per stat) and advances all of
+them together, one turn at a time, dropping duels as soon as they finish.
+"""
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from weapon import WEAPON_TYPES
+from constants import (
+    CRITICAL_HIT_CHANCE,
+    ATTRIBUTE_STRENGTH, ATTRIBUTE_AGILITY, ATTRIBUTE_INTELLIGENCE
+)
+from simulation import (
+    HP_BUCKET_SIZE, MAX_TURNS, SimulationResult, create_player, create_boss,
+    spec_from_characters
+)
+
+# Duels are simulated in chunks of this size to bound memory use
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+class DuelBatch:
+    """
+    A batch of Hero-vs-boss duels stored as a struct of arrays.
+
+    Each attribute holds one value per duel, so a whole turn of every duel
+    is a handful of array operations instead of thousands of method calls.
+    """
+    def __init__(self, size: int):
+        """
+        Allocate arrays for a batch of duels.
+
+        Args:
+            size (int): Number of duels in the batch
+        """
+        self.size = size
+        self.player_health = np.zeros(size)
+        self.player_base_damage = np.zeros(size)
+        self.player_weapon_damage = np.zeros(size)
+        self.player_strength = np.zeros(size, dtype=np.int16)
+        self.player_agility = np.zeros(size, dtype=np.int16)
+        self.player_intelligence = np.zeros(size, dtype=np.int16)
+        self.boss_health = np.zeros(size)
+        self.boss_base_damage = np.zeros(size)
+        self.boss_weapon_damage = np.zeros(size)
+        self.boss_strength = np.zeros(size, dtype=np.int16)
+        self.boss_agility = np.zeros(size, dtype=np.int16)
+        self.boss_intelligence = np.zeros(size, dtype=np.int16)
+        self.ability_damage = np.zeros(size)
+        self.ability_recharge = np.zeros(size, dtype=np.int16)
+        self.ability_ready = np.zeros(size, dtype=bool)
+        self.ability_cooldown = np.zeros(size, dtype=np.int16)
+
+    @classmethod
+    def from_matchup(cls, boss_type: str, weapon_type: str, size: int,
+                     rng: np.random.Generator,
+                     boss_weapon_type: Optional[str] = None) -> 'DuelBatch':
+        """
+        Fill a batch from the game's own character and weapon classes.
+
+        Args:
+            boss_type (str): Key into BOSS_TYPES
+            weapon_type (str): Player weapon key into WEAPON_TYPES
+            size (int): Number of duels
+            rng (np.random.Generator): Used to pick random boss weapons
+            boss_weapon_type (str, optional): Fixed boss weapon; by default
+                each duel gets a random one, as in Game.setup_game
+
+        Returns:
+            DuelBatch: The populated batch
+        """
+        batch = cls(size)
+        player = create_player(weapon_type)
+        boss = create_boss(boss_type, boss_weapon_type or weapon_type)
+
+        batch.player_health[:] = player.health
+        batch.player_base_damage[:] = player.base_damage
+        batch.player_weapon_damage[:] = player.weapon.attack()
+        batch.player_strength[:] = player.get_attribute(ATTRIBUTE_STRENGTH)
+        batch.player_agility[:] = player.get_attribute(ATTRIBUTE_AGILITY)
+        batch.player_intelligence[:] = player.get_attribute(ATTRIBUTE_INTELLIGENCE)
+
+        batch.boss_health[:] = boss.health
+        batch.boss_base_damage[:] = boss.base_damage
+        if boss_weapon_type:
+            batch.boss_weapon_damage[:] = boss.weapon.attack()
+        else:
+            damages = np.array([weapon().attack() for weapon in WEAPON_TYPES.values()], dtype=float)
+            batch.boss_weapon_damage[:] = damages[rng.integers(len(damages), size=size)]
+        batch.boss_strength[:] = boss.get_attribute(ATTRIBUTE_STRENGTH)
+        batch.boss_agility[:] = boss.get_attribute(ATTRIBUTE_AGILITY)
+        batch.boss_intelligence[:] = boss.get_attribute(ATTRIBUTE_INTELLIGENCE)
+        # Measured with the boss's own Ability, so damage() overrides carry over
+        spec = spec_from_characters(player, boss)
+        batch.ability_damage[:] = spec.ability_damage
+        batch.ability_recharge[:] = spec.ability_cooldown
+        batch.ability_ready[:] = boss.ability_ready and bool(boss.ability.id)
+        batch.ability_cooldown[:] = boss.ability_cooldown
+        return batch
+
+    def run(self, rng: np.random.Generator) -> SimulationResult:
+        """
+        Fight every duel in the batch to the end.
+
+        Follows the same rules as Game.run: the player attacks (twice on a
+        critical hit), then the boss uses its ability if ready and attacks,
+        then the boss cooldown ticks down.
+
+        Args:
+            rng (np.random.Generator): Source of randomness
+
+        Returns:
+            SimulationResult: Outcome statistics for the batch
+        """
+        # Derived stats, using the formulas from Character and Boss.attack
+        player_damage = self.player_base_damage * (1 + self.player_strength / 10) + self.player_weapon_damage
+        boss_damage = self.boss_base_damage * 1.5 * (1 + self.boss_strength / 10) + self.boss_weapon_damage
+        ability_damage = self.ability_damage
+        player_dodge = self.player_agility / 100
+        boss_dodge = self.boss_agility / 100
+        has_ability = self.ability_damage > 0
+
+        # Working set of unfinished duels; finished ones are written out
+        index = np.arange(self.size)
+        player_hp = self.player_health.copy()
+        boss_hp = self.boss_health.copy()
+        ready = self.ability_ready.copy()
+        cooldown = self.ability_cooldown.astype(np.int32)
+        final_player_hp = np.empty(self.size)
+        final_boss_hp = np.empty(self.size)
+        final_turns = np.empty(self.size, dtype=np.int32)
+
+        turn = 0
+        while index.size:
+            active = (player_hp > 0) & (boss_hp > 0)
+            if turn >= MAX_TURNS:
+                active[:] = False
+            if not active.all():
+                done = ~active
+                final_player_hp[index[done]] = player_hp[done]
+                final_boss_hp[index[done]] = boss_hp[done]
+                final_turns[index[done]] = turn
+                index, player_hp, boss_hp, ready, cooldown = (
+                    index[active], player_hp[active], boss_hp[active], ready[active], cooldown[active])
+                if not index.size:
+                    break
+            turn += 1
+            count = index.size
+
+            # Player's turn
+            crit = rng.random(count) < CRITICAL_HIT_CHANCE
+            evade = boss_dodge[index]
+            hits = (rng.random(count) > evade).astype(np.int8)
+            hits += crit & (rng.random(count) > evade)
+            boss_hp -= player_damage[index] * hits
+
+            # Boss's turn
+            evade = player_dodge[index]
+            ability_hit = ready & (rng.random(count) > evade)
+            attack_hit = rng.random(count) > evade
+            player_hp -= ability_damage[index] * ability_hit + boss_damage[index] * attack_hit
+            cooldown[ready] = self.ability_recharge[index[ready]]
+            ready[:] = False
+
+            # Boss.update
+            cooling = has_ability[index]
+            cooldown[cooling] -= 1
+            ready[cooling & (cooldown <= 0)] = True
+
+        return _summarise(final_player_hp, final_boss_hp, final_turns)
+
+
+def _summarise(player_hp: np.ndarray, boss_hp: np.ndarray, turns: np.ndarray) -> SimulationResult:
+    """Fold per-duel outcomes into a SimulationResult."""
+    result = SimulationResult()
+    won = (player_hp > 0) & (boss_hp <= 0)
+    result.fights = int(turns.size)
+    result.wins = int(won.sum())
+    result.total_turns = int(turns.sum())
+    result.turns.update(_histogram(turns))
+    result.player_hp_remaining.update(_histogram((player_hp[won] // HP_BUCKET_SIZE).astype(np.int64)))
+    lost_boss_hp = np.maximum(boss_hp[~won], 0)
+    result.boss_hp_remaining.update(_histogram((lost_boss_hp // HP_BUCKET_SIZE).astype(np.int64)))
+    return result
+
+
+def _histogram(values: np.ndarray) -> dict:
+    """Count occurrences of each non-negative integer value."""
+    counts = np.bincount(values) if values.size else np.zeros(0, dtype=np.int64)
+    return {int(value): int(count) for value, count in enumerate(counts) if count}
+
+
+def simulate_batch(boss_type: str, weapon_type: str, duels: int,
+                   seed: Optional[int] = None,
+                   boss_weapon_type: Optional[str] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> SimulationResult:
+    """
+    Simulate many duels between the Hero and one boss type.
+
+    Args:
+        boss_type (str): Key into BOSS_TYPES
+        weapon_type (str): Player weapon key into WEAPON_TYPES
+        duels (int): Number of duels to run
+        seed (int, optional): Seed for reproducible results
+        boss_weapon_type (str, optional): Fixed boss weapon
+        chunk_size (int): Maximum number of duels held in memory at once
+
+    Returns:
+        SimulationResult: The outcome statistics
+    """
+    rng = np.random.default_rng(seed)
+    result = SimulationResult()
+    remaining = duels
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        batch = DuelBatch.from_matchup(boss_type, weapon_type, size, rng, boss_weapon_type)
+        result.merge(batch.run(rng))
+        remaining -= size
+    return result
+
+
+def main() -> None:
+    """Run a vectorised simulation from the command line."""
+    duels = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    boss_type = sys.argv[2] if len(sys.argv) > 2 else "goblin_king"
+    weapon_type = sys.argv[3] if len(sys.argv) > 3 else "sword"
+    start = time.perf_counter()
+    result = simulate_batch(boss_type, weapon_type, duels)
+    elapsed = time.perf_counter() - start
+    print(f"{boss_type} vs {weapon_type}: win rate {result.win_rate:.4f}, "
+          f"mean turns {result.mean_turns:.3f}")
+    print(f"{duels} duels in {elapsed:.2f}s ({duels / elapsed:,.0f} duels/second)")
+
+
+if __name__ == "__main__":
+    main()
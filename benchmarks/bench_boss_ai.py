@@ -0,0 +1,78 @@
+"""
+Benchmark for the expectimax boss controller.
+
+Plays bot games in which the boss decides with an ExpectimaxController and
+reports the nodes searched per second and the time taken per move against
+the controller's time budget. A second pass searches a fixed depth with no
+time limit, measuring raw search speed without the clock checks cutting
+searches short.
+
+Run from the project root:
+    python -m benchmarks.bench_boss_ai [games] [time budget in ms]
+"""
+import statistics
+import sys
+import time
+from typing import List
+
+from boss_ai import ExpectimaxController, DEFAULT_TIME_BUDGET
+from game import Game
+from rpg_game.utils.input_providers import PolicyInput, always
+
+# Depth of the fixed-depth pass; deep enough to dominate setup costs
+FIXED_DEPTH = 8
+
+
+class _TimedController(ExpectimaxController):
+    """Controller that records the time of every move."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.move_times: List[float] = []
+        self.depths: List[int] = []
+
+    def use_ability(self, boss, target) -> bool:
+        before = self.search_time
+        use = super().use_ability(boss, target)
+        self.move_times.append(self.search_time - before)
+        self.depths.append(self.last_depth)
+        return use
+
+
+def play(games: int, controller: ExpectimaxController) -> int:
+    """Play bot games against controlled bosses; returns the Hero's wins."""
+    wins = 0
+    for seed in range(games):
+        game = Game(seed, player_input=PolicyInput(always('1')), boss_controller=controller)
+        game.run()
+        wins += game.player.is_alive() and not game.boss.is_alive()
+    return wins
+
+
+def main() -> None:
+    """Time boss decisions under the budget, then raw fixed-depth search."""
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    budget = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else DEFAULT_TIME_BUDGET
+
+    controller = _TimedController(time_budget=budget)
+    wins = play(games, controller)
+    times = sorted(controller.move_times)
+    p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+    over = sum(elapsed > budget for elapsed in times)
+    print(f"Budgeted search ({budget * 1000:.1f} ms per move), {games} games, Hero won {wins}:")
+    print(f"  {controller.report()}")
+    print(f"  move time p50 {statistics.median(times) * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, "
+          f"{over} of {len(times)} moves over budget")
+    print(f"  depth reached: median {statistics.median(controller.depths):.0f}, "
+          f"max {max(controller.depths)} turns")
+
+    fixed = ExpectimaxController(time_budget=float("inf"), max_depth=FIXED_DEPTH)
+    start = time.perf_counter()
+    play(games // 10 or 1, fixed)
+    elapsed = time.perf_counter() - start
+    print(f"Fixed depth {FIXED_DEPTH}, no time limit: {fixed.report()}")
+    print(f"  {elapsed:.2f} s in total")
+
+
+if __name__ == "__main__":
+    main()
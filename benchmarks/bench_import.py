@@ -0,0 +1,80 @@
+"""
+Import-time benchmark for the RPG game's startup path.
+
+Starts fresh interpreters with ``python -X importtime -c "import rpg_game.main"``,
+reads the cumulative import time of rpg_game.main from the report and
+compares the median with a budget. Exits with status 1 if the budget is
+exceeded, so it can guard against startup regressions.
+
+Run from the project root:
+    python -m benchmarks.bench_import [runs] [budget in ms]
+"""
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+MODULE = "rpg_game.main"
+# Median cumulative import time allowed for MODULE, in milliseconds; about
+# twice what it takes on a typical machine, to leave room for slower hosts
+IMPORT_BUDGET_MS = 60.0
+# Modules the startup path must not load; they are only needed once a
+# screen is drawn or a message shown
+DEFERRED_MODULES = ("colorama", "shutil", "rpg_game.utils.screen", "rpg_game.messages")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str = MODULE) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter and collect its -X importtime report.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        Dict[str, int]: Module name -> cumulative import time in microseconds
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    """Measure the startup path and check it against the budget."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else IMPORT_BUDGET_MS
+    samples: List[Dict[str, int]] = [import_times() for _ in range(runs)]
+    totals = [sample[MODULE] / 1000 for sample in samples]
+    median = statistics.median(totals)
+
+    print(f"import {MODULE}: median {median:.1f} ms, min {min(totals):.1f} ms "
+          f"over {runs} runs (budget {budget:.0f} ms)")
+    print("Slowest project modules (median cumulative ms):")
+    names = [name for name in samples[0] if name.startswith("rpg_game")]
+    medians = {name: statistics.median(sample.get(name, 0) for sample in samples) / 1000
+               for name in names}
+    for name, value in sorted(medians.items(), key=lambda item: -item[1])[:8]:
+        print(f"  {name:<35}{value:8.2f}")
+
+    loaded = [name for name in DEFERRED_MODULES if name in samples[0]]
+    if loaded:
+        print(f"FAIL: startup path loads deferred modules: {', '.join(loaded)}")
+        sys.exit(1)
+    if median > budget:
+        print(f"FAIL: import time is over budget by {median - budget:.1f} ms")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Load test for GameLogger with the buffered file backend.
+
+Logs a burst of combat events and reports how long the game loop spent
+in log_combat, showing that it never waits for the disk.
+
+Run from the project root:
+    python -m benchmarks.bench_logger [events]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from rpg_game.character import Character, Boss
+from rpg_game.utils.logger import GameLogger, FileLogBackend
+
+
+def main() -> None:
+    """Log many combat events and print latency figures."""
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    player = Character("Hero", 100, 10, "Sword", 6)
+    boss = Boss("Goblin King", 50, 8)
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "combat.log")
+
+    with FileLogBackend(path, max_bytes=16 * 1024 * 1024) as backend:
+        logger = GameLogger(log_to_console=False, backend=backend)
+        durations = [0.0] * events
+        clock = time.perf_counter
+        start = clock()
+        for index in range(events):
+            before = clock()
+            logger.log_combat(player, boss, index % 30)
+            durations[index] = clock() - before
+        elapsed = clock() - start
+        backend.flush()
+        drained = time.perf_counter() - start
+
+    durations.sort()
+    p99 = durations[int(events * 0.99)]
+    files = os.listdir(directory)
+    print(f"Events logged:        {events:,}")
+    print(f"Game loop time:       {elapsed:.2f}s ({events / elapsed:,.0f} events/second)")
+    print(f"log_combat p99 / max: {p99 * 1e6:.1f} / {durations[-1] * 1e6:.0f} microseconds")
+    print(f"All records on disk:  {drained:.2f}s")
+    print(f"Written / dropped:    {backend.written:,} / {backend.dropped:,}")
+    print(f"Log files:            {', '.join(sorted(files))} in {directory}")
+
+
+if __name__ == "__main__":
+    main()
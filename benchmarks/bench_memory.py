@@ -0,0 +1,110 @@
+"""
+Memory benchmark for large populations of combatants.
+
+Compares bytes per combatant for the original layout (instance __dict__,
+an attributes dict and a private Weapon per character) with the slotted
+classes and shared weapons now used by character.py and weapon.py, and
+reports the same for bosses.
+
+Run from the project root:
+    python -m benchmarks.bench_memory [count]
+"""
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from character import Character, BOSS_TYPES
+from weapon import WEAPON_TYPES, get_weapon
+from constants import (
+    PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE,
+    ATTRIBUTE_STRENGTH, ATTRIBUTE_AGILITY, ATTRIBUTE_INTELLIGENCE
+)
+
+WEAPON_KEYS = list(WEAPON_TYPES)
+BOSS_CLASSES = list(BOSS_TYPES.values())
+
+
+class _LegacyWeapon:
+    """Weapon with the original dict-based layout."""
+    def __init__(self, name: str, damage: int, special_effect: str = None):
+        self.name = name
+        self.damage = damage
+        self.special_effect = special_effect
+
+
+class _LegacyCharacter:
+    """Character with the original dict-based layout."""
+    def __init__(self, name: str, health: int, damage: int):
+        self.name = name
+        self.health = health
+        self.base_damage = damage
+        self.weapon = None
+        self.rng = None
+        self.attributes = {
+            ATTRIBUTE_STRENGTH: 10,
+            ATTRIBUTE_AGILITY: 10,
+            ATTRIBUTE_INTELLIGENCE: 10
+        }
+
+
+def make_legacy(index: int) -> _LegacyCharacter:
+    """Create a combatant the way the game used to."""
+    character = _LegacyCharacter("Hero", PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE)
+    template = get_weapon(WEAPON_KEYS[index % len(WEAPON_KEYS)])
+    character.weapon = _LegacyWeapon(template.name, template.damage, template.special_effect)
+    return character
+
+
+def make_compact(index: int) -> Character:
+    """Create a combatant with slots and a shared weapon."""
+    character = Character("Hero", PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE)
+    character.weapon = get_weapon(WEAPON_KEYS[index % len(WEAPON_KEYS)])
+    return character
+
+
+def make_boss(index: int) -> Character:
+    """Create a boss with a shared weapon, as a fresh game does."""
+    boss = BOSS_CLASSES[index % len(BOSS_CLASSES)]()
+    boss.weapon = get_weapon(WEAPON_KEYS[index % len(WEAPON_KEYS)])
+    return boss
+
+
+def measure(factory: Callable[[int], object], count: int) -> float:
+    """
+    Measure the average memory used by one combatant.
+
+    Args:
+        factory (Callable[[int], object]): Creates the combatant for an index
+        count (int): Number of combatants to create
+
+    Returns:
+        float: Bytes per combatant
+    """
+    # Build the shared weapons before measuring so they are not counted
+    for key in WEAPON_KEYS:
+        get_weapon(key)
+    population: List[object] = [None] * count
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for index in range(count):
+        population[index] = factory(index)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def main() -> None:
+    """Print bytes per combatant before and after the compact layout."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    legacy = measure(make_legacy, count)
+    compact = measure(make_compact, count)
+    boss = measure(make_boss, count)
+    print(f"Combatants:           {count:,}")
+    print(f"Before (dict layout): {legacy:8.1f} bytes per combatant")
+    print(f"After (slots):        {compact:8.1f} bytes per combatant")
+    print(f"Saving:               {1 - compact / legacy:8.1%}")
+    print(f"Boss (slots):         {boss:8.1f} bytes per boss")
+
+
+if __name__ == "__main__":
+    main()
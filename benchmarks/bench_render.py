@@ -0,0 +1,88 @@
+"""
+Benchmark for the differential screen renderer.
+
+Draws a series of combat status screens into a pseudo-terminal, first the
+old way (a shell command to clear the screen, then the whole screen) and
+then with ScreenRenderer, and reports the time per frame and the bytes
+sent to the terminal.
+
+Run from the project root (Unix only, as it needs a pseudo-terminal):
+    python -m benchmarks.bench_render [frames]
+"""
+import io
+import os
+import pty
+import sys
+import threading
+import time
+
+from rpg_game.character import Character, Boss
+from rpg_game.constants import SEPARATOR_LENGTH
+from rpg_game.utils.screen import ScreenRenderer
+
+
+class _Terminal(io.TextIOWrapper):
+    """Text stream onto a pseudo-terminal that counts the bytes written."""
+
+    def __init__(self, fd: int) -> None:
+        super().__init__(io.FileIO(fd, "w", closefd=False), encoding="utf-8", write_through=True)
+        self.bytes_written = 0
+
+    def write(self, text: str) -> int:
+        self.bytes_written += len(text.encode())
+        return super().write(text)
+
+
+def _drain(fd: int) -> None:
+    """Read and discard terminal output so writes never block."""
+    try:
+        while os.read(fd, 65536):
+            pass
+    except OSError:
+        pass
+
+
+def _frames(count: int):
+    """Yield combat status screens for a fight that goes on for `count` turns."""
+    player = Character("Hero", 10 * count, 10, "Rock", 2)
+    boss = Boss("Goblin King", 10 * count, 8)
+    separator = "-" * SEPARATOR_LENGTH
+    for _ in range(count):
+        yield "\n".join((f"\n=============> LEVEL 1: {boss.name} <=============",
+                         player.describe(), separator, boss.describe(), separator))
+        player.set_health(player.get_health() - 7)
+        boss.set_health(boss.get_health() - 9)
+
+
+def main() -> None:
+    """Compare clearing the screen with a shell command against differential redraws."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    master, slave = pty.openpty()
+    threading.Thread(target=_drain, args=(master,), daemon=True).start()
+    terminal = _Terminal(slave)
+    clear = "cls" if os.name == "nt" else "clear"
+
+    start = time.perf_counter()
+    for frame in _frames(count):
+        os.system(f"{clear} > {os.ttyname(slave)}")
+        terminal.write(frame + "\n")
+        terminal.flush()
+    old_time = (time.perf_counter() - start) / count
+    old_bytes = terminal.bytes_written / count
+
+    terminal.bytes_written = 0
+    renderer = ScreenRenderer(terminal)
+    for frame in _frames(count):
+        renderer.render(frame)
+    new_bytes = terminal.bytes_written / count
+
+    print(f"Shell clear + full redraw: {old_time * 1e3:8.3f} ms per frame, {old_bytes:5.0f} bytes of text")
+    print(f"Differential ANSI redraw:  {renderer.total_render_time / count * 1e3:8.3f} ms per frame, "
+          f"{new_bytes:5.0f} bytes")
+    print(f"Renderer: {renderer.report()}")
+    os.close(slave)
+    os.close(master)
+
+
+if __name__ == "__main__":
+    main()
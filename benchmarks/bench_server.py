@@ -0,0 +1,115 @@
+"""
+Load test for the asyncio game server.
+
+Starts a GameServer on a free local port, connects thousands of
+simultaneous sessions and has every one of them attack turn after turn,
+starting a new game whenever one ends. Like real players, each client
+pauses between turns (THINK_TIME on average); with no pause the test
+only measures how long the queue of 5,000 requests takes to drain. Turn
+latency is the time from sending an action to receiving the next prompt.
+The clients share the server's event loop and CPU, so the figures are an
+upper bound.
+
+Run from the project root:
+    python -m benchmarks.bench_server [sessions] [turns per session] [think time]
+"""
+import asyncio
+import random
+import sys
+import time
+from typing import List
+
+from game_server import GameServer, PROMPT, GAME_OVER_PROMPT
+
+# Concurrent connection attempts while the sessions are being opened
+CONNECT_BATCH = 256
+# Mean seconds a player waits between turns
+THINK_TIME = 1.0
+
+
+_PROMPT_END = f"{PROMPT}\n".encode()
+_GAME_OVER_END = f"{GAME_OVER_PROMPT}\n".encode()
+
+
+async def _read_until_prompt(reader: asyncio.StreamReader) -> bool:
+    """Read game text until a prompt; returns True if the game is over."""
+    # The server sends each reply in one write ending with a prompt, so
+    # reading chunks is much cheaper for the client than reading lines
+    received = b""
+    while True:
+        chunk = await reader.read(65536)
+        if not chunk:
+            raise ConnectionError("Server closed the session")
+        received += chunk
+        if received.endswith(_PROMPT_END):
+            return False
+        if received.endswith(_GAME_OVER_END):
+            return True
+
+
+async def _player(port: int, turns: int, connect_slots: asyncio.Semaphore,
+                  ready: asyncio.Event, latencies: List[float], think_time: float) -> int:
+    """Play `turns` attacks on one session; returns the number of games finished."""
+    async with connect_slots:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        game_over = await _read_until_prompt(reader)
+    await ready.wait()
+    clock = time.perf_counter
+    games = 0
+    for _ in range(turns):
+        if think_time:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * think_time)
+        if game_over:
+            writer.write(b"NEW\n")
+            games += 1
+        else:
+            writer.write(b"1\n")
+        sent = clock()
+        game_over = await _read_until_prompt(reader)
+        latencies.append(clock() - sent)
+    writer.write(b"QUIT\n")
+    writer.close()
+    return games
+
+
+async def _run(sessions: int, turns: int, think_time: float) -> None:
+    server = GameServer(port=0, max_sessions=sessions, seed=0)
+    await server.start()
+    connect_slots = asyncio.Semaphore(CONNECT_BATCH)
+    ready = asyncio.Event()
+    latencies: List[float] = []
+
+    start = time.perf_counter()
+    players = [asyncio.create_task(_player(server.port, turns, connect_slots, ready, latencies, think_time))
+               for _ in range(sessions)]
+    while len(server.sessions) < sessions:
+        await asyncio.sleep(0.05)
+    connected = time.perf_counter() - start
+    print(f"{sessions:,} sessions connected in {connected:.2f}s")
+
+    start = time.perf_counter()
+    ready.set()
+    games = sum(await asyncio.gather(*players))
+    elapsed = time.perf_counter() - start
+    await server.close()
+
+    latencies.sort()
+    def percentile(fraction: float) -> float:
+        return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] * 1000
+
+    print(f"{len(latencies):,} turns ({games:,} games finished) in {elapsed:.2f}s, "
+          f"{len(latencies) / elapsed:,.0f} turns per second")
+    print(f"Turn latency: p50 {percentile(0.5):.2f} ms, p99 {percentile(0.99):.2f} ms, "
+          f"max {latencies[-1] * 1000:.2f} ms")
+
+
+def main() -> None:
+    """Run the load test and print turn latency percentiles."""
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    think_time = float(sys.argv[3]) if len(sys.argv) > 3 else THINK_TIME
+    asyncio.run(_run(sessions, turns, think_time))
+
+
+if __name__ == "__main__":
+    main()
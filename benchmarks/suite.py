@@ -0,0 +1,361 @@
+"""
+Micro- and macro-benchmark suite with stored baselines.
+
+Times the hot combat methods, the initiative scheduler, a full fight in both game loops and logger
+throughput, and compares the results with a baseline saved earlier on the
+same machine. A benchmark that got slower by more than the threshold is
+flagged as a regression and the suite exits with status 1, so it can run
+before a deploy.
+
+Baselines are JSON files in benchmarks/baselines/, one per machine, since
+timings from different hardware cannot be compared.
+
+Run from the project root:
+    python -m benchmarks.suite [compare|save] [threshold] [benchmark ...]
+
+    compare     time the benchmarks and check them against this machine's
+                baseline (the default)
+    save        time the benchmarks and store them as this machine's baseline
+    threshold   allowed slowdown as a fraction, 0.25 (25%) by default
+"""
+import contextlib
+import datetime
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_THRESHOLD = 0.25
+# Each benchmark is timed this many times and the fastest run is kept,
+# which filters out most interference from the rest of the system
+REPEATS = 5
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# A benchmark sets up its objects, yields a function that runs the measured
+# operation a given number of times, and cleans up once resumed
+Setup = Callable[[], Iterator[Callable[[int], None]]]
+
+# Name -> (setup, operations per timed run)
+BENCHMARKS: Dict[str, Tuple[Setup, int]] = {}
+
+
+class Comparison(NamedTuple):
+    """One benchmark's result against the baseline."""
+    name: str
+    baseline: Optional[float]
+    current: float
+    # current / baseline, or None without a baseline
+    ratio: Optional[float]
+    regressed: bool
+
+
+def benchmark(name: str, operations: int) -> Callable[[Setup], Setup]:
+    """
+    Register a benchmark.
+
+    Args:
+        name (str): Name used in reports and baselines
+        operations (int): Operations per timed run
+
+    Returns:
+        Callable[[Setup], Setup]: Decorator for the setup generator
+    """
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = (setup, operations)
+        return setup
+    return register
+
+
+@benchmark("character_attack", 200_000)
+def _character_attack():
+    import random
+    from character import Character
+    from simulation import create_player
+    player = create_player("sword")
+    target = Character("Dummy", 1e18, 0, random.Random(0))
+    attack = player.attack
+
+    def run(count: int) -> None:
+        for _ in range(count):
+            attack(target)
+    yield run
+
+
+@benchmark("character_take_damage", 200_000)
+def _character_take_damage():
+    import random
+    from character import Character
+    target = Character("Dummy", 1e18, 0, random.Random(0))
+    take_damage = target.take_damage
+
+    def run(count: int) -> None:
+        for _ in range(count):
+            take_damage(5.0)
+    yield run
+
+
+@benchmark("boss_use_special_ability", 200_000)
+def _boss_use_special_ability():
+    import random
+    from character import Character
+    from simulation import create_boss
+    boss = create_boss("goblin_king", "sword")
+    target = Character("Dummy", 1e18, 0, random.Random(0))
+    use_special_ability = boss.use_special_ability
+
+    def run(count: int) -> None:
+        for _ in range(count):
+            use_special_ability(target)
+    yield run
+
+
+@benchmark("boss_update", 500_000)
+def _boss_update():
+    from simulation import create_boss
+    boss = create_boss("goblin_king", "sword")
+    update = boss.update
+
+    def run(count: int) -> None:
+        # Keep the ability cooling down so every call ticks the counter
+        boss.set_ability_state(count + 1, False)
+        for _ in range(count):
+            update()
+    yield run
+
+
+@benchmark("initiative_next", 200_000)
+def _initiative_next():
+    import random
+    from character import Character
+    from constants import ATTRIBUTE_AGILITY
+    from initiative import InitiativeScheduler
+    scheduler = InitiativeScheduler()
+    rng = random.Random(0)
+    for number in range(10_000):
+        combatant = Character(f"Combatant {number}", 100, 10, rng)
+        combatant.set_attribute(ATTRIBUTE_AGILITY, rng.randint(1, 20))
+        scheduler.add(combatant)
+    next_combatant = scheduler.next
+
+    def run(count: int) -> None:
+        for _ in range(count):
+            next_combatant()
+    yield run
+
+
+@benchmark("game_fight", 2_000)
+def _game_fight():
+    from game import Game
+    from rpg_game.utils.input_providers import PolicyInput, always
+    player_input = PolicyInput(always('1'))
+
+    def run(count: int) -> None:
+        for seed in range(count):
+            Game(seed, player_input=player_input).run()
+    yield run
+
+
+@benchmark("rpg_game_fight", 200)
+def _rpg_game_fight():
+    from rpg_game.game import Game
+    from rpg_game.utils.input_providers import PolicyInput, always
+    player_input = PolicyInput(always("Scissors"))
+
+    # The game prints as it plays; writing to the null device keeps the
+    # cost of formatting the text without a terminal in the way
+    with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+        def run(count: int) -> None:
+            for _ in range(count):
+                Game(player_input=player_input).run()
+        yield run
+
+
+@benchmark("logger_log_combat", 100_000)
+def _logger_log_combat():
+    from rpg_game.character import Character, Boss
+    from rpg_game.utils.logger import GameLogger, FileLogBackend
+    player = Character("Hero", 100, 10, "Sword", 6)
+    boss = Boss("Goblin King", 50, 8)
+    with tempfile.TemporaryDirectory() as directory, \
+            FileLogBackend(os.path.join(directory, "combat.log")) as backend:
+        log_combat = GameLogger(log_to_console=False, backend=backend).log_combat
+
+        def run(count: int) -> None:
+            for index in range(count):
+                log_combat(player, boss, index % 30)
+        yield run
+
+
+def run_suite(names: Optional[Sequence[str]] = None, scale: float = 1.0,
+              repeats: int = REPEATS) -> Dict[str, float]:
+    """
+    Time benchmarks.
+
+    Args:
+        names (Sequence[str], optional): Benchmarks to run; all by default
+        scale (float): Multiplier for the operations per run, e.g. 0.01 for a smoke test
+        repeats (int): Timed runs per benchmark; the fastest is kept
+
+    Returns:
+        Dict[str, float]: Seconds per operation, keyed by benchmark name
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        setup, operations = BENCHMARKS[name]
+        count = max(1, int(operations * scale))
+        runs = setup()
+        run = next(runs)
+        run(max(1, count // 10))  # Warm up caches before timing
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run(count)
+            best = min(best, time.perf_counter() - start)
+        runs.close()
+        results[name] = best / count
+    return results
+
+
+def machine_id() -> str:
+    """
+    Name this machine's baseline file.
+
+    Returns:
+        str: Host name, architecture and Python version, safe for a file name
+    """
+    name = f"{platform.node()}-{platform.machine()}-py{sys.version_info[0]}{sys.version_info[1]}"
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+def baseline_path(machine: Optional[str] = None) -> str:
+    """
+    Path of a machine's baseline file.
+
+    Args:
+        machine (str, optional): Machine id; this machine by default
+
+    Returns:
+        str: The JSON file path
+    """
+    return os.path.join(BASELINE_DIR, f"{machine or machine_id()}.json")
+
+
+def save_baseline(results: Dict[str, float], path: Optional[str] = None) -> str:
+    """
+    Store results as a machine's baseline, keeping benchmarks not rerun.
+
+    Args:
+        results (Dict[str, float]): Seconds per operation by benchmark
+        path (str, optional): Baseline file; this machine's by default
+
+    Returns:
+        str: The file written
+    """
+    path = path or baseline_path()
+    merged = dict(load_baseline(path) or {})
+    merged.update(results)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as baseline_file:
+        json.dump({
+            "machine": platform.platform(),
+            "python": platform.python_version(),
+            "saved": datetime.datetime.now().isoformat(timespec="seconds"),
+            "results": merged,
+        }, baseline_file, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(path: Optional[str] = None) -> Optional[Dict[str, float]]:
+    """
+    Read a machine's baseline.
+
+    Args:
+        path (str, optional): Baseline file; this machine's by default
+
+    Returns:
+        Dict[str, float]: Seconds per operation by benchmark, or None if
+        there is no baseline yet
+    """
+    try:
+        with open(path or baseline_path()) as baseline_file:
+            return json.load(baseline_file)["results"]
+    except FileNotFoundError:
+        return None
+
+
+def compare(baseline: Optional[Dict[str, float]], results: Dict[str, float],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    """
+    Check results against a baseline.
+
+    Args:
+        baseline (Dict[str, float], optional): Seconds per operation from the baseline
+        results (Dict[str, float]): Seconds per operation now
+        threshold (float): Allowed slowdown as a fraction of the baseline
+
+    Returns:
+        List[Comparison]: One entry per result, in the order of results
+    """
+    comparisons = []
+    for name, current in results.items():
+        previous = (baseline or {}).get(name)
+        ratio = current / previous if previous else None
+        comparisons.append(Comparison(name, previous, current, ratio,
+                                      ratio is not None and ratio > 1 + threshold))
+    return comparisons
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    """Format a per-operation time with a readable unit."""
+    if seconds is None:
+        return "-"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:.2f} µs"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def main() -> None:
+    """Run the suite and save or check a baseline."""
+    mode = sys.argv[1] if len(sys.argv) > 1 else "compare"
+    if mode not in ("compare", "save"):
+        print("Usage: python -m benchmarks.suite [compare|save] [threshold] [benchmark ...]")
+        sys.exit(2)
+    threshold = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_THRESHOLD
+    names = sys.argv[3:] or None
+    unknown = [name for name in names or () if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}; choose from {', '.join(BENCHMARKS)}")
+        sys.exit(2)
+
+    results = run_suite(names)
+    baseline = load_baseline()
+    comparisons = compare(baseline, results, threshold)
+    print(f"{'Benchmark':<26}{'Baseline':>12}{'Now':>12}{'Change':>9}")
+    for comparison in comparisons:
+        change = f"{comparison.ratio - 1:+.1%}" if comparison.ratio is not None else "new"
+        flag = "  REGRESSION" if comparison.regressed else ""
+        print(f"{comparison.name:<26}{_format_time(comparison.baseline):>12}"
+              f"{_format_time(comparison.current):>12}{change:>9}{flag}")
+
+    if mode == "save":
+        print(f"\nBaseline saved to {save_baseline(results)}")
+        return
+    if baseline is None:
+        print(f"\nNo baseline for this machine yet; run with 'save' to create {baseline_path()}")
+        return
+    regressions = [comparison.name for comparison in comparisons if comparison.regressed]
+    if regressions:
+        print(f"\nFAIL: slower than the baseline by more than {threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nOK: no benchmark slower than the baseline by more than {threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Search-based boss controller.
+
+By default a boss uses its special ability whenever it is ready. An
+ExpectimaxController instead decides, each time the ability is ready,
+whether to use it or hold it back, by searching the fight ahead:
+
+- max nodes are the boss's choice between ability and normal attack;
+- chance nodes are the dodge rolls of every attack and the player's
+  critical hit roll.
+
+The player is assumed to attack every turn. Search deepens one turn at a
+time until the per-move time budget runs out, and the move from the
+deepest finished search is played. Values found are kept in a
+transposition table keyed on the compact fight state, so later moves and
+deeper searches reuse them.
+
+The search makes no random draws, so a game with a controller stays
+reproducible from its seed. Only the depth reached depends on the time
+budget; set max_depth low enough to always finish for bit-exact replays.
+
+The clock is read at every chance node for the boss's attack, and the
+search is abandoned as soon as the budget is spent, falling back on the
+move from the last depth searched in full.
+"""
+import math
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from character import Character, Boss
+from constants import CRITICAL_HIT_CHANCE, ABILITY_COOLDOWN_TURNS
+
+DEFAULT_TIME_BUDGET = 0.005  # Seconds per decision
+DEFAULT_MAX_DEPTH = 40  # Turns ahead
+DEFAULT_TABLE_SIZE = 200_000  # Entries before the transposition table is cleared
+
+_clock = time.perf_counter
+# Seconds of the budget kept back for unwinding the search and bookkeeping
+_BUDGET_RESERVE = 0.0001
+
+# Fight state: (player HP, boss HP, turns until the ability is ready, 0 if ready)
+StateKey = Tuple[float, float, int]
+
+
+class FightModel(NamedTuple):
+    """The fixed numbers of a fight, as the controller sees them."""
+    player_damage: float
+    player_dodge: float
+    boss_damage: float
+    boss_dodge: float
+    ability_damage: float
+    ability_cooldown: int
+    crit_chance: float
+
+
+class _OutOfTime(Exception):
+    """Raised inside the search when the move's time budget is spent."""
+
+
+class ExpectimaxController:
+    """
+    Decides when a boss uses its special ability by expectimax search.
+
+    Set it as Boss.controller (or pass it to game.Game as boss_controller).
+    A controller keeps its transposition table between moves, so bosses
+    fighting at the same time should each have their own.
+    """
+
+    def __init__(self, time_budget: float = DEFAULT_TIME_BUDGET,
+                 max_depth: int = DEFAULT_MAX_DEPTH, table_size: int = DEFAULT_TABLE_SIZE):
+        """
+        Initialise a controller.
+
+        Args:
+            time_budget (float): Hard limit in seconds on the search for one move
+            max_depth (int): Most turns to look ahead
+            table_size (int): Most transposition table entries kept
+        """
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.table_size = table_size
+        # State -> (depth searched, probability the boss wins, whether every
+        # line below it reached the end of the fight)
+        self.table: Dict[StateKey, Tuple[int, float, bool]] = {}
+        self._model: Optional[FightModel] = None
+        self._deadline = 0.0
+        self._nodes = 0
+        self._exact = True
+        # Statistics
+        self.moves = 0
+        self.nodes = 0
+        self.table_hits = 0
+        self.search_time = 0.0
+        self.max_search_time = 0.0
+        self.last_depth = 0
+        self.last_value = 0.0
+
+    @staticmethod
+    def model(boss: Boss, target: Character) -> FightModel:
+        """
+        Read the fight's fixed numbers from the two characters.
+
+        Args:
+            boss (Boss): The boss deciding
+            target (Character): The player
+
+        Returns:
+            FightModel: Damage, dodge and cooldown figures
+        """
+        boss_stats, target_stats = boss.stats, target.stats
+        return FightModel(target_stats.attack_damage, target_stats.dodge_chance,
+                          boss_stats.attack_damage, boss_stats.dodge_chance,
+                          boss_stats.ability_damage, ABILITY_COOLDOWN_TURNS, CRITICAL_HIT_CHANCE)
+
+    def use_ability(self, boss: Boss, target: Character) -> bool:
+        """
+        Decide whether the boss uses its ready ability this turn.
+
+        Called by Boss.attack before the boss strikes.
+
+        Args:
+            boss (Boss): The boss deciding
+            target (Character): The player
+
+        Returns:
+            bool: True to use the ability now
+        """
+        start = time.perf_counter()
+        model = self.model(boss, target)
+        if model != self._model:
+            # Values depend on the damage figures, so they cannot be reused
+            self.table.clear()
+            self._model = model
+        elif len(self.table) > self.table_size:
+            self.table.clear()
+        self._deadline = start + self.time_budget - _BUDGET_RESERVE
+        self._nodes = 0
+
+        # Without a finished search, do what the boss would do anyway
+        use, value, depth = True, 0.0, 0
+        try:
+            for depth_limit in range(1, self.max_depth + 1):
+                self._exact = True
+                use_value = self._strike(target.health, boss.health, True, depth_limit)
+                hold_value = self._strike(target.health, boss.health, False, depth_limit)
+                use, value, depth = use_value >= hold_value, max(use_value, hold_value), depth_limit
+                if self._exact:
+                    break  # Every line reached the end of the fight; deeper adds nothing
+        except _OutOfTime:
+            pass
+
+        elapsed = time.perf_counter() - start
+        self.moves += 1
+        self.nodes += self._nodes
+        self.search_time += elapsed
+        self.max_search_time = max(self.max_search_time, elapsed)
+        self.last_depth, self.last_value = depth, value
+        return use
+
+    def _strike(self, player_hp: float, boss_hp: float, use: bool, depth: int,
+                cooldown: int = 0) -> float:
+        """
+        Chance node for the boss's attack, optionally led by its ability.
+
+        Follows Boss.attack and Boss.update, then hands over to the next turn.
+        """
+        if _clock() > self._deadline:
+            raise _OutOfTime
+        model = self._model
+        land = 1.0 - model.player_dodge
+        if use:
+            cooldown = model.ability_cooldown
+            hits = ((land, model.ability_damage), (1.0 - land, 0.0))
+        else:
+            hits = ((1.0, 0.0),)
+        # Boss.update ticks the cooldown at the end of the turn
+        if cooldown > 0:
+            cooldown -= 1
+
+        value = 0.0
+        for p_ability, ability_damage in hits:
+            if p_ability <= 0.0:
+                continue
+            for p_normal, damage in ((land, model.boss_damage), (1.0 - land, 0.0)):
+                if p_normal > 0.0:
+                    value += p_ability * p_normal * self._turn(
+                        player_hp - ability_damage - damage, boss_hp, cooldown, depth)
+        return value
+
+    def _turn(self, player_hp: float, boss_hp: float, cooldown: int, depth: int) -> float:
+        """
+        Value of the start of a turn: the defeat checks, then the player's
+        attack (a chance node) and the boss's choice (a max node).
+        """
+        self._nodes += 1
+        # Game.begin_turn checks the player first, so a double knockout is the boss's win
+        if player_hp <= 0:
+            return 1.0
+        if boss_hp <= 0:
+            return 0.0
+        if depth <= 1:
+            self._exact = False
+            return self._estimate(player_hp, boss_hp, cooldown)
+
+        key = (round(player_hp, 9), round(boss_hp, 9), cooldown)
+        entry = self.table.get(key)
+        if entry is not None and (entry[0] >= depth or entry[2]):
+            self.table_hits += 1
+            if not entry[2]:
+                self._exact = False
+            return entry[1]
+
+        model = self._model
+        crit = model.crit_chance
+        miss = model.boss_dodge
+        land = 1.0 - miss
+        player_hits = (
+            (1 - crit) * miss + crit * miss * miss,
+            (1 - crit) * land + crit * 2 * land * miss,
+            crit * land * land
+        )
+        ready = cooldown == 0 and model.ability_damage > 0
+        # Track whether this subtree alone was searched to the end
+        exact, self._exact = self._exact, True
+        value = 0.0
+        for hit_count, probability in enumerate(player_hits):
+            if probability <= 0.0:
+                continue
+            after = boss_hp - hit_count * model.player_damage
+            # The boss picks whichever attack gives it the better chance
+            best = self._strike(player_hp, after, False, depth - 1, cooldown)
+            if ready:
+                best = max(best, self._strike(player_hp, after, True, depth - 1, cooldown))
+            value += probability * best
+        self.table[key] = (depth, value, self._exact)
+        self._exact = exact and self._exact
+        return value
+
+    def _estimate(self, player_hp: float, boss_hp: float, cooldown: int) -> float:
+        """Rough chance the boss wins, from how many turns each side needs."""
+        model = self._model
+        land = 1.0 - model.player_dodge
+        ability_cooldown = max(1, model.ability_cooldown)
+        player_rate = model.player_damage * (1.0 - model.boss_dodge) * (1.0 + model.crit_chance)
+        boss_rate = land * (model.boss_damage + model.ability_damage / ability_cooldown)
+        if player_rate <= 0.0:
+            return 1.0
+        if boss_rate <= 0.0:
+            return 0.0
+        # Credit the part of the next ability use already waited for, so
+        # holding a ready ability is not mistaken for giving it up
+        pending = land * model.ability_damage * (1.0 - cooldown / ability_cooldown)
+        # Whole hits for the player, as the boss goes down only at 0 HP
+        player_turns = math.ceil(boss_hp / model.player_damage) * model.player_damage / player_rate
+        boss_turns = max(0.0, player_hp - pending) / boss_rate
+        # The boss still strikes in the turn it falls, so it wins a tie
+        margin = (player_turns - boss_turns + 0.5) / (1.0 + 0.25 * (player_turns + boss_turns))
+        return 1.0 / (1.0 + math.exp(-4.0 * margin))
+
+    def report(self) -> str:
+        """
+        Summarise the search so far.
+
+        Returns:
+            str: One line with moves, nodes per second and search times
+        """
+        rate = self.nodes / self.search_time if self.search_time else 0.0
+        mean = self.search_time / self.moves if self.moves else 0.0
+        return (f"{self.moves} moves, {self.nodes:,} nodes, {rate:,.0f} nodes/second, "
+                f"mean {mean * 1000:.2f} ms, max {self.max_search_time * 1000:.2f} ms per move, "
+                f"{self.table_hits:,} table hits")
+
@@ -1,16 +1,100 @@
-from typing import Optional, Dict
+import random
+from collections.abc import MutableMapping
+from typing import Iterator, NamedTuple, Optional
 from weapon import Weapon
+from rpg_game.utils.events import EventBus, AttackEvent, DodgeEvent, AbilityEvent, default_bus
+from abilities import Ability, get_ability
+from status_effects import EffectEngine, Timer
 from constants import (
     PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE,
     BOSS_GOBBLIN_KING_HEALTH, BOSS_GOBBLIN_KING_DAMAGE,
     BOSS_ICE_SORCERER_HEALTH, BOSS_ICE_SORCERER_DAMAGE,
     BOSS_SHADOW_KNIGHT_HEALTH, BOSS_SHADOW_KNIGHT_DAMAGE,
-    ATTRIBUTE_STRENGTH, ATTRIBUTE_AGILITY, ATTRIBUTE_INTELLIGENCE
+    ATTRIBUTE_STRENGTH, ATTRIBUTE_AGILITY, ATTRIBUTE_INTELLIGENCE,
+    ABILITY_COOLDOWN_TURNS, ATTRIBUTE_AGILITY_SPEED_BONUS, BASE_SPEED
 )
 
+# Slot on Character that stores each attribute
+_ATTRIBUTE_SLOTS = {
+    ATTRIBUTE_STRENGTH: "_strength",
+    ATTRIBUTE_AGILITY: "_agility",
+    ATTRIBUTE_INTELLIGENCE: "_intelligence"
+}
+
+class Attributes(MutableMapping):
+    """
+    Dictionary-style view of a character's attributes.
+
+    The values live in fixed slots on the character itself, so characters
+    don't each carry their own dictionary; a view is made on demand. Any
+    other attribute, e.g. attributes["luck"], is kept in a small dictionary
+    made for the characters that have one, as the plain dictionary used to.
+    """
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: 'Character'):
+        """
+        Create a view onto a character's attributes.
+        
+        Args:
+            owner (Character): The character whose attributes are viewed
+        """
+        self._owner = owner
+
+    def __getitem__(self, attribute: str) -> int:
+        slot = _ATTRIBUTE_SLOTS.get(attribute)
+        if slot is not None:
+            return getattr(self._owner, slot)
+        extra = self._owner._extra_attributes
+        if extra is None:
+            raise KeyError(attribute)
+        return extra[attribute]
+
+    def __setitem__(self, attribute: str, value: int) -> None:
+        owner = self._owner
+        if attribute in _ATTRIBUTE_SLOTS:
+            owner.set_attribute(attribute, value)
+        elif owner._extra_attributes is None:
+            owner._extra_attributes = {attribute: value}
+        else:
+            owner._extra_attributes[attribute] = value
+
+    def __delitem__(self, attribute: str) -> None:
+        if attribute in _ATTRIBUTE_SLOTS:
+            raise TypeError("Strength, agility and intelligence cannot be removed")
+        extra = self._owner._extra_attributes
+        if extra is None:
+            raise KeyError(attribute)
+        del extra[attribute]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _ATTRIBUTE_SLOTS
+        extra = self._owner._extra_attributes
+        if extra:
+            yield from list(extra)
+
+    def __len__(self) -> int:
+        extra = self._owner._extra_attributes
+        return len(_ATTRIBUTE_SLOTS) + (len(extra) if extra else 0)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+class DerivedStats(NamedTuple):
+    """Combat numbers worked out from a character's attributes and weapon."""
+    attack_damage: float   # Damage dealt by one normal attack
+    dodge_chance: float    # Chance of dodging an incoming attack
+    ability_damage: float  # Damage dealt by the special ability (0 if none)
+    speed: float           # Actions per unit of initiative time
+
 class Character:
     """Base class for all characters in the game."""
-    def __init__(self, name: str, health: int, damage: int):
+    # Slots instead of a per-instance __dict__ keep large populations small
+    __slots__ = ("name", "health", "_base_damage", "_weapon", "rng", "events",
+                 "_strength", "_agility", "_intelligence", "_extra_attributes", "_stats")
+
+    def __init__(self, name: str, health: int, damage: int, rng: Optional[random.Random] = None,
+                 events: Optional[EventBus] = None):
         """
         Initialize a character with basic attributes.
         
@@ -18,18 +102,81 @@ class Character:
             name (str): Name of the character
             health (int): Initial health points
             damage (int): Base damage value
+            rng (random.Random, optional): Random generator for dodge rolls;
+                defaults to the shared global generator
+            events (EventBus, optional): Bus that combat events are published on
         """
+        # Derived stats are worked out on first use and cleared whenever
+        # anything they depend on changes
+        self._stats: Optional[DerivedStats] = None
         self.name = name
         self.health = health
         self.base_damage = damage
         self.weapon: Optional[Weapon] = None
+        # The random module has the same interface as a Random instance
+        self.rng = rng if rng is not None else random
+        self.events = events if events is not None else default_bus
         
         # Initialize attributes
-        self.attributes: Dict[str, int] = {
-            ATTRIBUTE_STRENGTH: 10,    # Affects damage
-            ATTRIBUTE_AGILITY: 10,     # Affects dodge chance
-            ATTRIBUTE_INTELLIGENCE: 10 # Affects special abilities
-        }
+        self._strength = 10      # Affects damage
+        self._agility = 10       # Affects dodge chance and speed
+        self._intelligence = 10  # Affects special abilities
+        # Any other attributes, made when the first one is set
+        self._extra_attributes: Optional[dict] = None
+
+    @property
+    def attributes(self) -> Attributes:
+        """Dictionary-style access to the character's attributes."""
+        return Attributes(self)
+
+    @property
+    def base_damage(self) -> float:
+        """Base damage value before attribute and weapon bonuses."""
+        return self._base_damage
+
+    @base_damage.setter
+    def base_damage(self, value: float) -> None:
+        self._base_damage = value
+        self._stats = None
+
+    @property
+    def weapon(self) -> Optional[Weapon]:
+        """The equipped weapon, if any."""
+        return self._weapon
+
+    @weapon.setter
+    def weapon(self, value: Optional[Weapon]) -> None:
+        self._weapon = value
+        self._stats = None
+
+    @property
+    def stats(self) -> DerivedStats:
+        """Current derived combat stats, recalculated only after a change."""
+        return self._stats or self._refresh_stats()
+
+    def _refresh_stats(self) -> DerivedStats:
+        """Recalculate and cache the derived combat stats."""
+        self._stats = DerivedStats(
+            attack_damage=self._calculate_attack_damage(),
+            dodge_chance=self._agility / 100,  # Dodge chance based on agility
+            ability_damage=self._calculate_ability_damage(),
+            speed=BASE_SPEED * (1 + self._agility * ATTRIBUTE_AGILITY_SPEED_BONUS)
+        )
+        return self._stats
+
+    def _calculate_attack_damage(self) -> float:
+        """Work out the damage of one normal attack."""
+        # Calculate damage based on strength
+        strength_bonus = self._strength / 10
+        total_damage = self._base_damage * (1 + strength_bonus)
+        
+        if self._weapon:
+            total_damage += self._weapon.attack()
+        return total_damage
+
+    def _calculate_ability_damage(self) -> float:
+        """Work out the damage of the special ability; players deal none."""
+        return 0.0
         
     def get_attribute(self, attribute: str) -> int:
         """
@@ -41,36 +188,51 @@ class Character:
         Returns:
             int: Attribute value
         """
-        return self.attributes.get(attribute, 0)
+        slot = _ATTRIBUTE_SLOTS.get(attribute)
+        if slot:
+            return getattr(self, slot)
+        extra = self._extra_attributes
+        return extra.get(attribute, 0) if extra else 0
     
     def set_attribute(self, attribute: str, value: int) -> None:
         """
         Set the value of a specific attribute.
         
+        Attributes the character does not have are ignored; add one
+        through the attributes view.
+        
         Args:
             attribute (str): Attribute name
             value (int): New attribute value
         """
-        if attribute in self.attributes:
-            self.attributes[attribute] = value
+        slot = _ATTRIBUTE_SLOTS.get(attribute)
+        if slot:
+            setattr(self, slot, value)
+            self._stats = None
+        elif self._extra_attributes and attribute in self._extra_attributes:
+            self._extra_attributes[attribute] = value
 
     def is_alive(self) -> bool:
         """Return True if character has health remaining."""
         return self.health > 0
 
-    def take_damage(self, damage: int) -> None:
+    def take_damage(self, damage: int) -> bool:
         """
         Reduce character's health by the given damage amount.
         
         Args:
             damage (int): Amount of damage to take
+            
+        Returns:
+            bool: True if the damage was taken, False if it was dodged
         """
-        # Calculate dodge chance based on agility
-        dodge_chance = self.get_attribute(ATTRIBUTE_AGILITY) / 100
-        if random.random() > dodge_chance:
+        dodge_chance = (self._stats or self._refresh_stats()).dodge_chance
+        if self.rng.random() > dodge_chance:
             self.health = max(0, self.health - damage)
-        else:
-            print(f"\n{self.name} dodges the attack!")
+            return True
+        if self.events.active:
+            self.events.emit(DodgeEvent(self, damage))
+        return False
 
     def attack(self, target: 'Character') -> None:
         """
@@ -79,14 +241,10 @@ class Character:
         Args:
             target (Character): The target character to attack
         """
-        # Calculate damage based on strength
-        strength_bonus = self.get_attribute(ATTRIBUTE_STRENGTH) / 10
-        total_damage = self.base_damage * (1 + strength_bonus)
-        
-        if self.weapon:
-            total_damage += self.weapon.attack()
-        
-        target.take_damage(total_damage)
+        damage = (self._stats or self._refresh_stats()).attack_damage
+        hit = target.take_damage(damage)
+        if self.events.active:
+            self.events.emit(AttackEvent(self, target, damage, not hit))
 
     def use_special_ability(self) -> None:
         """
@@ -97,12 +255,15 @@ class Character:
         """
         intelligence = self.get_attribute(ATTRIBUTE_INTELLIGENCE)
         if intelligence >= 20:  # Require minimum intelligence
-            print(f"\n{self.name} uses a powerful special ability!")
+            if self.events.active:
+                self.events.emit(AbilityEvent(self, None, None, 0, False, True))
             return True
         return False
 
 class Boss(Character):
     """Special boss character class."""
+    __slots__ = ("_ability", "_effects", "_recharge", "controller")
+
     def __init__(self, name: str, health: int, damage: int, special_ability: str = None):
         """
         Initialize a boss character with special abilities.
@@ -111,12 +272,19 @@ class Boss(Character):
             name (str): Name of the boss
             health (int): Initial health points
             damage (int): Base damage value
-            special_ability (str, optional): Special ability description
+            special_ability (str, optional): Name of a special ability registered
+                in abilities.py
         """
         super().__init__(name, health, damage)
         self.special_ability = special_ability
-        self.ability_cooldown = 0
-        self.ability_ready = True
+        # Runs the ability cooldown, and any status effects the boss
+        # inflicts; Boss.update advances it one turn. Created on first use,
+        # so bosses that never use an ability carry no engine
+        self._effects: Optional[EffectEngine] = None
+        self._recharge: Optional[Timer] = None
+        # Optional decision maker asked whether to use a ready ability,
+        # e.g. boss_ai.ExpectimaxController; without one it is always used
+        self.controller = None
         
         # Bosses have higher attributes
         self.attributes[ATTRIBUTE_STRENGTH] = 15
@@ -130,23 +298,92 @@ class Boss(Character):
         Args:
             target (Character): The target character to attack
         """
+        total_damage = (self._stats or self._refresh_stats()).attack_damage
+        
+        # Use special ability if ready, unless the controller holds it back
+        if self._ability.id and self.ability_ready and (
+                self.controller is None or self.controller.use_ability(self, target)):
+            self.use_special_ability(target)
+            self._recharge = self.effects.wheel.schedule(ABILITY_COOLDOWN_TURNS,
+                                                         self._ability_recharged)
+        
+        hit = target.take_damage(total_damage)
+        if self.events.active:
+            self.events.emit(AttackEvent(self, target, total_damage, not hit))
+
+    @property
+    def ability_ready(self) -> bool:
+        """Whether the special ability can be used this turn."""
+        return self._recharge is None
+
+    @property
+    def ability_cooldown(self) -> int:
+        """Turns until the special ability is ready again, 0 if it is ready."""
+        return self._effects.wheel.remaining(self._recharge) if self._recharge else 0
+
+    def set_ability_state(self, cooldown: int, ready: bool) -> None:
+        """
+        Set the ability cooldown, e.g. when restoring a saved game.
+
+        Args:
+            cooldown (int): Turns until the ability is ready again
+            ready (bool): Whether the ability is ready now; if so the cooldown is ignored
+        """
+        if self._recharge is not None:
+            self._effects.wheel.cancel(self._recharge)
+            self._recharge = None
+        if not ready:
+            self._recharge = self.effects.wheel.schedule(cooldown, self._ability_recharged)
+
+    def _ability_recharged(self) -> None:
+        self._recharge = None
+
+    @property
+    def effects(self) -> EffectEngine:
+        """Engine running the ability cooldown and the effects the boss inflicts."""
+        if self._effects is None:
+            self._effects = EffectEngine()
+        return self._effects
+
+    @effects.setter
+    def effects(self, value: EffectEngine) -> None:
+        self._effects = value
+
+    @property
+    def special_ability(self) -> Optional[str]:
+        """Name of the boss's special ability, if any."""
+        return self._ability.name
+
+    @special_ability.setter
+    def special_ability(self, value: Optional[str]) -> None:
+        self.ability = get_ability(value)
+
+    @property
+    def ability(self) -> Ability:
+        """The boss's special ability; abilities.NO_ABILITY if it has none."""
+        return self._ability
+
+    @ability.setter
+    def ability(self, value: Ability) -> None:
+        self._ability = value
+        self._stats = None
+
+    def _calculate_attack_damage(self) -> float:
+        """Work out the damage of one normal boss attack."""
         # Boss attacks with 1.5x damage
-        total_damage = self.base_damage * 1.5
+        total_damage = self._base_damage * 1.5
         
         # Apply strength bonus
-        strength_bonus = self.get_attribute(ATTRIBUTE_STRENGTH) / 10
+        strength_bonus = self._strength / 10
         total_damage *= (1 + strength_bonus)
         
-        if self.weapon:
-            total_damage += self.weapon.attack()
-        
-        # Use special ability if ready
-        if self.special_ability and self.ability_ready:
-            self.use_special_ability(target)
-            self.ability_ready = False
-            self.ability_cooldown = 3  # 3 turns cooldown
-        
-        target.take_damage(total_damage)
+        if self._weapon:
+            total_damage += self._weapon.attack()
+        return total_damage
+
+    def _calculate_ability_damage(self) -> float:
+        """Work out the damage of the boss's special ability."""
+        return self._ability.damage(self._base_damage, self._intelligence)
 
     def use_special_ability(self, target: Character) -> None:
         """
@@ -155,46 +392,48 @@ class Boss(Character):
         Args:
             target (Character): The target character
         """
-        intelligence = self.get_attribute(ATTRIBUTE_INTELLIGENCE)
-        bonus = intelligence / 100
-        
-        if self.special_ability == "Fire Breath":
-            print(f"\n{self.name} uses Fire Breath!")
-            base_damage = self.base_damage * 0.5
-            target.take_damage(base_damage * (1 + bonus))
-        elif self.special_ability == "Ice Nova":
-            print(f"\n{self.name} uses Ice Nova!")
-            base_damage = self.base_damage * 0.3
-            target.take_damage(base_damage * (1 + bonus))
-        elif self.special_ability == "Shadow Strike":
-            print(f"\n{self.name} uses Shadow Strike!")
-            base_damage = self.base_damage * 0.4
-            target.take_damage(base_damage * (1 + bonus))
+        ability_damage = (self._stats or self._refresh_stats()).ability_damage
+        if ability_damage:
+            hit = target.take_damage(ability_damage)
+            if self.events.active:
+                self.events.emit(AbilityEvent(self, target, self._ability.name,
+                                              ability_damage, not hit, True))
+            effects = self._effects
+            if hit and effects is not None and effects.ability_effects:
+                effect = effects.ability_effects.get(self._ability.id)
+                if effect is not None:
+                    effects.apply(target, effect)
 
     def update(self) -> None:
         """
-        Update boss state, including ability cooldown.
+        Update boss state at the end of the turn: the ability cooldown and
+        any status effects on the boss's engine.
         """
-        if not self.ability_ready:
-            self.ability_cooldown -= 1
-            if self.ability_cooldown <= 0:
-                self.ability_ready = True
+        effects = self._effects
+        if effects is not None:
+            effects.wheel.advance()
 
 # Boss types
 class GoblinKing(Boss):
     """Basic boss with fire-based abilities."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Goblin King", BOSS_GOBBLIN_KING_HEALTH, BOSS_GOBBLIN_KING_DAMAGE, "Fire Breath")
         self.attributes[ATTRIBUTE_STRENGTH] = 18  # Fire-based strength bonus
 
 class IceSorcerer(Boss):
     """Boss with ice-based abilities."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Ice Sorcerer", BOSS_ICE_SORCERER_HEALTH, BOSS_ICE_SORCERER_DAMAGE, "Ice Nova")
         self.attributes[ATTRIBUTE_INTELLIGENCE] = 18  # Ice-based intelligence bonus
 
 class ShadowKnight(Boss):
     """Boss with shadow-based abilities."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Shadow Knight", BOSS_SHADOW_KNIGHT_HEALTH, BOSS_SHADOW_KNIGHT_DAMAGE, "Shadow Strike")
         self.attributes[ATTRIBUTE_AGILITY] = 18  # Shadow-based agility bonus
@@ -0,0 +1,175 @@
+"""
+Console output for the game.
+
+ConsoleRenderer subscribes to a game's event bus and prints each event as
+text, so formatting and printing only happen when someone is watching.
+Every function takes an ``output`` callable, print by default, so the same
+text can be sent somewhere other than the terminal.
+"""
+from typing import Any, Callable
+
+from constants import (
+    WELCOME_MESSAGE, GAME_OVER_MESSAGE, VICTORY_MESSAGE,
+    SEPARATOR_LENGTH, BORDER_LENGTH,
+    CRITICAL_HIT_MESSAGE, SPECIAL_ABILITY_MESSAGE
+)
+from character import Character, Boss
+from rpg_game.utils.events import (
+    GameStartEvent, TurnEvent, AttackEvent, CritEvent, AbilityEvent, EffectEvent, FleeEvent,
+    DefeatEvent
+)
+
+# Receives one line of text at a time
+Output = Callable[[str], None]
+
+
+def print_separator(output: Output = print) -> None:
+    """Print a separator line."""
+    output("=" * SEPARATOR_LENGTH)
+
+
+def print_border(output: Output = print) -> None:
+    """Print a border line."""
+    output("=" * BORDER_LENGTH)
+
+
+def display_status(player: Character, boss: Boss, output: Output = print) -> None:
+    """
+    Display current game status.
+
+    Args:
+        player (Character): The player character
+        boss (Boss): The boss being fought
+        output (Output): Where to send each line
+    """
+    print_separator(output)
+    output(f"Player: {player.name} (HP: {player.health})")
+    output(f"Weapon: {player.weapon.get_description()}")
+    output(f"Strength: {player.get_attribute('strength')}")
+    output(f"Agility: {player.get_attribute('agility')}")
+    output(f"Intelligence: {player.get_attribute('intelligence')}")
+    output(f"Boss: {boss.name} (HP: {boss.health})")
+    print_separator(output)
+
+
+class ConsoleRenderer:
+    """Event bus subscriber that prints combat events to the console."""
+
+    def __init__(self, output: Output = print) -> None:
+        """
+        Initialise the renderer's event dispatch table.
+
+        Args:
+            output (Output): Where to send each line of text
+        """
+        self.output = output
+        self._handlers = {
+            GameStartEvent: self.on_game_start,
+            TurnEvent: self.on_turn,
+            AttackEvent: self.on_attack,
+            CritEvent: self.on_crit,
+            AbilityEvent: self.on_ability,
+            EffectEvent: self.on_effect,
+            FleeEvent: self.on_flee,
+            DefeatEvent: self.on_defeat
+        }
+
+    def __call__(self, event: Any) -> None:
+        """
+        Print an event if the renderer knows how to show it.
+
+        Args:
+            event: Any event from the bus
+        """
+        handler = self._handlers.get(type(event))
+        if handler:
+            handler(event)
+
+    def on_game_start(self, event: GameStartEvent) -> None:
+        """
+        Print the welcome banner.
+
+        Args:
+            event (GameStartEvent): The event
+        """
+        self.output("\n" + "=" * BORDER_LENGTH)
+        self.output(WELCOME_MESSAGE.center(BORDER_LENGTH))
+        self.output("=" * BORDER_LENGTH + "\n")
+
+    def on_turn(self, event: TurnEvent) -> None:
+        """
+        Print both characters' status at the start of a turn.
+
+        Args:
+            event (TurnEvent): The event
+        """
+        display_status(event.player, event.boss, self.output)
+
+    def on_attack(self, event: AttackEvent) -> None:
+        """
+        Print an attack and whether it was dodged.
+
+        Args:
+            event (AttackEvent): The event
+        """
+        weapon = event.attacker.weapon
+        weapon_name = weapon.get_description() if weapon else "bare hands"
+        self.output(f"\n{event.attacker.name} attacks {event.defender.name} with {weapon_name}!")
+        if event.dodged:
+            self.output(f"\n{event.defender.name} dodges the attack!")
+
+    def on_crit(self, event: CritEvent) -> None:
+        """
+        Print the critical hit message.
+
+        Args:
+            event (CritEvent): The event
+        """
+        self.output(f"\n{CRITICAL_HIT_MESSAGE}")
+
+    def on_ability(self, event: AbilityEvent) -> None:
+        """
+        Print a special ability use, or why it failed.
+
+        Args:
+            event (AbilityEvent): The event
+        """
+        if not event.success:
+            self.output("\nNot enough intelligence to use special ability!")
+        elif event.ability is None:
+            self.output(f"\n{event.user.name} uses a powerful special ability!")
+            self.output(f"\n{SPECIAL_ABILITY_MESSAGE}")
+        else:
+            self.output(f"\n{event.user.name} uses {event.ability}!")
+            if event.dodged:
+                self.output(f"\n{event.target.name} dodges the attack!")
+
+    def on_effect(self, event: EffectEvent) -> None:
+        """
+        Print a status effect's damage, or that the target is frozen.
+
+        Args:
+            event (EffectEvent): The event
+        """
+        if event.damage:
+            self.output(f"\n{event.character.name} takes {event.damage} {event.effect} damage!")
+        else:
+            self.output(f"\n{event.character.name} is frozen and cannot act!")
+
+    def on_flee(self, event: FleeEvent) -> None:
+        """
+        Print the player's attempt to run away.
+
+        Args:
+            event (FleeEvent): The event
+        """
+        self.output("\nYou try to run away!")
+
+    def on_defeat(self, event: DefeatEvent) -> None:
+        """
+        Print the victory or game over message.
+
+        Args:
+            event (DefeatEvent): The event
+        """
+        self.output(VICTORY_MESSAGE if isinstance(event.character, Boss) else GAME_OVER_MESSAGE)
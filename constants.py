@@ -15,6 +15,7 @@ ATTRIBUTE_MAX_VALUE = 20
 ATTRIBUTE_STRENGTH_BONUS = 0.1  # 10% damage per point
 ATTRIBUTE_AGILITY_BONUS = 0.01  # 1% dodge chance per point
 ATTRIBUTE_INTELLIGENCE_BONUS = 0.01  # 1% special ability chance per point
+ATTRIBUTE_AGILITY_SPEED_BONUS = 0.05  # 5% speed per point
 
 # Boss constants
 BOSS_GOBBLIN_KING_HEALTH = 50  # Basic boss with fire abilities
@@ -30,6 +31,16 @@ ABILITY_FIRE_BREATH_DAMAGE = 0.5  # 50% of base damage
 ABILITY_ICE_NOVA_DAMAGE = 0.3    # 30% of base damage
 ABILITY_SHADOW_STRIKE_DAMAGE = 0.4  # 40% of base damage
 
+# Status effect constants; durations count ends of turns, including the
+# turn the effect lands
+EFFECT_BURN_DAMAGE = 2.0   # Per turn, from Fire Breath
+EFFECT_BURN_TURNS = 3
+EFFECT_BLEED_DAMAGE = 1.0  # Per turn and per stack, from Shadow Strike
+EFFECT_BLEED_TURNS = 4
+EFFECT_FREEZE_TURNS = 2    # From Ice Nova; the player loses their next action
+EFFECT_FOCUS_STRENGTH = 5  # From the player's special ability
+EFFECT_FOCUS_TURNS = 3
+
 # Weapon constants
 WEAPON_ROCK_DAMAGE = 2    # Basic blunt force
 WEAPON_PAPER_DAMAGE = 3   # Light and quick
@@ -42,6 +53,7 @@ WEAPON_STAFF_DAMAGE = 4   # Channel magical energy
 DODGE_CHANCE_BASE = 0.1  # 10% base dodge chance
 CRITICAL_HIT_CHANCE = 0.05  # 5% chance for critical hit
 CRITICAL_DAMAGE_MULTIPLIER = 2.0  # Critical hits deal double damage
+BASE_SPEED = 1.0  # Actions per unit of initiative time before agility
 
 # UI constants
 SEPARATOR_LENGTH = 30
@@ -0,0 +1,341 @@
+"""
+Columnar binary combat-event log.
+
+EventRecorder subscribes to a game's event bus and stores every attack and
+ability use as one row in a set of fixed-width binary column files. The
+EventLogReader memory-maps those files and hands out zero-copy column
+views for aggregation, plus a sparse index for jumping to a fight.
+
+Layout of a log directory:
+    meta.json          version, row count and the character name table
+    <column>.col       one file per column, packed native values
+    index_fight.col    fight id of each sparse index entry
+    index_row.col      first row of that fight
+"""
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from rpg_game.utils.events import GameStartEvent, TurnEvent, AttackEvent, CritEvent, AbilityEvent
+
+LOG_VERSION = 2
+# Older versions the reader still accepts; their columns are read with the
+# typecodes stored in their meta.json
+READABLE_VERSIONS = (1, LOG_VERSION)
+
+# Column name -> array typecode
+COLUMNS = {
+    "fight": "I",     # Fight number, counting from 0
+    "turn": "H",      # Turn within the fight, counting from 1
+    "attacker": "H",  # Index into the name table
+    "defender": "H",  # Index into the name table
+    "damage": "f",    # Damage of the attack or ability
+    "flags": "B"      # FLAG_* bits
+}
+INDEX_COLUMNS = {"index_fight": "I", "index_row": "Q"}
+# Names the attacker and defender columns can tell apart
+MAX_NAMES = 1 << (8 * array(COLUMNS["attacker"]).itemsize)
+
+FLAG_DODGE = 1
+FLAG_CRIT = 2
+FLAG_ABILITY = 4
+
+
+class EventRecorder:
+    """Event bus subscriber that appends combat events to a column log."""
+
+    def __init__(self, directory: str, flush_rows: int = 65536, index_stride: int = 1024):
+        """
+        Create (or truncate) a log directory and start recording.
+
+        Args:
+            directory (str): Directory for the column files
+            flush_rows (int): Rows buffered in memory before writing to disk
+            index_stride (int): Minimum number of rows between sparse index entries
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.index_stride = index_stride
+        self.rows = 0
+        self._names: Dict[str, int] = {}
+        self._buffers = {name: array(code) for name, code in {**COLUMNS, **INDEX_COLUMNS}.items()}
+        self._files = {name: open(os.path.join(directory, f"{name}.col"), "wb") for name in self._buffers}
+        self._fight = -1
+        self._turn = 0
+        self._crit_attacker: Any = None
+        self._last_indexed_row = -index_stride
+        self._handlers = {
+            GameStartEvent: self._on_game_start,
+            TurnEvent: self._on_turn,
+            CritEvent: self._on_crit,
+            AttackEvent: self._on_attack,
+            AbilityEvent: self._on_ability
+        }
+
+    def __call__(self, event: Any) -> None:
+        """
+        Record an event if it is one the log stores.
+
+        Args:
+            event: Any event from the bus
+        """
+        handler = self._handlers.get(type(event))
+        if handler:
+            handler(event)
+
+    def _on_game_start(self, event: GameStartEvent) -> None:
+        self._fight += 1
+        self._turn = 0
+        if self.rows - self._last_indexed_row >= self.index_stride:
+            self._buffers["index_fight"].append(self._fight)
+            self._buffers["index_row"].append(self.rows)
+            self._last_indexed_row = self.rows
+
+    def _on_turn(self, event: TurnEvent) -> None:
+        self._turn = event.turn
+        self._crit_attacker = None
+
+    def _on_crit(self, event: CritEvent) -> None:
+        self._crit_attacker = event.attacker
+
+    def _on_attack(self, event: AttackEvent) -> None:
+        flags = FLAG_DODGE if event.dodged else 0
+        if event.attacker is self._crit_attacker:
+            flags |= FLAG_CRIT
+        self._append(event.attacker, event.defender, event.damage, flags)
+
+    def _on_ability(self, event: AbilityEvent) -> None:
+        if event.success and event.target is not None:
+            flags = FLAG_ABILITY | (FLAG_DODGE if event.dodged else 0)
+            self._append(event.user, event.target, event.damage, flags)
+
+    def _name_id(self, character: Any) -> int:
+        """
+        Map a character to its index in the name table.
+
+        Raises:
+            ValueError: If the name table is full
+        """
+        name = character.name
+        name_id = self._names.get(name)
+        if name_id is None:
+            if len(self._names) >= MAX_NAMES:
+                raise ValueError(f"Event log name table is full ({MAX_NAMES} names); "
+                                 f"cannot record {name!r}")
+            name_id = self._names[name] = len(self._names)
+        return name_id
+
+    def _append(self, attacker: Any, defender: Any, damage: float, flags: int) -> None:
+        """Add one row to the column buffers."""
+        buffers = self._buffers
+        buffers["fight"].append(max(self._fight, 0))
+        buffers["turn"].append(self._turn)
+        buffers["attacker"].append(self._name_id(attacker))
+        buffers["defender"].append(self._name_id(defender))
+        buffers["damage"].append(damage)
+        buffers["flags"].append(flags)
+        self.rows += 1
+        if len(buffers["fight"]) >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows and the metadata to disk."""
+        for name, buffer in self._buffers.items():
+            buffer.tofile(self._files[name])
+            self._files[name].flush()
+            del buffer[:]
+        meta = {
+            "version": LOG_VERSION,
+            "rows": self.rows,
+            "columns": COLUMNS,
+            "names": sorted(self._names, key=self._names.get)
+        }
+        with open(os.path.join(self.directory, "meta.json"), "w", encoding="utf-8") as meta_file:
+            json.dump(meta, meta_file)
+
+    def close(self) -> None:
+        """Flush remaining rows and close the column files."""
+        self.flush()
+        for column_file in self._files.values():
+            column_file.close()
+
+
+class EventLogReader:
+    """
+    Read-only, memory-mapped view of a column log.
+
+    Columns are returned as memoryviews straight onto the mapped files, so
+    summing a column of millions of rows copies nothing:
+
+        with EventLogReader("events") as log:
+            total = sum(log.column("damage"))
+    """
+
+    def __init__(self, directory: str):
+        """
+        Open and map a log directory.
+
+        Args:
+            directory (str): Directory written by EventRecorder
+
+        Raises:
+            ValueError: If the log was written by an unknown format version
+        """
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        if meta["version"] not in READABLE_VERSIONS:
+            raise ValueError(f"Unsupported event log version: {meta['version']}")
+        self.rows: int = meta["rows"]
+        self.names: List[str] = meta["names"]
+        self._maps: List[mmap.mmap] = []
+        self._views: List[memoryview] = []
+        self._columns: Dict[str, memoryview] = {}
+        for name, code in {**COLUMNS, **meta["columns"], **INDEX_COLUMNS}.items():
+            self._columns[name] = self._map(os.path.join(directory, f"{name}.col"), code)
+        # Rows written after meta.json was last updated are ignored
+        for name in COLUMNS:
+            self._columns[name] = self._columns[name][:self.rows]
+            self._views.append(self._columns[name])
+
+    def _map(self, path: str, code: str) -> memoryview:
+        """Memory-map one column file as a typed memoryview."""
+        with open(path, "rb") as column_file:
+            if os.fstat(column_file.fileno()).st_size == 0:
+                return memoryview(array(code))
+            mapped = mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        raw = memoryview(mapped)
+        view = raw.cast(code)
+        self._views.extend((raw, view))
+        return view
+
+    def column(self, name: str) -> memoryview:
+        """
+        Get a zero-copy view of a column.
+
+        Args:
+            name (str): One of COLUMNS
+
+        Returns:
+            memoryview: Typed view of the column's values
+        """
+        return self._columns[name]
+
+    def fight_rows(self, fight: int) -> Tuple[int, int]:
+        """
+        Find the rows belonging to one fight.
+
+        The sparse index narrows the search to one stretch of rows, which is
+        then scanned; fights are stored in order, so no full scan is needed.
+
+        Args:
+            fight (int): Fight number
+
+        Returns:
+            Tuple[int, int]: Start (inclusive) and stop (exclusive) rows
+        """
+        fights = self._columns["fight"]
+        index_fight = self._columns["index_fight"]
+        position = bisect_right(index_fight, fight) - 1
+        row = self._columns["index_row"][position] if position >= 0 else 0
+        while row < self.rows and fights[row] < fight:
+            row += 1
+        start = row
+        while row < self.rows and fights[row] == fight:
+            row += 1
+        return start, row
+
+    def fight(self, fight: int) -> Dict[str, memoryview]:
+        """
+        Get zero-copy views of every column for one fight.
+
+        Args:
+            fight (int): Fight number
+
+        Returns:
+            Dict[str, memoryview]: Column name -> view of that fight's rows
+        """
+        start, stop = self.fight_rows(fight)
+        return {name: self._columns[name][start:stop] for name in COLUMNS}
+
+    def close(self) -> None:
+        """
+        Release the memory maps.
+
+        A map that still has column views in use elsewhere stays open until
+        those views are garbage collected.
+        """
+        self._columns.clear()
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+        self._maps.clear()
+
+    def __enter__(self) -> 'EventLogReader':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def record_games(directory: str, games: int, seed: Optional[int] = None) -> EventRecorder:
+    """
+    Play headless games in which the player always attacks, recording every event.
+
+    Args:
+        directory (str): Log directory
+        games (int): Number of games to play
+        seed (int, optional): Seed for reproducible games
+
+    Returns:
+        EventRecorder: The closed recorder
+    """
+    from game import Game
+    from rpg_game.utils.input_providers import PolicyInput, always
+
+    attack = PolicyInput(always('1'))
+    recorder = EventRecorder(directory)
+    for number in range(games):
+        game = Game(None if seed is None else seed + number, player_input=attack)
+        game.events.subscribe(recorder)
+        game.run()
+    recorder.close()
+    return recorder
+
+
+def main() -> None:
+    """Record some games and print a few aggregates from the log."""
+    directory = sys.argv[1] if len(sys.argv) > 1 else "event_log"
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    start = time.perf_counter()
+    recorder = record_games(directory, games, seed=0)
+    elapsed = time.perf_counter() - start
+    print(f"Recorded {recorder.rows:,} events from {games:,} games in {elapsed:.2f}s")
+
+    with EventLogReader(directory) as log:
+        damage, flags, attacker = log.column("damage"), log.column("flags"), log.column("attacker")
+        totals = [0.0] * len(log.names)
+        for row in range(log.rows):
+            if not flags[row] & FLAG_DODGE:
+                totals[attacker[row]] += damage[row]
+        for name, total in zip(log.names, totals):
+            print(f"{name:<15}{total:>14,.0f} damage dealt")
+        dodges = sum(1 for value in flags if value & FLAG_DODGE)
+        print(f"Dodge rate: {dodges / max(log.rows, 1):.3f}")
+        start, stop = log.fight_rows(games // 2)
+        print(f"Fight {games // 2} is rows {start}-{stop}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,115 +1,220 @@
 import random
+from time import perf_counter_ns
 from typing import Optional
 from constants import (
-    WELCOME_MESSAGE, GAME_OVER_MESSAGE, VICTORY_MESSAGE,
-    SEPARATOR_LENGTH, BORDER_LENGTH,
-    CRITICAL_HIT_CHANCE, CRITICAL_DAMAGE_MULTIPLIER,
-    DODGE_MESSAGE, CRITICAL_HIT_MESSAGE, SPECIAL_ABILITY_MESSAGE,
-    PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE
+    CRITICAL_HIT_CHANCE, PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE
 )
-from character import Character, Boss
-from weapon import Rock, Paper, Scissors
+from character import Character, Boss, BOSS_TYPES
+from weapon import WEAPON_TYPES, get_weapon
+import console_renderer
+from rpg_game.utils.events import (
+    EventBus, GameStartEvent, TurnEvent, CritEvent, AbilityEvent, EffectEvent, FleeEvent,
+    DefeatEvent
+)
+from rpg_game.utils.input_providers import InputProvider, InteractiveInput
+from status_effects import EffectEngine, FREEZE, PLAYER_ABILITY_EFFECT
+from rpg_game.utils.instrumentation import (
+    Instrumentation, default_timings,
+    PHASE_DISPLAY, PHASE_INPUT, PHASE_PLAYER_ATTACK, PHASE_BOSS_ATTACK, PHASE_BOSS_UPDATE
+)
+
+ACTION_PROMPT = "\n[1] Attack\n[2] Run\n[3] Use Special Ability\nChoose an action: "
+ACTIONS = ('1', '2', '3')
 
 class Game:
     """Main game class that manages game flow and state."""
-    def __init__(self):
-        """Initialize the game."""
+    def __init__(self, seed: Optional[int] = None, events: Optional[EventBus] = None,
+                 player_input: Optional[InputProvider] = None, boss_controller=None,
+                 timings: Optional[Instrumentation] = None,
+                 effects: Optional[EffectEngine] = None):
+        """
+        Initialize the game.
+        
+        Args:
+            seed (int, optional): Seed for the game's random generator,
+                making the whole session reproducible
+            events (EventBus, optional): Bus for game events; subscribe a
+                console_renderer.ConsoleRenderer to it to see the game
+            player_input (InputProvider, optional): Where the player's actions
+                come from; the keyboard by default
+            boss_controller (optional): Decides when the boss uses its
+                ability, e.g. boss_ai.ExpectimaxController; by default the
+                boss uses it whenever it is ready
+            timings (Instrumentation, optional): Latency histograms for the
+                phases of each turn; the shared default_timings by default
+            effects (EffectEngine, optional): Engine for lasting status
+                effects, e.g. EffectEngine(status_effects.ABILITY_EFFECTS);
+                without one abilities only deal their immediate damage.
+                Effects in force are not kept by savegame.
+        """
         self.player: Optional[Character] = None
         self.boss: Optional[Boss] = None
         self.is_running = False
+        self.turn = 0
+        self.rng = random.Random(seed)
+        self.events = events if events is not None else EventBus()
+        self.player_input = (player_input if player_input is not None
+                             else InteractiveInput("Invalid choice. Please try again."))
+        self.boss_controller = boss_controller
+        self.timings = timings if timings is not None else default_timings
+        self.effects = effects
 
     def setup_game(self) -> None:
         """Initialize the game with player and boss characters."""
         # Create player with base attributes
-        self.player = Character("Hero", PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE)
+        self.player = Character("Hero", PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE, self.rng, self.events)
         
         # Randomly select a weapon for the player
-        weapon_type = random.choice(list(WEAPON_TYPES.keys()))
-        self.player.weapon = WEAPON_TYPES[weapon_type]()
+        weapon_type = self.rng.choice(list(WEAPON_TYPES.keys()))
+        self.player.weapon = get_weapon(weapon_type)
         
         # Randomly select a boss type
-        boss_type = random.choice(list(BOSS_TYPES.keys()))
+        boss_type = self.rng.choice(list(BOSS_TYPES.keys()))
         self.boss = BOSS_TYPES[boss_type]()
+        self.boss.rng = self.rng
+        self.boss.events = self.events
+        self.boss.controller = self.boss_controller
+        if self.effects is not None:
+            # Status effects and the ability cooldown then share one clock
+            self.boss.effects = self.effects
         
         # Give the boss a weapon
-        boss_weapon_type = random.choice(list(WEAPON_TYPES.keys()))
-        self.boss.weapon = WEAPON_TYPES[boss_weapon_type]()
+        boss_weapon_type = self.rng.choice(list(WEAPON_TYPES.keys()))
+        self.boss.weapon = get_weapon(boss_weapon_type)
 
     def print_separator(self) -> None:
         """Print a separator line."""
-        print("=" * SEPARATOR_LENGTH)
+        console_renderer.print_separator()
 
     def print_border(self) -> None:
         """Print a border line."""
-        print("=" * BORDER_LENGTH)
+        console_renderer.print_border()
 
     def display_status(self) -> None:
         """Display current game status."""
-        self.print_separator()
-        print(f"Player: {self.player.name} (HP: {self.player.health})")
-        print(f"Weapon: {self.player.weapon.get_description()}")
-        print(f"Strength: {self.player.get_attribute('strength')}")
-        print(f"Agility: {self.player.get_attribute('agility')}")
-        print(f"Intelligence: {self.player.get_attribute('intelligence')}")
-        print(f"Boss: {self.boss.name} (HP: {self.boss.health})")
-        self.print_separator()
+        console_renderer.display_status(self.player, self.boss)
 
     def get_player_action(self) -> str:
         """Get player's action choice."""
-        while True:
-            action = input("\n[1] Attack\n[2] Run\n[3] Use Special Ability\nChoose an action: ").strip()
-            if action in ['1', '2', '3']:
-                return action
-            print("Invalid choice. Please try again.")
+        return self.player_input.choose(ACTION_PROMPT, ACTIONS, self)
 
     def run(self) -> None:
-        """Main game loop."""
-        self.is_running = True
+        """Set up a new game and play it."""
+        self.start()
+        self.play()
+
+    def start(self) -> None:
+        """Set up a new game and announce it, without playing any turns."""
         self.setup_game()
+        self.turn = 0
+        self.is_running = True
         
-        print("\n" + "=" * BORDER_LENGTH)
-        print(WELCOME_MESSAGE.center(BORDER_LENGTH))
-        print("=" * BORDER_LENGTH + "\n")
-        
-        while self.is_running:
-            self.display_status()
-            
-            if not self.player.is_alive():
-                print(GAME_OVER_MESSAGE)
-                self.is_running = False
-                break
-            
-            if not self.boss.is_alive():
-                print(VICTORY_MESSAGE)
-                self.is_running = False
-                break
-            
-            # Player's turn
+        if self.events.active:
+            self.events.emit(GameStartEvent(self.player, self.boss))
+
+    def play(self) -> None:
+        """Main game loop; continues from the current state, e.g. a loaded save."""
+        self.is_running = True
+        timings = self.timings
+        while self.is_running and self.begin_turn():
+            if timings.enabled:
+                start = perf_counter_ns()
             action = self.get_player_action()
-            
-            if action == '1':
-                # Check for critical hit
-                if random.random() < CRITICAL_HIT_CHANCE:
-                    print(f"\n{CRITICAL_HIT_MESSAGE}")
-                    self.player.attack(self.boss)
-                    self.player.attack(self.boss)  # Double damage
-                else:
-                    self.player.attack(self.boss)
-                print(f"\n{self.player.name} attacks {self.boss.name} with {self.player.weapon.get_description()}!")
-            elif action == '3':
-                if self.player.use_special_ability():
-                    print(f"\n{SPECIAL_ABILITY_MESSAGE}")
-                else:
-                    print("\nNot enough intelligence to use special ability!")
+            if timings.enabled:
+                timings.record(PHASE_INPUT, start)
+            self.take_turn(action)
+
+    def begin_turn(self) -> bool:
+        """
+        Start the next turn and check whether anyone has been defeated.
+
+        play() calls this and take_turn() in a loop; code that gets the
+        player's actions some other way, such as a network server, can call
+        them directly instead.
+
+        Returns:
+            bool: True if the player should now choose an action
+        """
+        events = self.events
+        self.turn += 1
+        if events.active:
+            # Subscribers such as the console renderer show the status here
+            timed = self.timings.enabled
+            if timed:
+                start = perf_counter_ns()
+            events.emit(TurnEvent(self.turn, self.player, self.boss))
+            if timed:
+                self.timings.record(PHASE_DISPLAY, start)
+        
+        if not self.player.is_alive():
+            if events.active:
+                events.emit(DefeatEvent(self.player, self.boss))
+            self.is_running = False
+            return False
+        
+        if not self.boss.is_alive():
+            if events.active:
+                events.emit(DefeatEvent(self.boss, self.player))
+            self.is_running = False
+            return False
+        
+        return True
+
+    def take_turn(self, action: str) -> None:
+        """
+        Carry out the player's action and the boss's reply.
+
+        Args:
+            action (str): '1' to attack, '3' to use the special ability,
+                anything else to run away
+        """
+        events = self.events
+        timings = self.timings
+        timed = timings.enabled
+        if timed:
+            start = perf_counter_ns()
+        
+        # Player's turn
+        effects = self.effects
+        if (action in ('1', '3') and effects is not None
+                and effects.has(self.player, FREEZE.name)):
+            # A frozen player loses the action but can still try to run
+            if events.active:
+                events.emit(EffectEvent(self.player, FREEZE.name, 0))
+        elif action == '1':
+            # Check for critical hit
+            if self.rng.random() < CRITICAL_HIT_CHANCE:
+                if events.active:
+                    events.emit(CritEvent(self.player))
+                self.player.attack(self.boss)
+                self.player.attack(self.boss)  # Double damage
             else:
-                print("\nYou try to run away!")
-                self.is_running = False
-                break
+                self.player.attack(self.boss)
+        elif action == '3':
+            if self.player.use_special_ability():
+                if effects is not None:
+                    effects.apply(self.player, PLAYER_ABILITY_EFFECT)
+            elif events.active:
+                events.emit(AbilityEvent(self.player, self.boss, None, 0, False, False))
+        else:
+            if events.active:
+                events.emit(FleeEvent(self.player))
+            self.is_running = False
+            return
+        if timed:
+            timings.record(PHASE_PLAYER_ATTACK, start)
+        
+        # Boss's turn if player didn't run
+        if self.is_running:
+            if timed:
+                start = perf_counter_ns()
+            # Includes the boss controller's decision, if it has one
+            self.boss.attack(self.player)
+            if timed:
+                timings.record(PHASE_BOSS_ATTACK, start)
+                start = perf_counter_ns()
             
-            # Boss's turn if player didn't run
-            if self.is_running:
-                self.boss.attack(self.player)
-                print(f"\n{self.boss.name} attacks {self.player.name} with {self.boss.weapon.get_description()}!")
-                
-                # Update boss state
-                self.boss.update()
+            # Update boss state
+            self.boss.update()
+            if timed:
+                timings.record(PHASE_BOSS_UPDATE, start)
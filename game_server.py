@@ -0,0 +1,244 @@
+"""
+Asyncio game server hosting many independent game sessions in one process.
+
+Players connect over TCP and play with a line protocol, for example with
+``nc localhost 8765``. Each connection gets its own Game, driven one turn
+at a time through Game.begin_turn and Game.take_turn, so no session ever
+blocks the event loop waiting for input. Sessions idle for longer than the
+idle timeout are closed.
+
+Protocol, one UTF-8 line per message:
+    server -> client   game text, then PROMPT when an action is expected
+                       or GAME_OVER_PROMPT once the game has finished
+    client -> server   1, 2 or 3 during a game; NEW after a game;
+                       QUIT at any time
+"""
+import asyncio
+import itertools
+import sys
+import time
+from typing import Dict, List, Optional
+
+from game import Game, ACTIONS
+from console_renderer import ConsoleRenderer
+from parallel_simulation import derive_seed
+from rpg_game.utils.metrics import MetricsCollector, export_when_enabled
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_IDLE_TIMEOUT = 300.0  # Seconds without input before a session is closed
+DEFAULT_MAX_SESSIONS = 10_000
+
+PROMPT = "Choose an action: [1] Attack [2] Run [3] Use Special Ability"
+GAME_OVER_PROMPT = "Game over. Type NEW to play again or QUIT to leave."
+INVALID_CHOICE = "Invalid choice. Please try again."
+SERVER_FULL = "Server is full. Please try again later."
+IDLE_CLOSED = "Closing idle session."
+
+
+class Session:
+    """One connected player and their current game."""
+
+    def __init__(self, session_id: int, writer: asyncio.StreamWriter,
+                 seed: Optional[int] = None, metrics: Optional[MetricsCollector] = None):
+        """
+        Initialise a session; call start_game() to begin playing.
+
+        Args:
+            session_id (int): Server-wide session number
+            writer (asyncio.StreamWriter): The player's connection
+            seed (int, optional): Server seed; each game gets a seed derived
+                from it, making every session reproducible
+            metrics (MetricsCollector, optional): Collector subscribed to
+                every game, for gameplay metrics
+        """
+        self.id = session_id
+        self.writer = writer
+        self.seed = seed
+        self.metrics = metrics
+        self.game: Optional[Game] = None
+        self.games_played = 0
+        self.last_active = time.monotonic()
+        self._lines: List[str] = []
+        self._renderer = ConsoleRenderer(self._lines.append)
+
+    def start_game(self) -> None:
+        """Start a new game and ask for the first action."""
+        seed = None if self.seed is None else derive_seed(self.seed, self.id, self.games_played)
+        self.game = Game(seed)
+        self.game.events.subscribe(self._renderer)
+        if self.metrics is not None:
+            self.game.events.subscribe(self.metrics)
+        self.games_played += 1
+        self.game.start()
+        self._next_turn()
+
+    def _next_turn(self) -> None:
+        """Begin the next turn, or finish the game if it is over."""
+        game = self.game
+        if game.is_running and game.begin_turn():
+            self._lines.append(PROMPT)
+        else:
+            self._lines.append(GAME_OVER_PROMPT)
+
+    def handle(self, line: str) -> bool:
+        """
+        Act on one line from the player.
+
+        Args:
+            line (str): The decoded line
+
+        Returns:
+            bool: False if the player asked to leave
+        """
+        command = line.strip().upper()
+        if command == "QUIT":
+            return False
+        if self.game is not None and self.game.is_running:
+            if command in ACTIONS:
+                self.game.take_turn(command)
+                self._next_turn()
+            else:
+                self._lines.extend((INVALID_CHOICE, PROMPT))
+        elif command == "NEW":
+            self.start_game()
+        else:
+            self._lines.append(GAME_OVER_PROMPT)
+        return True
+
+    def close(self) -> None:
+        """Let go of the current game, finished or not, when the player leaves."""
+        if self.game is not None and self.metrics is not None:
+            self.metrics.end_fight(self.game.player)
+            self.game.events.unsubscribe(self.metrics)
+        self.game = None
+
+    def flush(self) -> None:
+        """Send the text produced since the last flush in one write."""
+        if self._lines:
+            self._lines.append("")
+            self.writer.write("\n".join(self._lines).encode())
+            self._lines.clear()
+
+
+class GameServer:
+    """TCP server running one Session per connection on an asyncio event loop."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS, seed: Optional[int] = None,
+                 metrics: Optional[MetricsCollector] = None):
+        """
+        Configure the server; call start() to begin accepting players.
+
+        Args:
+            host (str): Address to listen on
+            port (int): Port to listen on; 0 picks a free port
+            idle_timeout (float): Seconds without input before a session is closed
+            max_sessions (int): Connections beyond this are turned away
+            seed (int, optional): Seed for reproducible sessions
+            metrics (MetricsCollector, optional): Collector for the gameplay
+                metrics of every session
+        """
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.seed = seed
+        self.metrics = metrics
+        self.sessions: Dict[int, Session] = {}
+        self.evicted = 0
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._evictor: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start listening and sweeping idle sessions."""
+        self._server = await asyncio.start_server(self._serve_session, self.host, self.port,
+                                                  backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._evictor = asyncio.create_task(self._evict_idle_sessions())
+
+    async def serve_forever(self) -> None:
+        """Start the server if needed and run until cancelled."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop accepting players and close every session."""
+        if self._evictor is not None:
+            self._evictor.cancel()
+            self._evictor = None
+        if self._server is not None:
+            self._server.close()
+            for session in list(self.sessions.values()):
+                session.writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve_session(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter) -> None:
+        """Play games with one connected player until they leave."""
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(f"{SERVER_FULL}\n".encode())
+            writer.close()
+            return
+        session = Session(next(self._ids), writer, self.seed, self.metrics)
+        self.sessions[session.id] = session
+        try:
+            session.start_game()
+            session.flush()
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break  # Player disconnected or the session was evicted
+                session.last_active = time.monotonic()
+                if not session.handle(line.decode(errors="replace")):
+                    break
+                session.flush()
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass  # Dropped connection, or a line longer than the stream limit
+        finally:
+            del self.sessions[session.id]
+            session.close()
+            writer.close()
+
+    async def _evict_idle_sessions(self) -> None:
+        """Close sessions that have sent nothing for idle_timeout seconds."""
+        interval = min(self.idle_timeout / 4, 5.0)
+        while True:
+            await asyncio.sleep(interval)
+            cutoff = time.monotonic() - self.idle_timeout
+            for session in [session for session in self.sessions.values()
+                            if session.last_active < cutoff]:
+                session.writer.write(f"{IDLE_CLOSED}\n".encode())
+                # Closing the transport ends the session's pending readline
+                session.writer.close()
+                self.evicted += 1
+
+
+def main() -> None:
+    """Run the server until interrupted."""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    # Gameplay metrics are exported when RPG_METRICS_FILE or RPG_METRICS_PORT is set
+    server = GameServer(port=port, metrics=MetricsCollector() if export_when_enabled() else None)
+
+    async def serve() -> None:
+        await server.start()
+        print(f"Game server listening on {server.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Speed-based initiative for encounters with any number of combatants.
+
+Each combatant acts once every 1 / speed units of initiative time, with
+speed derived from agility (Character.stats.speed). The scheduler keeps
+everyone's next action time in a binary heap, so finding who acts next
+and rescheduling them costs O(log n) however many combatants there are.
+Equal times are broken by the order combatants were added, so two
+combatants of the same speed alternate exactly as game.Game's player and
+boss do.
+
+Removing a combatant only marks its heap entry as dead; dead entries are
+dropped as they reach the top, and the heap is rebuilt once they make up
+half of it.
+
+run_encounter plays a free-for-all between teams on this timeline:
+    python initiative.py 1000 3      # heroes, bosses
+"""
+import heapq
+import itertools
+import random
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from constants import PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE
+from character import Character, Boss, BOSS_TYPES
+
+# Heap entry fields: [next action time, tie-break number, combatant, time between actions]
+_TIME, _ORDER, _COMBATANT, _INTERVAL = range(4)
+
+
+class InitiativeScheduler:
+    """Timeline of combatants ordered by when they next act."""
+
+    def __init__(self):
+        """Initialise an empty timeline at time 0."""
+        self.time = 0.0
+        self._heap: List[list] = []
+        # id(combatant) -> its live heap entry
+        self._entries: Dict[int, list] = {}
+        self._order = itertools.count()
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, combatant: object) -> bool:
+        return id(combatant) in self._entries
+
+    def add(self, combatant: Character, speed: Optional[float] = None) -> None:
+        """
+        Put a combatant on the timeline; it first acts one interval from now.
+
+        Args:
+            combatant (Character): The combatant
+            speed (float, optional): Actions per unit of time; the
+                combatant's stats.speed by default
+        """
+        if id(combatant) in self._entries:
+            raise ValueError(f"{combatant.name} is already scheduled")
+        interval = 1.0 / (speed if speed is not None else combatant.stats.speed)
+        entry = [self.time + interval, next(self._order), combatant, interval]
+        self._entries[id(combatant)] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, combatant: Character) -> None:
+        """
+        Take a combatant off the timeline, e.g. when it is defeated.
+
+        Args:
+            combatant (Character): A scheduled combatant
+        """
+        entry = self._entries.pop(id(combatant))
+        entry[_COMBATANT] = None
+        self._dead += 1
+        if self._dead * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if entry[_COMBATANT] is not None]
+            heapq.heapify(self._heap)
+            self._dead = 0
+
+    def set_speed(self, combatant: Character, speed: Optional[float] = None) -> None:
+        """
+        Change a combatant's speed from its next action on.
+
+        Args:
+            combatant (Character): A scheduled combatant
+            speed (float, optional): Actions per unit of time; the
+                combatant's current stats.speed by default
+        """
+        self._entries[id(combatant)][_INTERVAL] = 1.0 / (
+            speed if speed is not None else combatant.stats.speed)
+
+    def next(self) -> Character:
+        """
+        Advance to the next action and schedule the one after it.
+
+        Returns:
+            Character: The combatant whose turn it is
+        """
+        heap = self._heap
+        while heap and heap[0][_COMBATANT] is None:
+            heapq.heappop(heap)
+            self._dead -= 1
+        if not heap:
+            raise IndexError("No combatants scheduled")
+        entry = heap[0]
+        combatant = entry[_COMBATANT]
+        self.time = entry[_TIME]
+        following = [self.time + entry[_INTERVAL], next(self._order), combatant, entry[_INTERVAL]]
+        self._entries[id(combatant)] = following
+        # One sift instead of a pop and a push
+        heapq.heapreplace(heap, following)
+        return combatant
+
+
+class EncounterResult(NamedTuple):
+    """How an encounter ended."""
+    # Index of the last team standing, or None if called off or nobody was left
+    winner: Optional[int]
+    actions: int
+    # Initiative time when the encounter ended
+    time: float
+
+
+class _Team:
+    """A team's living members, with O(1) random choice and removal."""
+
+    def __init__(self, members: Sequence[Character]):
+        self.alive = list(members)
+        self.index = {id(member): position for position, member in enumerate(self.alive)}
+
+    def remove(self, member: Character) -> None:
+        position = self.index.pop(id(member))
+        last = self.alive.pop()
+        if last is not member:
+            self.alive[position] = last
+            self.index[id(last)] = position
+
+
+def run_encounter(teams: Sequence[Sequence[Character]], rng: Optional[random.Random] = None,
+                  max_actions: int = 10_000_000) -> EncounterResult:
+    """
+    Fight teams against each other in initiative order.
+
+    On its turn each combatant attacks a random living member of a random
+    other team that still has members; a boss then runs Boss.update, as at
+    the end of a game.Game turn, so its ability cooldown ticks with its own
+    actions. A combatant brought to 0 HP is removed from the timeline and
+    its team.
+
+    Args:
+        teams (Sequence[Sequence[Character]]): The combatants of each team
+        rng (random.Random, optional): Generator for picking targets
+        max_actions (int): Actions after which the encounter is called off
+
+    Returns:
+        EncounterResult: The winning team, actions taken and time reached
+    """
+    rng = rng or random.Random()
+    scheduler = InitiativeScheduler()
+    standing = [_Team(members) for members in teams]
+    team_of = {}
+    for number, members in enumerate(teams):
+        for member in members:
+            team_of[id(member)] = number
+            scheduler.add(member)
+    opponents = [number for number, team in enumerate(standing) if team.alive]
+
+    for actions in range(max_actions):
+        if len(opponents) <= 1:
+            return EncounterResult(opponents[0] if opponents else None, actions, scheduler.time)
+        actor = scheduler.next()
+        own = team_of[id(actor)]
+        team = own
+        while team == own:
+            team = opponents[int(rng.random() * len(opponents))]
+        members = standing[team].alive
+        target = members[int(rng.random() * len(members))]
+        actor.attack(target)
+        if isinstance(actor, Boss):
+            actor.update()
+        if not target.is_alive():
+            scheduler.remove(target)
+            standing[team].remove(target)
+            if not standing[team].alive:
+                opponents.remove(team)
+    return EncounterResult(None, max_actions, scheduler.time)
+
+
+def main() -> None:
+    """Time an encounter between many heroes and a few bosses."""
+    heroes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    bosses = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rng = random.Random(0)
+    hero_team = [Character(f"Hero {number}", PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE, rng)
+                 for number in range(heroes)]
+    boss_types = list(BOSS_TYPES.values())
+    boss_team = []
+    for number in range(bosses):
+        boss = boss_types[number % len(boss_types)]()
+        boss.rng = rng
+        # Enough health to stand up to the crowd for a while
+        boss.health *= heroes
+        boss_team.append(boss)
+
+    start = time.perf_counter()
+    result = run_encounter((hero_team, boss_team), rng)
+    elapsed = time.perf_counter() - start
+    outcome = {0: "Heroes win", 1: "Bosses win"}.get(result.winner, "No winner")
+    print(f"{outcome}: {sum(hero.is_alive() for hero in hero_team)} heroes and "
+          f"{sum(boss.is_alive() for boss in boss_team)} bosses standing")
+    print(f"{result.actions:,} actions in {elapsed:.2f}s "
+          f"({result.actions / elapsed:,.0f} actions/second)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,17 @@
 from game import Game
+from console_renderer import ConsoleRenderer
+from rpg_game.utils.instrumentation import default_timings
+from rpg_game.utils.metrics import MetricsCollector, export_when_enabled
 
 def main() -> None:
     """Main entry point of the game."""
+    # Phase timings are reported on exit when RPG_TIMINGS is set
+    default_timings.dump_when_enabled()
     game = Game()
+    game.events.subscribe(ConsoleRenderer())
+    # Gameplay metrics are exported when RPG_METRICS_FILE or RPG_METRICS_PORT is set
+    if export_when_enabled():
+        game.events.subscribe(MetricsCollector())
     game.run()
 
 if __name__ == "__main__":
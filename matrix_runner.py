@@ -0,0 +1,312 @@
+"""
+Incremental outcome matrix for every weapon, boss and attribute setting.
+
+The matrix has one row per player weapon, boss and combination of the
+player's strength, agility and intelligence from a grid, with the exact
+win, loss and double-knockout probabilities and expected fight length from
+solver.py, averaged over the boss's random weapon.
+
+Each (weapon, boss, boss weapon, attributes) cell is cached on disk under
+a hash of its inputs: the FightSpec measured from the real classes, which
+covers every constant and damage formula the fight depends on, and the
+source of the solver. A rerun only solves cells whose hash changed, so
+after editing one weapon's damage only the cells where that weapon is
+held by the player or the boss are recomputed.
+
+The matrix is written as CSV and as a column directory like event_log's:
+    meta.json          version, row count and the weapon and boss name tables
+    <column>.col       one file per column, packed native values
+"""
+import csv
+import hashlib
+import inspect
+import itertools
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import solver
+from character import BOSS_TYPES
+from constants import ATTRIBUTE_STRENGTH, ATTRIBUTE_AGILITY, ATTRIBUTE_INTELLIGENCE
+from weapon import WEAPON_TYPES
+from simulation import FightSpec, create_player, create_boss, spec_from_characters
+from solver import FightOdds
+
+MATRIX_VERSION = 1
+# Part of every cell hash; bump it to invalidate the whole cache
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = ".matrix_cache"
+
+# Player attribute values to try; the matrix covers every combination
+DEFAULT_GRID: Dict[str, Tuple[int, ...]] = {
+    ATTRIBUTE_STRENGTH: (5, 10, 15),
+    ATTRIBUTE_AGILITY: (5, 10, 15),
+    ATTRIBUTE_INTELLIGENCE: (5, 10, 15),
+}
+
+# Column name -> array typecode
+COLUMNS = {
+    "weapon": "B",             # Index into the weapon name table
+    "boss": "B",               # Index into the boss name table
+    "strength": "h",
+    "agility": "h",
+    "intelligence": "h",
+    "win": "d",
+    "loss": "d",
+    "double_knockout": "d",
+    "expected_turns": "d",
+}
+
+_ODDS = struct.Struct("<4d")
+# Cells are only valid for the solver that produced them
+_SOLVER_HASH = hashlib.sha256(inspect.getsource(solver).encode()).hexdigest()
+
+
+class MatrixRow(NamedTuple):
+    """Outcome of one weapon, boss and attribute setting."""
+    weapon: str
+    boss: str
+    strength: int
+    agility: int
+    intelligence: int
+    win: float
+    loss: float
+    double_knockout: float
+    expected_turns: float
+
+
+class MatrixResult(NamedTuple):
+    """A computed matrix and how much of it had to be solved."""
+    rows: List[MatrixRow]
+    cells: int
+    solved: int
+    # Cells found on disk or identical to one already solved in this run
+    cached: int
+
+
+def cell_spec(weapon_type: str, boss_type: str, boss_weapon_type: str,
+              strength: int, agility: int, intelligence: int) -> FightSpec:
+    """
+    Measure one cell's fight from the real classes.
+
+    Args:
+        weapon_type (str): Player weapon key into WEAPON_TYPES
+        boss_type (str): Key into BOSS_TYPES
+        boss_weapon_type (str): Boss weapon key into WEAPON_TYPES
+        strength (int): Player strength
+        agility (int): Player agility
+        intelligence (int): Player intelligence
+
+    Returns:
+        FightSpec: The cell's matchup numbers
+    """
+    player = create_player(weapon_type)
+    player.set_attribute(ATTRIBUTE_STRENGTH, strength)
+    player.set_attribute(ATTRIBUTE_AGILITY, agility)
+    player.set_attribute(ATTRIBUTE_INTELLIGENCE, intelligence)
+    return spec_from_characters(player, create_boss(boss_type, boss_weapon_type))
+
+
+def cell_key(spec: FightSpec) -> str:
+    """
+    Hash everything a cell's outcome depends on.
+
+    Args:
+        spec (FightSpec): The cell's matchup numbers
+
+    Returns:
+        str: Hex digest naming the cell in the cache
+    """
+    key = f"{CACHE_VERSION}:{_SOLVER_HASH}:{tuple(spec)!r}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class ResultCache:
+    """Solved cells on disk, one small file per cell hash."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        """
+        Open (or create) a cache directory.
+
+        Args:
+            directory (str): Where the cell files live
+        """
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        # Two-character subdirectories keep directory listings short
+        return os.path.join(self.directory, key[:2], f"{key}.bin")
+
+    def get(self, key: str) -> Optional[FightOdds]:
+        """
+        Look up a cell.
+
+        Args:
+            key (str): Cell hash from cell_key
+
+        Returns:
+            FightOdds: The cached odds, or None if the cell is not cached
+        """
+        try:
+            with open(self._path(key), "rb") as cell_file:
+                data = cell_file.read()
+        except FileNotFoundError:
+            return None
+        if len(data) != _ODDS.size:
+            return None  # Partly written by an interrupted run
+        return FightOdds(*_ODDS.unpack(data))
+
+    def put(self, key: str, odds: FightOdds) -> None:
+        """
+        Store a cell.
+
+        Args:
+            key (str): Cell hash from cell_key
+            odds (FightOdds): The cell's odds
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as cell_file:
+            cell_file.write(_ODDS.pack(*odds))
+        # Readers see either no file or a complete one
+        os.replace(temporary, path)
+
+
+def run_matrix(grid: Optional[Dict[str, Sequence[int]]] = None,
+               cache: Optional[ResultCache] = None) -> MatrixResult:
+    """
+    Compute the matrix, solving only the cells missing from the cache.
+
+    Args:
+        grid (Dict[str, Sequence[int]], optional): Values of each player
+            attribute; defaults to DEFAULT_GRID
+        cache (ResultCache, optional): Cell cache; defaults to DEFAULT_CACHE_DIR
+
+    Returns:
+        MatrixResult: Rows in weapon, boss, strength, agility, intelligence order
+    """
+    grid = grid or DEFAULT_GRID
+    cache = cache or ResultCache()
+    attribute_values = list(itertools.product(
+        grid[ATTRIBUTE_STRENGTH], grid[ATTRIBUTE_AGILITY], grid[ATTRIBUTE_INTELLIGENCE]))
+    # Cells with the same numbers share a hash, so each is solved once per run
+    known: Dict[str, FightOdds] = {}
+    rows = []
+    cells = solved = cached = 0
+
+    for weapon_type, boss_type, attributes in itertools.product(
+            WEAPON_TYPES, BOSS_TYPES, attribute_values):
+        odds = []
+        for boss_weapon_type in WEAPON_TYPES:
+            spec = cell_spec(weapon_type, boss_type, boss_weapon_type, *attributes)
+            key = cell_key(spec)
+            cells += 1
+            cell = known.get(key)
+            if cell is None:
+                cell = cache.get(key)
+                if cell is None:
+                    cell = solver.solve(spec)
+                    cache.put(key, cell)
+                    solved += 1
+                else:
+                    cached += 1
+                known[key] = cell
+            else:
+                cached += 1
+            odds.append(cell)
+        # The boss's weapon is picked at random, so average over it
+        average = (sum(values) / len(odds) for values in zip(*odds))
+        rows.append(MatrixRow(weapon_type, boss_type, *attributes, *average))
+    return MatrixResult(rows, cells, solved, cached)
+
+
+def write_csv(rows: Sequence[MatrixRow], path: str) -> None:
+    """
+    Write the matrix as CSV with a header row.
+
+    Args:
+        rows (Sequence[MatrixRow]): The matrix
+        path (str): Output file
+    """
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(MatrixRow._fields)
+        writer.writerows(rows)
+
+
+def write_columns(rows: Sequence[MatrixRow], directory: str) -> None:
+    """
+    Write the matrix as one packed file per column.
+
+    Weapon and boss names are stored as indexes into name tables kept in
+    meta.json.
+
+    Args:
+        rows (Sequence[MatrixRow]): The matrix
+        directory (str): Output directory; created if needed
+    """
+    os.makedirs(directory, exist_ok=True)
+    weapons, bosses = list(WEAPON_TYPES), list(BOSS_TYPES)
+    weapon_index = {name: index for index, name in enumerate(weapons)}
+    boss_index = {name: index for index, name in enumerate(bosses)}
+    columns = {name: array(code) for name, code in COLUMNS.items()}
+    for row in rows:
+        columns["weapon"].append(weapon_index[row.weapon])
+        columns["boss"].append(boss_index[row.boss])
+        for name in MatrixRow._fields[2:]:
+            columns[name].append(getattr(row, name))
+    for name, values in columns.items():
+        with open(os.path.join(directory, f"{name}.col"), "wb") as column_file:
+            values.tofile(column_file)
+    with open(os.path.join(directory, "meta.json"), "w") as meta_file:
+        json.dump({"version": MATRIX_VERSION, "rows": len(rows),
+                   "weapons": weapons, "bosses": bosses}, meta_file)
+
+
+def read_columns(directory: str) -> List[MatrixRow]:
+    """
+    Read a matrix written by write_columns.
+
+    Args:
+        directory (str): The column directory
+
+    Returns:
+        List[MatrixRow]: The matrix
+    """
+    with open(os.path.join(directory, "meta.json")) as meta_file:
+        meta = json.load(meta_file)
+    if meta["version"] != MATRIX_VERSION:
+        raise ValueError(f"Unsupported matrix version: {meta['version']}")
+    columns = {}
+    for name, code in COLUMNS.items():
+        values = array(code)
+        with open(os.path.join(directory, f"{name}.col"), "rb") as column_file:
+            values.fromfile(column_file, meta["rows"])
+        columns[name] = values
+    columns["weapon"] = [meta["weapons"][index] for index in columns["weapon"]]
+    columns["boss"] = [meta["bosses"][index] for index in columns["boss"]]
+    return [MatrixRow(*values) for values in zip(*(columns[name] for name in MatrixRow._fields))]
+
+
+def main() -> None:
+    """Regenerate the matrix from the command line."""
+    output = sys.argv[1] if len(sys.argv) > 1 else "matrix"
+    cache_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CACHE_DIR
+    start = time.perf_counter()
+    result = run_matrix(cache=ResultCache(cache_dir))
+    elapsed = time.perf_counter() - start
+    os.makedirs(output, exist_ok=True)
+    write_csv(result.rows, os.path.join(output, "matrix.csv"))
+    write_columns(result.rows, os.path.join(output, "columns"))
+    print(f"{len(result.rows)} rows from {result.cells} cells: {result.solved} solved, "
+          f"{result.cached} cached, in {elapsed:.2f}s")
+    print(f"Wrote {output}/matrix.csv and {output}/columns/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Monte Carlo tree search auto-player.
+
+MCTSPlayer is an input provider: give it to game.Game as player_input and
+it picks [1] Attack, [2] Run or [3] Use Special Ability each turn by
+Monte Carlo tree search.
+
+- The fight is copied into a four-number FightState (both HPs and the
+  boss's ability state); every playout starts from that tuple, so cloning
+  the game costs nothing.
+- The tree is open-loop: nodes stand for sequences of the player's
+  actions, and the dice are rolled afresh in every playout.
+- Nodes live in a NodePool of flat lists that is reset, not reallocated,
+  for every decision.
+- Playouts finish the fight by attacking every turn.
+
+Rewards are 1 for a win and 0 for a loss; running away scores FLEE_REWARD.
+"""
+import math
+import random
+import sys
+import time
+from typing import List, NamedTuple, Optional, Sequence
+
+from constants import CRITICAL_HIT_CHANCE, ABILITY_COOLDOWN_TURNS
+from character import BOSS_TYPES
+from game import Game, ACTIONS
+from simulation import MAX_TURNS
+from rpg_game.utils.input_providers import InputProvider, PolicyInput, always
+
+DEFAULT_PLAYOUTS = 1000  # Playouts per decision
+DEFAULT_EXPLORATION = math.sqrt(2)  # UCB1 exploration constant
+
+# Running away ends the game without a win
+FLEE_REWARD = 0.0
+
+ATTACK, RUN, SPECIAL = range(3)
+_NO_CHILDREN = -1
+
+
+class FightState(NamedTuple):
+    """The parts of a fight that change from turn to turn."""
+    player_health: float
+    boss_health: float
+    ability_ready: bool
+    ability_cooldown: int
+
+
+class FightRules(NamedTuple):
+    """The fixed numbers of a fight."""
+    player_damage: float
+    player_dodge: float
+    boss_damage: float
+    boss_dodge: float
+    ability_damage: float
+    ability_cooldown: int
+    crit_chance: float
+
+
+def read_game(game: Game):
+    """
+    Copy a game's fight into the numbers the search works from.
+
+    Args:
+        game (Game): The game, with both characters set up
+
+    Returns:
+        Tuple[FightState, FightRules]: Current state and fixed numbers
+    """
+    player_stats, boss_stats = game.player.stats, game.boss.stats
+    state = FightState(game.player.health, game.boss.health,
+                       game.boss.ability_ready, game.boss.ability_cooldown)
+    rules = FightRules(player_stats.attack_damage, player_stats.dodge_chance,
+                       boss_stats.attack_damage, boss_stats.dodge_chance,
+                       boss_stats.ability_damage, ABILITY_COOLDOWN_TURNS, CRITICAL_HIT_CHANCE)
+    return state, rules
+
+
+class NodePool:
+    """
+    Search tree stored as flat lists indexed by node number.
+
+    A node's children are allocated together, one per action, so a node
+    only records where its first child is. reset() empties the pool while
+    keeping the lists, so after the first few decisions no nodes are
+    allocated at all.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialise an empty pool.
+
+        Args:
+            capacity (int): Nodes to allocate up front; the pool grows as needed
+        """
+        self.visits: List[int] = [0] * capacity
+        self.totals: List[float] = [0.0] * capacity
+        self.first_child: List[int] = [_NO_CHILDREN] * capacity
+        self.size = 0
+
+    def reset(self) -> int:
+        """
+        Empty the pool and create a root node.
+
+        Returns:
+            int: The root node
+        """
+        self.size = 0
+        return self._allocate(1)
+
+    def expand(self, node: int) -> int:
+        """
+        Create one child per action for a node.
+
+        Args:
+            node (int): The node to expand
+
+        Returns:
+            int: The first child; child for action a is first + a
+        """
+        first = self._allocate(len(ACTIONS))
+        self.first_child[node] = first
+        return first
+
+    def _allocate(self, count: int) -> int:
+        start = self.size
+        end = start + count
+        if end > len(self.visits):
+            grow = max(count, len(self.visits))
+            self.visits.extend([0] * grow)
+            self.totals.extend([0.0] * grow)
+            self.first_child.extend([_NO_CHILDREN] * grow)
+        # Clear whatever an earlier decision left in these slots
+        for node in range(start, end):
+            self.visits[node] = 0
+            self.totals[node] = 0.0
+            self.first_child[node] = _NO_CHILDREN
+        self.size = end
+        return start
+
+
+class MCTSPlayer(InputProvider):
+    """Input provider that chooses the player's actions by Monte Carlo tree search."""
+
+    def __init__(self, playouts: int = DEFAULT_PLAYOUTS, seed: Optional[int] = None,
+                 exploration: float = DEFAULT_EXPLORATION, name: str = "MCTS"):
+        """
+        Initialise the player.
+
+        Args:
+            playouts (int): Playouts per decision
+            seed (int, optional): Seed for the search's own random generator;
+                the game's generator is never touched
+            exploration (float): UCB1 exploration constant
+            name (str): Answer given to text() prompts
+        """
+        self.playouts = playouts
+        self.exploration = exploration
+        self.name = name
+        self.rng = random.Random(seed)
+        self.pool = NodePool()
+        self.last_visits: List[int] = []
+        # Statistics
+        self.decisions = 0
+        self.total_playouts = 0
+        self.search_time = 0.0
+
+    def choose(self, prompt: str, options: Sequence[str], game: Game = None) -> str:
+        if game is None or game.player is None or game.boss is None:
+            return options[0]
+        state, rules = read_game(game)
+        return ACTIONS[self.search(state, rules)]
+
+    def text(self, prompt: str) -> str:
+        return self.name
+
+    def search(self, state: FightState, rules: FightRules) -> int:
+        """
+        Run the playout budget from a state and pick an action.
+
+        Args:
+            state (FightState): The fight at the start of the player's turn
+            rules (FightRules): The fight's fixed numbers
+
+        Returns:
+            int: ATTACK, RUN or SPECIAL; the most visited action
+        """
+        start = time.perf_counter()
+        pool = self.pool
+        root = pool.reset()
+        visits, totals, first_child = pool.visits, pool.totals, pool.first_child
+        exploration = self.exploration
+        log = math.log
+        sqrt = math.sqrt
+        step = self._step
+        path: List[int] = []
+
+        for _ in range(self.playouts):
+            # Each playout works on its own copy of the state: four locals
+            player_hp, boss_hp, ready, cooldown = state
+            node = root
+            path.clear()
+            path.append(node)
+            reward = None
+            while True:
+                first = first_child[node]
+                if first == _NO_CHILDREN:
+                    if node != root and visits[node] == 0:
+                        break  # New leaf: play the rest of the fight out from here
+                    first = pool.expand(node)
+                    visits, totals, first_child = pool.visits, pool.totals, pool.first_child
+                # UCB1 selection; untried actions first
+                scale = exploration * sqrt(log(visits[node] + 1))
+                best_action = 0
+                best_score = -1.0
+                for action in range(len(ACTIONS)):
+                    child_visits = visits[first + action]
+                    if child_visits == 0:
+                        best_action = action
+                        break
+                    score = totals[first + action] / child_visits + scale / sqrt(child_visits)
+                    if score > best_score:
+                        best_action, best_score = action, score
+                node = first + best_action
+                path.append(node)
+                player_hp, boss_hp, ready, cooldown, reward = step(
+                    rules, player_hp, boss_hp, ready, cooldown, best_action)
+                if reward is not None:
+                    break
+            if reward is None:
+                reward = self._rollout(rules, player_hp, boss_hp, ready, cooldown)
+            for node in path:
+                visits[node] += 1
+                totals[node] += reward
+
+        first = first_child[root]
+        self.last_visits = visits[first:first + len(ACTIONS)]
+        self.decisions += 1
+        self.total_playouts += self.playouts
+        self.search_time += time.perf_counter() - start
+        return max(range(len(ACTIONS)), key=lambda action: visits[first + action])
+
+    def _step(self, rules: FightRules, player_hp: float, boss_hp: float, ready: bool,
+              cooldown: int, action: int):
+        """
+        Play one turn as Game.take_turn and the next Game.begin_turn do.
+
+        Returns the new state and the reward if the fight ended, else None.
+        """
+        rand = self.rng.random
+        if action == RUN:
+            return player_hp, boss_hp, ready, cooldown, FLEE_REWARD
+        if action == ATTACK:
+            # A critical hit is a second attack; the special ability does nothing
+            swings = 2 if rand() < rules.crit_chance else 1
+            for _ in range(swings):
+                if rand() > rules.boss_dodge:
+                    boss_hp = max(0, boss_hp - rules.player_damage)
+
+        # Boss.attack and Boss.update; the boss swings even as it falls
+        if ready and rules.ability_damage > 0:
+            if rand() > rules.player_dodge:
+                player_hp = max(0, player_hp - rules.ability_damage)
+            ready = False
+            cooldown = rules.ability_cooldown
+        if rand() > rules.player_dodge:
+            player_hp = max(0, player_hp - rules.boss_damage)
+        if not ready:
+            cooldown -= 1
+            if cooldown <= 0:
+                ready = True
+
+        if player_hp <= 0:
+            return player_hp, boss_hp, ready, cooldown, 0.0
+        if boss_hp <= 0:
+            return player_hp, boss_hp, ready, cooldown, 1.0
+        return player_hp, boss_hp, ready, cooldown, None
+
+    def _rollout(self, rules: FightRules, player_hp: float, boss_hp: float, ready: bool,
+                 cooldown: int) -> float:
+        """Finish a fight by attacking every turn; returns the reward."""
+        step = self._step
+        for _ in range(MAX_TURNS):
+            player_hp, boss_hp, ready, cooldown, reward = step(
+                rules, player_hp, boss_hp, ready, cooldown, ATTACK)
+            if reward is not None:
+                return reward
+        return 0.0
+
+    def report(self) -> str:
+        """
+        Summarise the search so far.
+
+        Returns:
+            str: One line with decisions and playouts per second
+        """
+        rate = self.total_playouts / self.search_time if self.search_time else 0.0
+        return (f"{self.decisions} decisions, {self.total_playouts:,} playouts, "
+                f"{rate:,.0f} playouts/second")
+
+
+class _BossGame(Game):
+    """Game against a chosen boss type instead of a random one."""
+
+    def __init__(self, boss_type: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.boss_type = boss_type
+
+    def setup_game(self) -> None:
+        super().setup_game()
+        boss = BOSS_TYPES[self.boss_type]()
+        boss.rng, boss.events, boss.controller = self.rng, self.events, self.boss_controller
+        if self.effects is not None:
+            boss.effects = self.effects
+        boss.weapon = self.boss.weapon
+        self.boss = boss
+
+
+def win_rates(player_input: InputProvider, games: int, seed: int = 0):
+    """
+    Play games against every boss type.
+
+    Args:
+        player_input (InputProvider): The player
+        games (int): Games per boss type
+        seed (int): Seed of the first game; game i uses seed + i
+
+    Returns:
+        Dict[str, float]: Win rate keyed by boss type
+    """
+    rates = {}
+    for boss_type in BOSS_TYPES:
+        wins = 0
+        for game_number in range(games):
+            game = _BossGame(boss_type, seed + game_number, player_input=player_input)
+            game.run()
+            wins += game.player.is_alive() and not game.boss.is_alive()
+        rates[boss_type] = wins / games
+    return rates
+
+
+def main() -> None:
+    """Report MCTS and always-attack win rates against every boss."""
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    playouts = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PLAYOUTS
+    player = MCTSPlayer(playouts, seed=0)
+    mcts = win_rates(player, games)
+    baseline = win_rates(PolicyInput(always('1')), games)
+    print(f"{'Boss':<15}{'MCTS':>8}{'Attack':>8}   ({games} games each, {playouts} playouts per move)")
+    for boss_type in BOSS_TYPES:
+        print(f"{boss_type:<15}{mcts[boss_type]:>8.3f}{baseline[boss_type]:>8.3f}")
+    print(player.report())
+
+
+if __name__ == "__main__":
+    main()
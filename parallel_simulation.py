@@ -0,0 +1,139 @@
+"""
+Multi-core battle simulation.
+
+Splits the fights for every boss and weapon pairing into fixed-size chunks
+and runs them on a process pool. Each chunk has its own random stream
+derived from the master seed, so the merged statistics are identical no
+matter how many worker processes take part.
+"""
+import hashlib
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from character import BOSS_TYPES
+from weapon import WEAPON_TYPES
+from simulation import FightSpec, SimulationResult, fight_spec, run_fights, print_report
+
+# Fights per work unit; part of the random stream layout, so changing it
+# changes the results for a given seed
+CHUNK_FIGHTS = 20_000
+
+# Work unit: (boss type, player weapon, chunk index, fights, chunk seed)
+Task = Tuple[str, str, int, int, int]
+
+# Fight specs built so far in this process, keyed by (boss, weapon)
+_spec_cache: Dict[Tuple[str, str], List[FightSpec]] = {}
+
+
+def derive_seed(master_seed: int, *path: object) -> int:
+    """
+    Derive an independent seed for one work unit from the master seed.
+
+    Args:
+        master_seed (int): Seed for the whole run
+        *path: Values identifying the work unit
+
+    Returns:
+        int: A 128-bit seed
+    """
+    key = ":".join(str(part) for part in (master_seed,) + path)
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:16], "big")
+
+
+def plan_tasks(pairings: Sequence[Tuple[str, str]], fights: int, master_seed: int) -> List[Task]:
+    """
+    Split the requested fights into seeded work units.
+
+    Args:
+        pairings (Sequence[Tuple[str, str]]): (boss, weapon) pairs to run
+        fights (int): Fights per pairing
+        master_seed (int): Seed for the whole run
+
+    Returns:
+        List[Task]: Work units in a fixed order
+    """
+    tasks = []
+    for boss_type, weapon_type in pairings:
+        for chunk, start in enumerate(range(0, fights, CHUNK_FIGHTS)):
+            count = min(CHUNK_FIGHTS, fights - start)
+            seed = derive_seed(master_seed, boss_type, weapon_type, chunk)
+            tasks.append((boss_type, weapon_type, chunk, count, seed))
+    return tasks
+
+
+def run_task(task: Task) -> SimulationResult:
+    """
+    Run one work unit; executed inside the worker processes.
+
+    Args:
+        task (Task): The work unit
+
+    Returns:
+        SimulationResult: Statistics for the unit
+    """
+    boss_type, weapon_type, _, fights, seed = task
+    specs = _spec_cache.get((boss_type, weapon_type))
+    if specs is None:
+        specs = [fight_spec(boss_type, weapon_type, boss_weapon) for boss_weapon in WEAPON_TYPES]
+        _spec_cache[(boss_type, weapon_type)] = specs
+    return run_fights(specs, fights, random.Random(seed))
+
+
+def simulate_parallel(fights: int, master_seed: int = 0, workers: Optional[int] = None,
+                      pairings: Optional[Sequence[Tuple[str, str]]] = None
+                      ) -> Dict[Tuple[str, str], SimulationResult]:
+    """
+    Simulate boss and weapon pairings across a pool of worker processes.
+
+    Args:
+        fights (int): Fights per pairing
+        master_seed (int): Seed the per-chunk random streams are derived from
+        workers (int, optional): Number of processes; defaults to the CPU count.
+            With one worker everything runs in this process.
+        pairings (Sequence[Tuple[str, str]], optional): (boss, weapon) pairs;
+            defaults to every entry of BOSS_TYPES against every WEAPON_TYPES entry
+
+    Returns:
+        Dict[Tuple[str, str], SimulationResult]: Results keyed by (boss, weapon)
+    """
+    if pairings is None:
+        pairings = [(boss_type, weapon_type) for boss_type in BOSS_TYPES for weapon_type in WEAPON_TYPES]
+    workers = workers or os.cpu_count() or 1
+    tasks = plan_tasks(pairings, fights, master_seed)
+
+    if workers == 1:
+        chunk_results = map(run_task, tasks)
+        return _merge(tasks, chunk_results)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in task order, so the merge order never depends on scheduling
+        chunk_results = pool.map(run_task, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+        return _merge(tasks, chunk_results)
+
+
+def _merge(tasks: List[Task], chunk_results) -> Dict[Tuple[str, str], SimulationResult]:
+    """Fold chunk results into one result per pairing, in task order."""
+    results: Dict[Tuple[str, str], SimulationResult] = {}
+    for (boss_type, weapon_type, *_), chunk_result in zip(tasks, chunk_results):
+        results.setdefault((boss_type, weapon_type), SimulationResult()).merge(chunk_result)
+    return results
+
+
+def main() -> None:
+    """Run a parallel simulation from the command line."""
+    fights = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    master_seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    start = time.perf_counter()
+    results = simulate_parallel(fights, master_seed, workers)
+    elapsed = time.perf_counter() - start
+    print_report(results)
+    total = fights * len(results)
+    print(f"\n{total} fights in {elapsed:.2f}s ({total / elapsed:,.0f} fights/second)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Deterministic record and replay of game sessions.
+
+A session is fully described by the seed of its random generator and the
+actions the player chose, so a bug report only needs those. Replaying runs
+the same Game code with no rendering or input and checks that it ends in
+the recorded state.
+"""
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from game import Game
+from console_renderer import ConsoleRenderer
+
+RECORDING_VERSION = 1
+
+
+class ReplayError(Exception):
+    """Raised when a replay does not follow its recording."""
+
+
+class SessionRecording:
+    """Seed, player actions and end state of one game session."""
+
+    def __init__(self, seed: int, actions: Optional[List[str]] = None,
+                 end_state: Optional[Dict[str, Any]] = None):
+        """
+        Create a recording.
+
+        Args:
+            seed (int): Seed of the session's random generator
+            actions (List[str], optional): Player actions in order
+            end_state (Dict[str, Any], optional): State at the end of the session
+        """
+        self.seed = seed
+        self.actions = actions if actions is not None else []
+        self.end_state = end_state or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the recording to plain data for saving."""
+        return {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "actions": "".join(self.actions),
+            "end_state": self.end_state
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SessionRecording':
+        """
+        Rebuild a recording from plain data.
+
+        Args:
+            data (Dict[str, Any]): Data produced by to_dict
+
+        Returns:
+            SessionRecording: The recording
+
+        Raises:
+            ReplayError: If the data is from an unknown format version
+        """
+        if data.get("version") != RECORDING_VERSION:
+            raise ReplayError(f"Unsupported recording version: {data.get('version')}")
+        return cls(data["seed"], list(data["actions"]), data["end_state"])
+
+    def save(self, path: str) -> None:
+        """
+        Save the recording as JSON.
+
+        Args:
+            path (str): File to write
+        """
+        with open(path, "w", encoding="utf-8") as recording_file:
+            json.dump(self.to_dict(), recording_file, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'SessionRecording':
+        """
+        Load a recording saved with save().
+
+        Args:
+            path (str): File to read
+
+        Returns:
+            SessionRecording: The recording
+        """
+        with open(path, encoding="utf-8") as recording_file:
+            return cls.from_dict(json.load(recording_file))
+
+
+def capture_end_state(game: Game) -> Dict[str, Any]:
+    """
+    Describe the state a game finished in.
+
+    Args:
+        game (Game): A game whose run() has returned
+
+    Returns:
+        Dict[str, Any]: Values compared when a session is replayed
+    """
+    return {
+        "turns": game.turn,
+        "boss": game.boss.name,
+        "player_weapon": game.player.weapon.name,
+        "boss_weapon": game.boss.weapon.name,
+        "player_health": game.player.health,
+        "boss_health": game.boss.health,
+        "ability_cooldown": game.boss.ability_cooldown,
+        "ability_ready": game.boss.ability_ready
+    }
+
+
+class RecordingGame(Game):
+    """
+    Game that records its seed and every player action.
+
+    Only the standard rules can be recorded: a replay rebuilds the game from
+    the seed alone, and a boss controller with a time budget does not even
+    decide the same way twice.
+    """
+
+    # Game options a recording has no room for
+    UNRECORDED_OPTIONS = ("boss_controller", "effects")
+
+    def __init__(self, seed: Optional[int] = None, **kwargs: Any):
+        """
+        Initialise a recording game.
+
+        Args:
+            seed (int, optional): Seed to use; a random one is chosen if omitted
+            **kwargs: Passed on to Game, except the UNRECORDED_OPTIONS
+
+        Raises:
+            ValueError: If given a boss controller or an effect engine
+        """
+        unrecorded = [name for name in self.UNRECORDED_OPTIONS if kwargs.get(name) is not None]
+        if unrecorded:
+            raise ValueError(f"Sessions using {', '.join(unrecorded)} cannot be recorded")
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        super().__init__(seed, **kwargs)
+        self.recording = SessionRecording(seed)
+
+    def get_player_action(self) -> str:
+        action = super().get_player_action()
+        self.recording.actions.append(action)
+        return action
+
+    def run(self) -> None:
+        super().run()
+        self.recording.end_state = capture_end_state(self)
+
+
+class ReplayGame(Game):
+    """Game that takes its seed and actions from a recording."""
+
+    def __init__(self, recording: SessionRecording):
+        """
+        Initialise a replay; nothing is rendered unless a subscriber is added.
+
+        Args:
+            recording (SessionRecording): The session to replay
+        """
+        super().__init__(recording.seed)
+        self.recording = recording
+        self._next_action = iter(recording.actions)
+
+    def get_player_action(self) -> str:
+        action = next(self._next_action, None)
+        if action is None:
+            raise ReplayError(f"Recording ran out of actions on turn {self.turn}")
+        return action
+
+    def has_unused_actions(self) -> bool:
+        """Return True if the recording has actions the replay never used."""
+        return next(self._next_action, None) is not None
+
+
+def replay(recording: SessionRecording) -> Dict[str, Any]:
+    """
+    Re-run a recorded session and check it ends in the recorded state.
+
+    Args:
+        recording (SessionRecording): The session to replay
+
+    Returns:
+        Dict[str, Any]: The end state reached by the replay
+
+    Raises:
+        ReplayError: If the replay diverges from the recording
+    """
+    game = ReplayGame(recording)
+    game.run()
+    end_state = capture_end_state(game)
+    if game.has_unused_actions():
+        raise ReplayError(f"Session ended on turn {game.turn} with actions left over")
+    differences = {
+        key: (expected, end_state.get(key))
+        for key, expected in recording.end_state.items()
+        if end_state.get(key) != expected
+    }
+    if differences:
+        details = ", ".join(f"{key}: recorded {expected!r}, replayed {actual!r}"
+                            for key, (expected, actual) in differences.items())
+        raise ReplayError(f"Replay diverged from recording ({details})")
+    return end_state
+
+
+def main() -> None:
+    """Record a session interactively, or replay a saved one."""
+    if len(sys.argv) != 3 or sys.argv[1] not in ("record", "replay"):
+        print("Usage: python replay.py record|replay <session.json>")
+        sys.exit(2)
+    mode, path = sys.argv[1], sys.argv[2]
+    if mode == "record":
+        game = RecordingGame()
+        game.events.subscribe(ConsoleRenderer())
+        game.run()
+        game.recording.save(path)
+        print(f"\nSession saved to {path}")
+    else:
+        recording = SessionRecording.load(path)
+        start = time.perf_counter()
+        end_state = replay(recording)
+        elapsed = time.perf_counter() - start
+        print(f"Replayed {end_state['turns']} turns in {elapsed * 1000:.2f} ms; end state matches")
+
+
+if __name__ == "__main__":
+    main()
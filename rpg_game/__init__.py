@@ -0,0 +1,35 @@
+"""
+RPG game package.
+
+Submodules are imported on first use, so ``import rpg_game`` is cheap and
+``rpg_game.Game`` only loads what the game needs:
+
+    import rpg_game
+    rpg_game.Game().run()
+"""
+from importlib import import_module
+
+# Public name -> submodule that defines it
+_LAZY_NAMES = {
+    "Game": "rpg_game.game",
+    "Character": "rpg_game.character",
+    "Boss": "rpg_game.character",
+    "Weapon": "rpg_game.weapon",
+    "GameLogger": "rpg_game.utils.logger",
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name: str) -> object:
+    """Import the submodule that defines a public name the first time it is used."""
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -3,15 +3,11 @@ Character module for the RPG game.
 
 This module contains the Character base class and the Boss subclass.
 """
-import sys
-import os
 from typing import Optional, Union
 
-# Add the project directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from rpg_game.weapon import Weapon
 from rpg_game.utils.logger import GameLogger
+from rpg_game.utils.events import EventBus, AbilityEvent, default_bus
 
 
 class Character:
@@ -27,7 +23,8 @@ class Character:
         health: int, 
         damage: int, 
         weapon_name: Optional[str] = None, 
-        weapon_damage: int = 0
+        weapon_damage: int = 0,
+        events: Optional[EventBus] = None
     ) -> None:
         """
         Initialize a new Character.
@@ -38,6 +35,7 @@ class Character:
             damage: The character's base damage
             weapon_name: The name of the character's weapon (optional)
             weapon_damage: The damage bonus of the character's weapon
+            events: Bus that combat events are published on (optional)
         """
         self.name = name
         # The underscore prefix (_) indicates that this attribute is intended to be "private"
@@ -47,6 +45,7 @@ class Character:
         self.damage = damage
         # Create the weapon inside the Character constructor (strong composition)
         self.weapon = Weapon(weapon_name, weapon_damage) if weapon_name else None
+        self.events = events if events is not None else default_bus
 
     # Getter for health - provides controlled access to the private attribute
     def get_health(self) -> int:
@@ -93,12 +92,21 @@ class Character:
         return total_damage
 
     # Method to display character information
-    def display(self) -> None:
-        """Display the character's information."""
+    def describe(self) -> str:
+        """
+        Describe the character's information.
+        
+        Returns:
+            The character's name, health, damage and weapon, one per line
+        """
         weapon_name = self.weapon.name if self.weapon else 'No Weapon'
         weapon_damage = self.weapon.damage_bonus if self.weapon else 0
         # Use getter instead of direct attribute access
-        print(f"Name: {self.name}\nHealth: {self.get_health()}\nDamage: {self.damage}\nWeapon: {weapon_name} (+{weapon_damage} Damage)")
+        return f"Name: {self.name}\nHealth: {self.get_health()}\nDamage: {self.damage}\nWeapon: {weapon_name} (+{weapon_damage} Damage)"
+
+    def display(self) -> None:
+        """Display the character's information."""
+        print(self.describe())
 
 
 class Boss(Character):
@@ -108,7 +116,7 @@ class Boss(Character):
     This class demonstrates inheritance and method overriding.
     """
     
-    def __init__(self, name: str, health: int, damage: int) -> None:
+    def __init__(self, name: str, health: int, damage: int, events: Optional[EventBus] = None) -> None:
         """
         Initialize a new Boss.
         
@@ -116,9 +124,10 @@ class Boss(Character):
             name: The boss's name
             health: The boss's initial health
             damage: The boss's base damage
+            events: Bus that combat events are published on (optional)
         """
         # Pass weapon details to parent constructor instead of creating a Weapon object here
-        super().__init__(name, health, damage, "Boss Weapon", 5)
+        super().__init__(name, health, damage, "Boss Weapon", 5, events)
 
     # Boss's special attack with additional damage
     def attack(self, enemy: Character, logger: Optional[GameLogger] = None) -> int:
@@ -139,7 +148,8 @@ class Boss(Character):
         # Use getter and setter instead of direct attribute access
         current_health = enemy.get_health()
         enemy.set_health(current_health - additional_damage)  # Apply additional damage
-        print(f"{self.name} uses a special attack! (+{additional_damage} Damage)")
+        if self.events.active:
+            self.events.emit(AbilityEvent(self, enemy, "special attack", additional_damage, False, True))
         # Use the logger if provided for the special attack
         if logger:
             logger.log_combat(self, enemy, additional_damage)
@@ -3,16 +3,21 @@ Game module for the RPG game.
 
 This module contains the Game class that manages the game flow.
 """
-import sys
-import os
-from typing import List, Tuple, Optional
-
-# Add the project directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, List, Tuple, Optional
 
 from rpg_game.character import Character, Boss
 from rpg_game.utils.logger import GameLogger
-from rpg_game.utils.console import clear_screen, press_enter, print_border
+from rpg_game.utils.console import print_border, AbilityPrinter
+from rpg_game.utils.events import EventBus, AbilityEvent
+from rpg_game.utils.input_providers import InputProvider, InteractiveInput
+from rpg_game.utils.instrumentation import (
+    Instrumentation, default_timings,
+    PHASE_DISPLAY, PHASE_INPUT, PHASE_PLAYER_ATTACK, PHASE_BOSS_ATTACK
+)
+# Messages are read as constants.<NAME> when shown, so their text is only
+# loaded once the game needs it
+from rpg_game import constants
 from rpg_game.constants import (
     # Player constants
     PLAYER_INITIAL_HEALTH, PLAYER_INITIAL_DAMAGE,
@@ -24,16 +29,12 @@ from rpg_game.constants import (
     WEAPON_PAPER_NAME, WEAPON_PAPER_DAMAGE,
     WEAPON_SCISSORS_NAME, WEAPON_SCISSORS_DAMAGE,
     # UI constants
-    SEPARATOR_LENGTH, BORDER_LENGTH,
-    # Game messages
-    WELCOME_MESSAGE, INTRO_MESSAGE,
-    # Level messages
-    GOBLIN_KING_INTRO, DARK_SORCERER_INTRO,
-    # Combat messages
-    VICTORY_MESSAGE, DEFEAT_MESSAGE,
-    GAME_WIN_MESSAGE, GAME_OVER_MESSAGE
+    SEPARATOR_LENGTH, BORDER_LENGTH
 )
 
+if TYPE_CHECKING:
+    from rpg_game.utils.screen import ScreenRenderer
+
 
 class Game:
     """
@@ -42,20 +43,38 @@ class Game:
     This class demonstrates orchestration of other classes and game logic.
     """
     
-    def __init__(self) -> None:
-        """Initialize a new Game instance."""
+    def __init__(self, player_input: Optional[InputProvider] = None,
+                 timings: Optional[Instrumentation] = None) -> None:
+        """
+        Initialize a new Game instance.
+        
+        Args:
+            player_input: Where the player's choices come from; the keyboard by default
+            timings: Latency histograms for the phases of combat; the shared
+                default_timings by default
+        """
+        # Reads the keyboard unless a scripted or bot provider is given
+        self.player_input = (player_input if player_input is not None
+                             else InteractiveInput("Invalid input, please try again."))
         self.player: Optional[Character] = None
         self.bosses: List[Boss] = []
+        self.timings = timings if timings is not None else default_timings
         # Create and manage a GameLogger instance (association)
-        self.logger = GameLogger()
+        self.logger = GameLogger(timings=self.timings)
+        # Ability uses are shown by a printer subscribed to the bus
+        self.events = EventBus()
+        self.events.subscribe(AbilityPrinter(), AbilityEvent)
+        # Status screens are redrawn line by line rather than by clearing the
+        # terminal; the renderer is only loaded when someone is watching
+        self._screen: Optional['ScreenRenderer'] = None
 
     # Show the introductory message and set up the game
     def show_intro(self) -> None:
         """Display the game introduction and set up the player character."""
-        clear_screen()
-        print(WELCOME_MESSAGE)
-        player_name = input("Enter your character's name: ").capitalize()
-        print(INTRO_MESSAGE.format(player_name=player_name))
+        self.clear_screen()
+        print(constants.WELCOME_MESSAGE)
+        player_name = self.player_input.text("Enter your character's name: ").capitalize()
+        print(constants.INTRO_MESSAGE.format(player_name=player_name))
         self.setup_game(player_name)
 
     # Set up the game by creating the player character and bosses
@@ -69,12 +88,12 @@ class Game:
         # Get weapon details instead of a Weapon object
         weapon_name, weapon_damage = self.choose_weapon()
         self.player = Character(name, PLAYER_INITIAL_HEALTH, PLAYER_INITIAL_DAMAGE, 
-                               weapon_name, weapon_damage)
+                               weapon_name, weapon_damage, self.events)
         self.player.display()
-        press_enter()
+        self.press_enter()
         self.bosses = [
-            Boss(GOBLIN_KING_NAME, GOBLIN_KING_HEALTH, GOBLIN_KING_DAMAGE), 
-            Boss(DARK_SORCERER_NAME, DARK_SORCERER_HEALTH, DARK_SORCERER_DAMAGE)
+            Boss(GOBLIN_KING_NAME, GOBLIN_KING_HEALTH, GOBLIN_KING_DAMAGE, self.events), 
+            Boss(DARK_SORCERER_NAME, DARK_SORCERER_HEALTH, DARK_SORCERER_DAMAGE, self.events)
         ]
 
     # Allow the player to choose a weapon
@@ -109,11 +128,48 @@ class Game:
         Returns:
             The index of the chosen option
         """
-        while True:
-            user_input = input(prompt).capitalize()
-            if user_input in options:
-                return options.index(user_input)
-            print("Invalid input, please try again.")
+        return options.index(self.player_input.choose(prompt, options, self))
+
+    # Create the screen renderer the first time it is needed
+    @property
+    def screen(self) -> 'ScreenRenderer':
+        """The renderer for full-screen status displays."""
+        if self._screen is None:
+            from rpg_game.utils.screen import ScreenRenderer
+            self._screen = ScreenRenderer(timings=self.timings)
+        return self._screen
+
+    # Clear the screen only when someone is watching
+    def clear_screen(self) -> None:
+        """Clear the console screen if the player is at the keyboard."""
+        if self.player_input.interactive:
+            self.screen.clear()
+
+    # Show a full screen of text
+    def show_screen(self, text: str) -> None:
+        """
+        Show a screen, redrawing only what changed if the player is at the keyboard.
+        
+        Args:
+            text: The screen's text
+        """
+        if self.player_input.interactive:
+            self.screen.render(text)
+        else:
+            print(text)
+
+    # Wait for the player before carrying on
+    def press_enter(self) -> None:
+        """
+        Wait for the player to press Enter; automated players carry straight on.
+        
+        Every wait comes after messages printed below the last frame (combat
+        results, log lines, the prompt itself), which may have scrolled the
+        terminal, so the next frame is drawn in full.
+        """
+        self.player_input.pause()
+        if self._screen is not None:
+            self._screen.invalidate()
 
     # Handle the combat between player and enemy
     def combat(self, player: Character, enemy: Boss) -> bool:
@@ -127,22 +183,41 @@ class Game:
         Returns:
             True if the player won, False otherwise
         """
+        timings = self.timings
         while player.get_health() > 0 and enemy.get_health() > 0:
+            # Each phase is timed only when instrumentation is switched on;
+            # the flag is read once so a turn is timed completely or not at all
+            timed = timings.enabled
+            if timed:
+                start = perf_counter_ns()
             self.display_combat_status(player, enemy)
+            if timed:
+                timings.record(PHASE_DISPLAY, start)
+                start = perf_counter_ns()
             # Pass the logger to the attack methods
             damage_dealt = player.attack(enemy, self.logger)
             print(f"You dealt {damage_dealt} damage to {enemy.name}.")
+            if timed:
+                timings.record(PHASE_PLAYER_ATTACK, start)
             if enemy.get_health() <= 0:
                 self.print_victory_message(enemy)
                 return True
 
+            if timed:
+                start = perf_counter_ns()
             # Pass the logger to the attack methods
             damage_received = enemy.attack(player, self.logger)
             print(f"{enemy.name} dealt {damage_received} damage to you.")
+            if timed:
+                timings.record(PHASE_BOSS_ATTACK, start)
             if player.get_health() <= 0:
                 self.print_defeat_message(enemy)
                 return False
-            press_enter()
+            if timed:
+                start = perf_counter_ns()
+            self.press_enter()
+            if timed:
+                timings.record(PHASE_INPUT, start)
 
     # Display the current status of the combat
     def display_combat_status(self, player: Character, enemy: Boss) -> None:
@@ -153,13 +228,12 @@ class Game:
             player: The player character
             enemy: The enemy character
         """
-        clear_screen()
         level = "LEVEL 1" if enemy.name == "Goblin King" else "LEVEL 2"
-        print(f"\n=============> {level}: {enemy.name} <=============")
-        player.display()
-        print("-" * SEPARATOR_LENGTH)
-        enemy.display()
-        print("-" * SEPARATOR_LENGTH)
+        separator = "-" * SEPARATOR_LENGTH
+        self.show_screen("\n".join((
+            f"\n=============> {level}: {enemy.name} <=============",
+            player.describe(), separator, enemy.describe(), separator
+        )))
 
     # Handle battles with bosses
     def handle_boss_battles(self) -> None:
@@ -179,13 +253,12 @@ class Game:
         Args:
             boss: The boss to introduce
         """
-        clear_screen()
         intro_messages = {
-            GOBLIN_KING_NAME: GOBLIN_KING_INTRO.format(player_name=self.player.name),
-            DARK_SORCERER_NAME: DARK_SORCERER_INTRO.format(player_name=self.player.name)
+            GOBLIN_KING_NAME: constants.GOBLIN_KING_INTRO.format(player_name=self.player.name),
+            DARK_SORCERER_NAME: constants.DARK_SORCERER_INTRO.format(player_name=self.player.name)
         }
-        print(intro_messages.get(boss.name, "A new boss appears!"))
-        press_enter()
+        self.show_screen(intro_messages.get(boss.name, "A new boss appears!"))
+        self.press_enter()
 
     # Print victory message after defeating an enemy
     def print_victory_message(self, enemy: Boss) -> None:
@@ -196,8 +269,8 @@ class Game:
             enemy: The defeated enemy
         """
         print_border()
-        print(VICTORY_MESSAGE.format(enemy_name=enemy.name))
-        press_enter()
+        print(constants.VICTORY_MESSAGE.format(enemy_name=enemy.name))
+        self.press_enter()
 
     # Print defeat message after being defeated by an enemy
     def print_defeat_message(self, enemy: Boss) -> None:
@@ -208,8 +281,8 @@ class Game:
             enemy: The enemy that defeated the player
         """
         print_border()
-        print(DEFEAT_MESSAGE.format(enemy_name=enemy.name))
-        press_enter()
+        print(constants.DEFEAT_MESSAGE.format(enemy_name=enemy.name))
+        self.press_enter()
 
     # End the game and show final message
     def end_game(self, player_won: bool) -> None:
@@ -221,9 +294,9 @@ class Game:
         """
         print_border()
         if player_won:
-            print(GAME_WIN_MESSAGE.format(player_name=self.player.name))
+            print(constants.GAME_WIN_MESSAGE.format(player_name=self.player.name))
         else:
-            print(GAME_OVER_MESSAGE.format(player_name=self.player.name))
+            print(constants.GAME_OVER_MESSAGE.format(player_name=self.player.name))
         print_border()
 
     # Run the game
@@ -2,15 +2,21 @@
 Main entry point for the RPG game.
 """
 import sys
-import os
 
-# Add the project directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    # Run as a script (python rpg_game/main.py), so make the package importable;
+    # python -m rpg_game.main needs no path changes
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from rpg_game.game import Game
+from rpg_game.utils.instrumentation import default_timings
 
 
 def main() -> None:
     """Run the RPG game."""
+    # Phase timings are reported on exit when RPG_TIMINGS is set
+    default_timings.dump_when_enabled()
     game = Game()
     game.run()
 
@@ -0,0 +1,54 @@
+"""
+Story and combat messages for the RPG game.
+
+Loaded on first use through rpg_game.constants, so starting the game does
+not pay for text it may never show.
+"""
+
+# Game messages
+WELCOME_MESSAGE = (
+    "🌟 Welcome, brave adventurer, to the RPG Adventure! 🌟\n"
+    "Legends tell of heroes who rise against impossible odds—will you become one?"
+)
+INTRO_MESSAGE = (
+    "In a realm shrouded in darkness and peril, you, {player_name}, have been chosen by fate.\n"
+    "Two formidable bosses threaten the land: the ferocious Goblin King and the enigmatic Dark Sorcerer.\n"
+    "Your journey will test your courage, wit, and strength. Gather your resolve—the fate of this world rests in your hands."
+)
+
+# Level messages
+GOBLIN_KING_INTRO = (
+    "🗡️ Level 1: The Goblin King's Lair 🗡️\n"
+    "You step into a dank, torch-lit cavern echoing with guttural laughter.\n"
+    "The Goblin King, infamous for his brute strength and savage cunning, awaits.\n"
+    "Steel yourself, {player_name}, for this battle will be fierce and unforgiving!"
+)
+DARK_SORCERER_INTRO = (
+    "🔮 Level 2: The Dark Sorcerer's Tower 🔮\n"
+    "With the Goblin King fallen, you ascend a spiraling staircase into a chamber pulsing with arcane energy.\n"
+    "The Dark Sorcerer, master of forbidden spells and illusions, greets you with a sinister grin.\n"
+    "Only true heroes survive his magic. Face your fears, {player_name}, and let your legend grow!"
+)
+
+# Combat messages
+VICTORY_MESSAGE = (
+    "🏆 Triumph! 🏆\n"
+    "With a final, decisive blow, you have vanquished {enemy_name}.\n"
+    "The air crackles with your newfound power as the path ahead becomes clear."
+)
+DEFEAT_MESSAGE = (
+    "💀 Defeat... 💀\n"
+    "You fought valiantly, but {enemy_name} has bested you in battle.\n"
+    "Every setback is a lesson—rise again, stronger than before!"
+)
+GAME_WIN_MESSAGE = (
+    "🎉 Heroic Victory! 🎉\n"
+    "All evil has been banished thanks to your bravery, {player_name}.\n"
+    "The people rejoice, and songs will be sung of your deeds for generations to come!\n"
+    "You are a true legend of the realm!"
+)
+GAME_OVER_MESSAGE = (
+    "☠️ Game Over ☠️\n"
+    "Though darkness prevails this day, the spirit of a true hero never fades.\n"
+    "Rest and return, {player_name}—the world still needs you. Your next adventure awaits!"
+)
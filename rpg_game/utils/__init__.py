@@ -0,0 +1,3 @@
+"""
+Utilities shared by the RPG games: events, logging, console output and input.
+"""
@@ -2,24 +2,49 @@
 Console utility functions for the RPG game.
 """
 import sys
-import os
 from typing import Any
 
-# Add the project directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
+from rpg_game.utils.events import AbilityEvent
+from rpg_game.utils.input_providers import InteractiveInput
 
 
 def clear_screen() -> None:
-    """Clear the console screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Clear the console screen with an escape sequence rather than a shell command."""
+    from rpg_game.utils.screen import CLEAR_SCREEN, enable_ansi
+    enable_ansi()
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
 
 
 def press_enter() -> None:
-    """Prompt the user to press Enter to continue."""
-    input("\nPress Enter to continue...\n")
+    """
+    Prompt the user to press Enter to continue.
+    
+    Games wait through their input provider instead, so automated players
+    never block here.
+    """
+    InteractiveInput().pause()
 
 
 def print_border() -> None:
     """Print a border for visual separation."""
     print("-" * 80)
+
+
+class AbilityPrinter:
+    """
+    Event bus subscriber that prints special ability uses to the console.
+
+    The rpg_game counterpart of console_renderer.ConsoleRenderer, which
+    shows every event of the top-level game.
+    """
+
+    def __call__(self, event: Any) -> None:
+        """
+        Print an event.
+        
+        Args:
+            event: An event from the bus
+        """
+        if isinstance(event, AbilityEvent):
+            print(f"{event.user.name} uses a {event.ability}! (+{event.damage} Damage)")
@@ -0,0 +1,134 @@
+"""
+Event bus for the RPG game.
+
+Game and character code publish typed combat events here instead of
+printing; subscribers such as a console renderer, a logger or a metrics
+collector decide what to do with them. Publishers check ``bus.active``
+before building an event, so with no subscribers an event costs nothing.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Type
+
+# A subscriber is any callable that takes one event
+Subscriber = Callable[[Any], None]
+
+
+class GameStartEvent(NamedTuple):
+    """A new game has started."""
+    player: Any
+    boss: Any
+
+
+class TurnEvent(NamedTuple):
+    """A new turn is about to start."""
+    turn: int
+    player: Any
+    boss: Any
+
+
+class AttackEvent(NamedTuple):
+    """A character attacked another character."""
+    attacker: Any
+    defender: Any
+    damage: float
+    dodged: bool
+
+
+class DodgeEvent(NamedTuple):
+    """A character dodged incoming damage."""
+    character: Any
+    damage: float
+
+
+class CritEvent(NamedTuple):
+    """A character landed a critical hit."""
+    attacker: Any
+
+
+class AbilityEvent(NamedTuple):
+    """A character used (or failed to use) a special ability."""
+    user: Any
+    target: Any
+    ability: Optional[str]
+    damage: float
+    dodged: bool
+    success: bool
+
+
+class EffectEvent(NamedTuple):
+    """A lasting status effect dealt damage to a character."""
+    character: Any
+    effect: str
+    damage: float
+
+
+class FleeEvent(NamedTuple):
+    """A character ran away from the fight."""
+    character: Any
+
+
+class DefeatEvent(NamedTuple):
+    """A character was defeated."""
+    character: Any
+    victor: Any
+
+
+class EventBus:
+    """
+    Delivers events to subscribers, either for all events or chosen types.
+    """
+
+    def __init__(self) -> None:
+        """Initialise a bus with no subscribers."""
+        self._all: List[Subscriber] = []
+        self._by_type: Dict[Type, List[Subscriber]] = {}
+        # True when at least one subscriber is attached; publishers check
+        # this before building an event
+        self.active = False
+
+    def subscribe(self, subscriber: Subscriber, *event_types: Type) -> None:
+        """
+        Attach a subscriber.
+
+        Args:
+            subscriber: Callable that receives each event
+            *event_types: Event classes to receive; all events if none given
+        """
+        if event_types:
+            for event_type in event_types:
+                self._by_type.setdefault(event_type, []).append(subscriber)
+        else:
+            self._all.append(subscriber)
+        self.active = True
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """
+        Detach a subscriber from every event type it was attached to.
+
+        Args:
+            subscriber: The subscriber to remove
+        """
+        self._all = [existing for existing in self._all if existing is not subscriber]
+        for event_type, subscribers in list(self._by_type.items()):
+            remaining = [existing for existing in subscribers if existing is not subscriber]
+            if remaining:
+                self._by_type[event_type] = remaining
+            else:
+                del self._by_type[event_type]
+        self.active = bool(self._all or self._by_type)
+
+    def emit(self, event: Any) -> None:
+        """
+        Deliver an event to its subscribers.
+
+        Args:
+            event: The event to deliver
+        """
+        for subscriber in self._all:
+            subscriber(event)
+        for subscriber in self._by_type.get(type(event), ()):
+            subscriber(event)
+
+
+# Bus used by characters that have not been given one; normally nobody
+# subscribes to it, so events from such characters are skipped
+default_bus = EventBus()
@@ -0,0 +1,163 @@
+"""
+Player input providers for the RPG games.
+
+Game loops ask an input provider for the player's choices instead of
+calling input() themselves, so the same loop can be played at the
+keyboard, driven by a fixed script in a test, or played by a bot policy
+at full speed in-process.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable, Sequence
+
+PRESS_ENTER_PROMPT = "\nPress Enter to continue...\n"
+
+# A policy picks one of the options, given the game that is asking
+Policy = Callable[[Any, Sequence[str]], str]
+
+
+class InputExhausted(Exception):
+    """Raised when a scripted provider runs out of input."""
+
+
+class InputProvider(ABC):
+    """
+    Source of player input for a game loop.
+
+    Subclasses implement choose() and text(). ``interactive`` tells the
+    game whether a person is watching, so it can skip screen clearing and
+    pauses that only make sense at a terminal.
+    """
+
+    interactive = False
+
+    @abstractmethod
+    def choose(self, prompt: str, options: Sequence[str], game: Any = None) -> str:
+        """
+        Get one of a fixed set of choices.
+
+        Args:
+            prompt: Text shown to the player
+            options: The valid choices
+            game: The game asking, for providers that look at its state
+
+        Returns:
+            One of options, exactly as given
+        """
+
+    @abstractmethod
+    def text(self, prompt: str) -> str:
+        """
+        Get free text, such as the character's name.
+
+        Args:
+            prompt: Text shown to the player
+
+        Returns:
+            The text entered
+        """
+
+    def pause(self, prompt: str = PRESS_ENTER_PROMPT) -> None:
+        """
+        Wait for the player to be ready to carry on; returns at once by default.
+
+        Args:
+            prompt: Text shown to the player
+        """
+
+
+class InteractiveInput(InputProvider):
+    """Reads the player's input from the keyboard."""
+
+    interactive = True
+
+    def __init__(self, invalid_message: str = "Invalid choice. Please try again.") -> None:
+        """
+        Initialise a keyboard provider.
+
+        Args:
+            invalid_message: Printed when the player types something that is not an option
+        """
+        self.invalid_message = invalid_message
+
+    def choose(self, prompt: str, options: Sequence[str], game: Any = None) -> str:
+        # Options match regardless of case and surrounding spaces
+        by_key = {option.lower(): option for option in options}
+        while True:
+            choice = by_key.get(input(prompt).strip().lower())
+            if choice is not None:
+                return choice
+            print(self.invalid_message)
+
+    def text(self, prompt: str) -> str:
+        return input(prompt)
+
+    def pause(self, prompt: str = PRESS_ENTER_PROMPT) -> None:
+        input(prompt)
+
+
+class ScriptedInput(InputProvider):
+    """Plays back a fixed sequence of answers, e.g. for tests and demos."""
+
+    def __init__(self, answers: Iterable[str]) -> None:
+        """
+        Initialise a scripted provider.
+
+        Args:
+            answers: Answers for choose() and text(), in the order they will be asked
+        """
+        self._answers = iter(answers)
+        self.used = 0
+
+    def _next(self, prompt: str) -> str:
+        answer = next(self._answers, None)
+        if answer is None:
+            raise InputExhausted(f"No scripted answer left for prompt {prompt.strip()!r}")
+        self.used += 1
+        return answer
+
+    def choose(self, prompt: str, options: Sequence[str], game: Any = None) -> str:
+        answer = self._next(prompt)
+        for option in options:
+            if option.lower() == answer.strip().lower():
+                return option
+        raise ValueError(f"Scripted answer {answer!r} is not one of {list(options)}")
+
+    def text(self, prompt: str) -> str:
+        return self._next(prompt)
+
+
+class PolicyInput(InputProvider):
+    """Lets a policy function make every choice, for bots and simulations."""
+
+    def __init__(self, policy: Policy, name: str = "Bot") -> None:
+        """
+        Initialise a policy provider.
+
+        Args:
+            policy: Called as policy(game, options) and returns one of options
+            name: Answer given to text() prompts, such as the character's name
+        """
+        self.policy = policy
+        self.name = name
+
+    def choose(self, prompt: str, options: Sequence[str], game: Any = None) -> str:
+        return self.policy(game, options)
+
+    def text(self, prompt: str) -> str:
+        return self.name
+
+
+def always(option: str) -> Policy:
+    """
+    Build a policy that always picks the same option when it is offered.
+
+    Args:
+        option: The option to pick
+
+    Returns:
+        A policy; when the option is not offered it picks the first one
+    """
+    def policy(game: Any, options: Sequence[str]) -> str:
+        return option if option in options else options[0]
+    return policy
+
@@ -1,14 +1,177 @@
 """
 Logger module for the RPG game.
 """
-import sys
 import os
-import datetime
-from typing import Any
+import threading
+import time
+from collections import deque
+from time import perf_counter_ns
+from typing import Any, Deque, List, Optional, Tuple
 
-# Add the project directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from rpg_game.utils.instrumentation import Instrumentation, PHASE_LOGGING
 
+# A log record: (timestamp, kind, attacker, defender, damage)
+LogRecord = Tuple[str, str, str, str, Any]
+
+
+class FileLogBackend:
+    """
+    Writes log records to a file from a background thread.
+    
+    Records go into an in-memory ring buffer, so logging never waits for
+    the disk. A writer thread drains the buffer in batches, formats each
+    record as one tab-separated line and rotates the file when it grows
+    past a size limit. If the writer falls behind and the buffer fills up,
+    the oldest records are dropped and counted rather than blocking.
+    
+    A lock held only for a buffer append or a batch pop keeps the queued
+    and dropped counts exact with any number of logging threads. Sizes are
+    counted in encoded bytes, and a batch that crosses the size limit is
+    split across the rotation.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+        buffer_size: int = 1 << 20,
+        batch_size: int = 8192,
+        flush_interval: float = 0.2
+    ) -> None:
+        """
+        Open the log file and start the writer thread.
+        
+        Args:
+            path: Log file path
+            max_bytes: Rotate the file once it would grow past this many bytes
+            backup_count: Number of rotated files to keep (path.1, path.2, ...)
+            buffer_size: Maximum number of records held in memory
+            batch_size: Maximum number of records written in one go
+            flush_interval: Seconds the writer sleeps when there is nothing to do
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queued = 0
+        self.dropped = 0
+        self.written = 0
+        self._buffer: Deque[LogRecord] = deque(maxlen=buffer_size)
+        # Guards the buffer together with queued and dropped
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._drained = threading.Event()
+        self._closed = False
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+        self._thread = threading.Thread(target=self._run, name="FileLogBackend", daemon=True)
+        self._thread.start()
+    
+    def write(self, record: LogRecord) -> None:
+        """
+        Queue a record for writing; never blocks.
+        
+        Args:
+            record: The record to write
+        """
+        buffer = self._buffer
+        with self._lock:
+            if len(buffer) == buffer.maxlen:
+                self.dropped += 1
+            buffer.append(record)
+            self.queued += 1
+            pending = len(buffer)
+        if pending >= self.batch_size:
+            self._wake.set()
+    
+    def flush(self) -> None:
+        """Wait until every queued record has been written to disk."""
+        with self._lock:
+            target = self.queued
+        while self._settled() < target and self._thread.is_alive():
+            self._drained.clear()
+            self._wake.set()
+            self._drained.wait(self.flush_interval)
+    
+    def _settled(self) -> int:
+        """Number of queued records that have been written or dropped."""
+        with self._lock:
+            return self.written + self.dropped
+    
+    def close(self) -> None:
+        """Write out remaining records, stop the writer and close the file."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._file.close()
+    
+    def __enter__(self) -> 'FileLogBackend':
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _run(self) -> None:
+        """Writer thread: drain the buffer in batches until closed."""
+        buffer = self._buffer
+        lock = self._lock
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            count = 0
+            while True:
+                with lock:
+                    batch = [buffer.popleft() for _ in range(min(len(buffer), self.batch_size))]
+                if not batch:
+                    break
+                self._write_batch(["\t".join(map(str, record)) + "\n" for record in batch])
+                count += len(batch)
+            self._file.flush()
+            with lock:
+                self.written += count
+            self._drained.set()
+            if self._closed:
+                return
+    
+    def _write_batch(self, lines: List[str]) -> None:
+        """Append lines to the file, rotating before any line that would make it too big."""
+        data = "".join(lines).encode("utf-8")
+        if self._size + len(data) <= self.max_bytes:
+            self._file.write(data)
+            self._size += len(data)
+            return
+        # The batch crosses the limit: measure line by line to find where
+        size = self._size
+        chunk: List[bytes] = []
+        for line in lines:
+            encoded = line.encode("utf-8")
+            if size and size + len(encoded) > self.max_bytes:
+                self._file.write(b"".join(chunk))
+                self._rotate()
+                chunk, size = [], 0
+            chunk.append(encoded)
+            size += len(encoded)
+        self._file.write(b"".join(chunk))
+        self._size = size
+    
+    def _rotate(self) -> None:
+        """Shift path -> path.1 -> path.2 ... and start a new file."""
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "wb")
+        self._size = 0
 
 
 class GameLogger:
@@ -18,14 +181,37 @@ class GameLogger:
     This class demonstrates association relationship with Game (solid line in UML).
     """
     
-    def __init__(self, log_to_console: bool = True) -> None:
+    def __init__(self, log_to_console: bool = True, backend: Optional[FileLogBackend] = None,
+                 timings: Optional[Instrumentation] = None) -> None:
         """
         Initialize a new GameLogger.
         
         Args:
             log_to_console: Whether to print logs to the console
+            backend: Optional file backend that records are also written to
+            timings: Instrumentation that times each log call as the logging phase
         """
         self.log_to_console = log_to_console
+        self.backend = backend
+        self.timings = timings
+        self._timestamp_second = -1
+        self._timestamp = ""
+    
+    def timestamp(self) -> str:
+        """
+        Get the current time for a log record.
+        
+        Formatting a time is slow compared with logging itself, so the text
+        is only rebuilt when the second changes.
+        
+        Returns:
+            The current time as HH:MM:SS
+        """
+        second = int(time.time())
+        if second != self._timestamp_second:
+            self._timestamp_second = second
+            self._timestamp = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._timestamp
         
     def log_combat(self, attacker: Any, defender: Any, damage: int) -> None:
         """
@@ -36,9 +222,14 @@ class GameLogger:
             defender: The defending character
             damage: The amount of damage dealt
         """
+        timed = self.timings is not None and self.timings.enabled
+        if timed:
+            start = perf_counter_ns()
         # Get current time for the log
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] COMBAT LOG: {attacker.name} attacked {defender.name} for {damage} damage"
+        timestamp = self.timestamp()
+        if self.backend:
+            self.backend.write((timestamp, "COMBAT", attacker.name, defender.name, damage))
         if self.log_to_console:
-            print(log_message)
-        # Future enhancement: could log to file, database, etc.
+            print(f"[{timestamp}] COMBAT LOG: {attacker.name} attacked {defender.name} for {damage} damage")
+        if timed:
+            self.timings.record(PHASE_LOGGING, start)
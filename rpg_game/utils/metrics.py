@@ -0,0 +1,487 @@
+"""
+Gameplay metrics with a Prometheus text-format exporter.
+
+A MetricsCollector subscribes to a game's event bus and counts what the
+characters and the game loop publish: damage dealt from Character.attack
+and Boss.use_special_ability, dodges from Character.take_damage, critical
+hits, special ability uses, fights won, lost and fled per boss, and the
+number of turns per fight.
+
+Counters are kept in one shard per thread. Only the owning thread writes
+to a shard, so an increment takes no lock; the shards are added up when
+the registry is scraped. Worker processes send Registry.snapshot() back
+to the parent, which folds it in with Registry.merge().
+
+The exporter writes the Prometheus text format to a file (for the node
+exporter's textfile collector) or serves it on a local HTTP port at
+/metrics. Set RPG_METRICS_FILE or RPG_METRICS_PORT to have main.py and
+game_server.py collect into default_registry and export it.
+"""
+import atexit
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .events import (
+    GameStartEvent, TurnEvent, AttackEvent, DodgeEvent, CritEvent, AbilityEvent,
+    EffectEvent, FleeEvent, DefeatEvent
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_HOST = "127.0.0.1"
+
+# Upper bounds of the turns-per-fight histogram buckets
+TURN_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+# Label values -> running total; for histograms, bucket counts followed by
+# the sum and the count of the observations
+Series = Dict[Tuple[str, ...], Any]
+
+
+class Metric:
+    """A named counter or histogram with a fixed set of labels."""
+
+    def __init__(self, registry: 'Registry', name: str, kind: str, help_text: str,
+                 labels: Sequence[str] = (), buckets: Sequence[float] = ()):
+        """
+        Initialise a metric; use Registry.counter or Registry.histogram.
+
+        Args:
+            registry: Registry holding the values
+            name: Prometheus metric name
+            kind: COUNTER or HISTOGRAM
+            help_text: Description for the HELP line
+            labels: Label names; values are passed in the same order
+            buckets: Histogram bucket upper bounds, in increasing order
+        """
+        self.registry = registry
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            *label_values: One value per label name
+            amount: How much to add
+        """
+        series = self.registry._shard()[self.name]
+        series[label_values] = series.get(label_values, 0) + amount
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """
+        Record one histogram observation.
+
+        Args:
+            value: The observed value
+            *label_values: One value per label name
+        """
+        series = self.registry._shard()[self.name]
+        counts = series.get(label_values)
+        if counts is None:
+            counts = series[label_values] = [0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[len(self.buckets)] += 1  # The +Inf bucket
+        counts[-2] += value
+        counts[-1] += 1
+
+
+class Registry:
+    """
+    Metrics whose values are kept per thread and added up on scrape.
+    """
+
+    def __init__(self) -> None:
+        """Initialise a registry with no metrics."""
+        self.metrics: Dict[str, Metric] = {}
+        self._shards: List[Dict[str, Series]] = []
+        self._local = threading.local()
+        # Only taken when a thread first records something, and on scrape
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Metric:
+        """
+        Define a counter.
+
+        Args:
+            name: Prometheus metric name, ending in _total by convention
+            help_text: Description for the HELP line
+            labels: Label names
+
+        Returns:
+            The new metric
+        """
+        return self._add(Metric(self, name, COUNTER, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float],
+                  labels: Sequence[str] = ()) -> Metric:
+        """
+        Define a histogram.
+
+        Args:
+            name: Prometheus metric name
+            help_text: Description for the HELP line
+            buckets: Bucket upper bounds, in increasing order; +Inf is implied
+            labels: Label names
+
+        Returns:
+            The new metric
+        """
+        return self._add(Metric(self, name, HISTOGRAM, help_text, labels, buckets))
+
+    def _add(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric already defined: {metric.name}")
+        with self._lock:
+            self.metrics[metric.name] = metric
+            for shard in self._shards:
+                shard[metric.name] = {}
+        return metric
+
+    def _shard(self) -> Dict[str, Series]:
+        """The calling thread's values, created on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            with self._lock:
+                shard = {name: {} for name in self.metrics}
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def snapshot(self) -> Dict[str, Series]:
+        """
+        Add up every thread's values.
+
+        Returns:
+            Metric name -> label values -> total (a list for histograms);
+            plain data that can be pickled back from a worker process
+        """
+        with self._lock:
+            shards = list(self._shards)
+        totals: Dict[str, Series] = {name: {} for name in self.metrics}
+        for shard in shards:
+            for name, series in shard.items():
+                # Copied first, as the owning thread may add series meanwhile
+                self._add_series(totals[name], dict(series))
+        return totals
+
+    def merge(self, snapshot: Dict[str, Series]) -> None:
+        """
+        Fold in values from another registry, e.g. a worker process's snapshot().
+
+        Args:
+            snapshot: Values from Registry.snapshot() of a registry with the same metrics
+        """
+        shard = self._shard()
+        for name, series in snapshot.items():
+            self._add_series(shard[name], series)
+
+    @staticmethod
+    def _add_series(totals: Series, series: Series) -> None:
+        for label_values, value in series.items():
+            if isinstance(value, list):
+                existing = totals.get(label_values)
+                totals[label_values] = (list(value) if existing is None
+                                        else [mine + theirs for mine, theirs in zip(existing, value)])
+            else:
+                totals[label_values] = totals.get(label_values, 0) + value
+
+    def reset(self) -> None:
+        """Forget every value recorded so far, keeping the metrics."""
+        with self._lock:
+            for shard in self._shards:
+                for series in shard.values():
+                    series.clear()
+
+    def render(self) -> str:
+        """
+        Scrape the registry.
+
+        Returns:
+            Every metric in the Prometheus text exposition format
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for label_values, value in sorted(snapshot[name].items()):
+                if metric.kind == COUNTER:
+                    lines.append(f"{name}{_labels(metric.labels, label_values)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), value):
+                    cumulative += count
+                    bucket_labels = _labels(metric.labels + ("le",),
+                                            label_values + (_number(bound),))
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                labels = _labels(metric.labels, label_values)
+                lines.append(f"{name}_sum{labels} {_number(value[-2])}")
+                lines.append(f"{name}_count{labels} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Write the scrape to a file, replacing it in one step so readers
+        never see half a file.
+
+        Args:
+            path: File to write, e.g. in the node exporter's textfile directory
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as metrics_file:
+            metrics_file.write(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port: int, host: str = DEFAULT_HOST):
+        """
+        Serve the scrape over HTTP from a background thread.
+
+        Args:
+            port: Port to listen on; 0 picks a free port
+            host: Address to listen on; local only by default
+
+        Returns:
+            The http.server.ThreadingHTTPServer; call shutdown() to stop it.
+            Its server_address holds the port actually used.
+        """
+        # Imported here to keep it off the game's startup path
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # Scrapes would otherwise be printed over the game
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-exporter",
+                         daemon=True).start()
+        return server
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    """Format a label set, e.g. {boss="Goblin King"}."""
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape_value(str(value))}"' for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class GameMetrics:
+    """The gameplay metrics, defined on one registry."""
+
+    def __init__(self, registry: Optional[Registry] = None):
+        """
+        Define the metrics.
+
+        Args:
+            registry: Registry to define them on; a new one if not given
+        """
+        self.registry = registry if registry is not None else Registry()
+        define = self.registry
+        self.damage = define.counter(
+            "rpg_damage_dealt_total",
+            "Damage dealt by landed attacks, abilities and lasting effects",
+            ("boss", "attacker", "source"))
+        self.attacks = define.counter(
+            "rpg_attacks_total", "Attacks made, landed or dodged", ("boss", "attacker"))
+        self.dodges = define.counter(
+            "rpg_dodges_total", "Attacks and abilities dodged", ("boss", "defender"))
+        self.crits = define.counter(
+            "rpg_critical_hits_total", "Critical hits landed by the player", ("boss",))
+        self.abilities = define.counter(
+            "rpg_special_abilities_total", "Special abilities used", ("boss", "ability"))
+        self.fights = define.counter(
+            "rpg_fights_total", "Fights finished, by outcome for the player", ("boss", "outcome"))
+        self.turns = define.histogram(
+            "rpg_fight_turns", "Turns in which the player acted, per fight", TURN_BUCKETS,
+            ("boss",))
+
+
+class MetricsCollector:
+    """
+    Event bus subscriber that feeds the gameplay metrics.
+
+    One collector can be subscribed to the buses of many games at once,
+    including games running in other threads.
+    """
+
+    def __init__(self, metrics: Optional[GameMetrics] = None):
+        """
+        Initialise a collector.
+
+        Args:
+            metrics: Metrics to feed; those on default_registry if not given
+        """
+        self.metrics = metrics if metrics is not None else default_metrics
+        # id(character) -> (boss, last turn) for every fight in progress,
+        # so events naming either character can be labelled with the boss
+        self._fights: Dict[int, List[Any]] = {}
+
+    def __call__(self, event: Any) -> None:
+        handler = self._handlers.get(type(event))
+        if handler is not None:
+            handler(self, event)
+
+    def _boss_label(self, character: Any) -> str:
+        fight = self._fights.get(id(character))
+        return fight[0].name if fight is not None else ""
+
+    def _role(self, character: Any) -> str:
+        fight = self._fights.get(id(character))
+        return "boss" if fight is not None and fight[0] is character else "player"
+
+    def _on_start(self, event: Any) -> None:
+        fight = [event.boss, 0]
+        self._fights[id(event.player)] = fight
+        self._fights[id(event.boss)] = fight
+
+    def _on_turn(self, event: Any) -> None:
+        fight = self._fights.get(id(event.player))
+        if fight is None or fight[0] is not event.boss:
+            # A game resumed from a save announces no start
+            self._on_start(event)
+            fight = self._fights[id(event.player)]
+        fight[1] = event.turn
+
+    def _on_attack(self, event: Any) -> None:
+        metrics = self.metrics
+        boss, attacker = self._boss_label(event.attacker), self._role(event.attacker)
+        metrics.attacks.inc(boss, attacker)
+        if not event.dodged:
+            metrics.damage.inc(boss, attacker, "attack", amount=event.damage)
+
+    def _on_dodge(self, event: Any) -> None:
+        self.metrics.dodges.inc(self._boss_label(event.character), self._role(event.character))
+
+    def _on_crit(self, event: Any) -> None:
+        self.metrics.crits.inc(self._boss_label(event.attacker))
+
+    def _on_ability(self, event: Any) -> None:
+        if not event.success:
+            return
+        metrics = self.metrics
+        boss, user = self._boss_label(event.user), self._role(event.user)
+        metrics.abilities.inc(boss, event.ability or user)
+        if event.damage and not event.dodged:
+            metrics.damage.inc(boss, user, "ability", amount=event.damage)
+
+    def _on_effect(self, event: Any) -> None:
+        if event.damage:
+            # Lasting effects are inflicted by the other side
+            inflicted_by = "player" if self._role(event.character) == "boss" else "boss"
+            self.metrics.damage.inc(self._boss_label(event.character), inflicted_by, "effect",
+                                    amount=event.damage)
+
+    def _on_flee(self, event: Any) -> None:
+        self._finish(event.character, "fled", 0)
+
+    def _on_defeat(self, event: Any) -> None:
+        lost = self._role(event.character) == "player"
+        player = event.character if lost else event.victor
+        # The defeat is found at the start of the turn after the last exchange
+        self._finish(player, "lost" if lost else "won", 1)
+
+    def end_fight(self, player: Any) -> None:
+        """
+        Stop tracking a fight that will never finish, without counting it.
+
+        Fights are otherwise only let go of when someone flees or is
+        defeated, so a game abandoned midway, such as a server session whose
+        player disconnects, must be ended here or its characters are kept
+        for good.
+
+        Args:
+            player: The player of the abandoned fight
+        """
+        fight = self._fights.pop(id(player), None)
+        if fight is not None:
+            self._fights.pop(id(fight[0]), None)
+
+    def _finish(self, player: Any, outcome: str, unplayed: int) -> None:
+        fight = self._fights.pop(id(player), None)
+        if fight is None:
+            return
+        boss, turn = fight
+        self._fights.pop(id(boss), None)
+        self.metrics.fights.inc(boss.name, outcome)
+        self.metrics.turns.observe(max(0, turn - unplayed), boss.name)
+
+    _handlers = {
+        GameStartEvent: _on_start,
+        TurnEvent: _on_turn,
+        AttackEvent: _on_attack,
+        DodgeEvent: _on_dodge,
+        CritEvent: _on_crit,
+        AbilityEvent: _on_ability,
+        EffectEvent: _on_effect,
+        FleeEvent: _on_flee,
+        DefeatEvent: _on_defeat,
+    }
+
+
+def export_when_enabled(registry: Optional[Registry] = None) -> bool:
+    """
+    Start exporting a registry if the environment asks for it.
+
+    RPG_METRICS_FILE names a file written when the interpreter exits;
+    RPG_METRICS_PORT a local port served over HTTP while the process runs.
+
+    Args:
+        registry: Registry to export; default_registry if not given
+
+    Returns:
+        True if either exporter was started, so metrics should be collected
+    """
+    registry = registry if registry is not None else default_registry
+    path = os.environ.get("RPG_METRICS_FILE")
+    port = os.environ.get("RPG_METRICS_PORT")
+    if path:
+        atexit.register(registry.write, path)
+    if port:
+        registry.serve(int(port))
+    return bool(path or port)
+
+
+# Registry and metrics shared by collectors that have not been given their own
+default_registry = Registry()
+default_metrics = GameMetrics(default_registry)
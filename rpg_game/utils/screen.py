@@ -0,0 +1,153 @@
+"""
+Differential ANSI screen renderer for the RPG game.
+
+Instead of clearing the terminal with a shell command before every screen,
+the renderer remembers the last frame it drew and rewrites only the lines
+that changed, using ANSI cursor movement. Each frame goes out in a single
+write, so redraws are quick and do not flicker, even over SSH.
+"""
+import shutil
+import sys
+import time
+from typing import List, Optional, TextIO, Tuple
+
+from rpg_game.utils.instrumentation import Instrumentation, PHASE_RENDER
+
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_LINE_END = "\x1b[K"
+CLEAR_SCREEN_END = "\x1b[J"
+
+
+def enable_ansi() -> None:
+    """Let Windows consoles understand ANSI escape sequences; nothing to do elsewhere."""
+    if sys.platform == "win32":
+        # Only needed on Windows, so other platforms skip the import cost
+        from colorama import just_fix_windows_console
+        just_fix_windows_console()
+
+
+def move_to(row: int) -> str:
+    """
+    Build the escape sequence that moves the cursor to the start of a row.
+
+    Args:
+        row: Screen row, counting from 0
+
+    Returns:
+        The ANSI escape sequence
+    """
+    return f"\x1b[{row + 1};1H"
+
+
+class ScreenRenderer:
+    """
+    Draws full-screen frames, sending only the lines that changed.
+
+    A frame is the list of lines at the top of the screen. Anything printed
+    below it, such as combat messages, is erased by the next frame; if that
+    output may have scrolled the terminal, call invalidate() so the next
+    frame is drawn in full rather than diffed onto the wrong rows. A frame
+    that does not fit the terminal (long lines wrap, tall frames scroll) is
+    redrawn in full, since its lines no longer match screen rows. When the
+    stream is not a terminal, frames are written out in full instead.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None,
+                 timings: Optional[Instrumentation] = None) -> None:
+        """
+        Initialise a renderer.
+
+        Args:
+            stream: Where to draw; standard output by default
+            timings: Instrumentation that times each frame as the render
+                phase, so frame times appear in the RPG_TIMINGS report
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.timings = timings
+        isatty = getattr(self.stream, "isatty", None)
+        self.ansi = bool(isatty and isatty())
+        if self.ansi:
+            enable_ansi()
+        self._frame: Optional[List[str]] = None
+        self.frames = 0
+        self.lines_written = 0
+        self.last_render_time = 0.0
+        self.max_render_time = 0.0
+        self.total_render_time = 0.0
+
+    def render(self, text: str) -> float:
+        """
+        Draw a frame.
+
+        Args:
+            text: The whole frame; may span several lines
+
+        Returns:
+            Seconds taken to build and write the frame
+        """
+        start = time.perf_counter_ns()
+        lines = text.split("\n")
+        if not self.ansi:
+            output = text + "\n"
+            changed = len(lines)
+        else:
+            columns, rows = shutil.get_terminal_size()
+            if self._frame is not None and self._fits(lines, columns, rows):
+                output, changed = self._diff(lines)
+            else:
+                output = CLEAR_SCREEN + text + "\n" + CLEAR_SCREEN_END
+                changed = len(lines)
+            # Rows only line up with the next frame if this one fits the terminal
+            self._frame = lines if self._fits(lines, columns, rows) else None
+        self.stream.write(output)
+        self.stream.flush()
+
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        if self.timings is not None and self.timings.enabled:
+            self.timings.record(PHASE_RENDER, start)
+        self.frames += 1
+        self.lines_written += changed
+        self.last_render_time = elapsed
+        self.max_render_time = max(self.max_render_time, elapsed)
+        self.total_render_time += elapsed
+        return elapsed
+
+    @staticmethod
+    def _fits(lines: List[str], columns: int, rows: int) -> bool:
+        """Check that every line takes exactly one row, with a row to spare below."""
+        return len(lines) < rows and all(len(line) < columns for line in lines)
+
+    def _diff(self, lines: List[str]) -> Tuple[str, int]:
+        """Build the escape sequences that turn the last frame into this one."""
+        previous = self._frame
+        parts = []
+        changed = 0
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                parts.append(move_to(row) + line + CLEAR_LINE_END)
+                changed += 1
+        # Leave the cursor below the frame and erase whatever was printed there
+        parts.append(move_to(len(lines)) + CLEAR_SCREEN_END)
+        return "".join(parts), changed
+
+    def clear(self) -> None:
+        """Clear the screen; the next frame is drawn in full."""
+        if self.ansi:
+            self.stream.write(CLEAR_SCREEN)
+            self.stream.flush()
+        self._frame = None
+
+    def invalidate(self) -> None:
+        """Forget the last frame, e.g. after other output scrolled the screen."""
+        self._frame = None
+
+    def report(self) -> str:
+        """
+        Summarise frame render times.
+
+        Returns:
+            One line with the number of frames and their mean and slowest times
+        """
+        mean = self.total_render_time / self.frames if self.frames else 0.0
+        return (f"{self.frames} frames, {self.lines_written} lines written, "
+                f"mean {mean * 1e6:.0f} µs, max {self.max_render_time * 1e6:.0f} µs per frame")
@@ -1,14 +1,8 @@
 """
 Weapon module for the RPG game.
 """
-import sys
-import os
 from typing import Optional
 
-# Add the project directory to the Python path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-
 
 class Weapon:
     """
@@ -0,0 +1,311 @@
+"""
+Fast binary save and load of game state.
+
+A save file is a header followed by a stream of snapshots. A full snapshot
+(checkpoint) holds everything needed to rebuild the game; a delta snapshot
+holds only what changes from turn to turn: health, boss cooldown, the turn
+counter and the random generator's position. The generator's 624-word
+state only changes once every few hundred draws, so most deltas are a few
+dozen bytes. Loading takes the last checkpoint and applies the deltas
+after it.
+
+File layout:
+    header     b"RPGS", format version (B)
+    snapshot   kind (B), payload length (I), payload
+"""
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import BinaryIO, Optional, Tuple, Type
+
+from game import Game
+from character import Character, Boss, BOSS_TYPES
+from weapon import WEAPON_TYPES, get_weapon
+from constants import PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE
+from rpg_game.utils.events import EventBus, TurnEvent
+
+MAGIC = b"RPGS"
+SAVE_VERSION = 1
+
+KIND_FULL = 0
+KIND_DELTA = 1
+
+# Full snapshots are written at least this often, so loading never has to
+# apply a long run of deltas
+DEFAULT_CHECKPOINT_INTERVAL = 50
+
+_HEADER = struct.Struct("<4sB")
+_RECORD = struct.Struct("<BI")
+# Player: base damage, strength, agility, intelligence, weapon
+_PLAYER = struct.Struct("<d3hB")
+# Boss: type, base damage, strength, agility, intelligence, weapon
+_BOSS = struct.Struct("<Bd3hB")
+# Turn counter, player health, boss health, ability cooldown, ability ready
+_DYNAMIC = struct.Struct("<Iddh?")
+# Random generator: position, has gauss value, gauss value, words included
+_RNG = struct.Struct("<I?d?")
+
+_MT_WORDS = 624
+_NO_WEAPON = 255
+_WEAPON_KEYS = list(WEAPON_TYPES)
+_WEAPON_INDEX = {weapon_class: index for index, weapon_class in enumerate(WEAPON_TYPES.values())}
+_BOSS_KEYS = list(BOSS_TYPES)
+_BOSS_INDEX = {boss_class: index for index, boss_class in enumerate(BOSS_TYPES.values())}
+
+
+class SaveError(ValueError):
+    """Raised when a save file cannot be read."""
+
+
+def _weapon_index(character: Character) -> int:
+    """Index of a character's weapon type, or _NO_WEAPON."""
+    return _WEAPON_INDEX[type(character.weapon)] if character.weapon else _NO_WEAPON
+
+
+def _static_state(game: Game) -> bytes:
+    """Pack the parts of the state that deltas do not cover."""
+    player, boss = game.player, game.boss
+    return _PLAYER.pack(
+        player.base_damage, player.get_attribute("strength"),
+        player.get_attribute("agility"), player.get_attribute("intelligence"),
+        _weapon_index(player)
+    ) + _BOSS.pack(
+        _BOSS_INDEX[type(boss)], boss.base_damage, boss.get_attribute("strength"),
+        boss.get_attribute("agility"), boss.get_attribute("intelligence"),
+        _weapon_index(boss)
+    )
+
+
+class Autosaver:
+    """
+    Appends a snapshot of a game to a save file at the start of every turn.
+
+    Subscribes to the game's TurnEvent, so it needs no changes to the game
+    loop. Every snapshot is a delta except for periodic checkpoints and
+    whenever something a delta cannot express (attributes, weapons) changed.
+
+    The file is unbuffered and each snapshot goes out in one write, so a
+    crash loses at most the snapshot being written. Status effects in force
+    (Game.effects) are not saved: a loaded game resumes without them, and
+    any attribute bonus one gave is saved as part of the attribute.
+    """
+
+    def __init__(self, game: Game, path: str,
+                 checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        """
+        Create a new save file for a game.
+
+        Args:
+            game (Game): The game to save
+            path (str): Save file path; an existing file is replaced
+            checkpoint_interval (int): Maximum number of deltas between checkpoints
+        """
+        self.game = game
+        self.checkpoint_interval = checkpoint_interval
+        self._file: BinaryIO = open(path, "wb", buffering=0)
+        self._file.write(_HEADER.pack(MAGIC, SAVE_VERSION))
+        self._base_static: Optional[bytes] = None
+        self._base_words: Optional[Tuple[int, ...]] = None
+        self._deltas = 0
+        game.events.subscribe(self, TurnEvent)
+
+    def __call__(self, event: TurnEvent) -> None:
+        """Save the state at the start of a turn."""
+        self.save(event.turn - 1)
+
+    def save(self, turn: Optional[int] = None) -> None:
+        """
+        Append a snapshot of the game.
+
+        Args:
+            turn (int, optional): Turn counter to store; defaults to game.turn
+        """
+        game = self.game
+        if turn is None:
+            turn = game.turn
+        _, internal_state, gauss = game.rng.getstate()
+        words = internal_state[:_MT_WORDS]
+        position = internal_state[_MT_WORDS]
+        has_gauss = gauss is not None
+
+        dynamic = _DYNAMIC.pack(turn, game.player.health, game.boss.health,
+                                game.boss.ability_cooldown, game.boss.ability_ready)
+        static = _static_state(game)
+        if static != self._base_static or self._deltas >= self.checkpoint_interval:
+            payload = (dynamic + static + _RNG.pack(position, has_gauss, gauss or 0.0, True)
+                       + array("I", words).tobytes())
+            self._write(KIND_FULL, payload)
+            self._base_static, self._base_words, self._deltas = static, words, 0
+            return
+
+        # A delta only carries the generator's words when they have changed
+        words_changed = words != self._base_words
+        payload = dynamic + _RNG.pack(position, has_gauss, gauss or 0.0, words_changed)
+        if words_changed:
+            payload += array("I", words).tobytes()
+            self._base_words = words
+        self._write(KIND_DELTA, payload)
+        self._deltas += 1
+
+    def _write(self, kind: int, payload: bytes) -> None:
+        self._file.write(_RECORD.pack(kind, len(payload)) + payload)
+
+    def flush(self) -> None:
+        """Push written snapshots to the operating system; each save() already has."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Stop saving and close the file."""
+        self.game.events.unsubscribe(self)
+        self._file.close()
+
+
+def load_game(path: str, events: Optional[EventBus] = None,
+              game_class: Type[Game] = Game) -> Game:
+    """
+    Rebuild a game from the latest snapshot in a save file.
+
+    The characters are created straight from BOSS_TYPES and WEAPON_TYPES
+    rather than through Game.setup_game. Call play() on the result to carry on.
+
+    Args:
+        path (str): Save file written by Autosaver
+        events (EventBus, optional): Event bus for the restored game
+        game_class (Type[Game]): Game subclass to restore into, e.g. one
+            that takes its actions from a script
+
+    Returns:
+        Game: The restored game
+
+    Raises:
+        SaveError: If the file is not a valid save file
+    """
+    with open(path, "rb") as save_file:
+        data = save_file.read()
+    if len(data) < _HEADER.size:
+        raise SaveError("Save file is too short")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveError("Not a save file")
+    if version != SAVE_VERSION:
+        raise SaveError(f"Unsupported save file version: {version}")
+
+    # Find the last complete checkpoint and the deltas that follow it
+    offset = _HEADER.size
+    checkpoint: Optional[memoryview] = None
+    deltas = []
+    view = memoryview(data)
+    while offset + _RECORD.size <= len(data):
+        kind, length = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        if start + length > len(data):
+            break  # Truncated final snapshot, e.g. from a crash mid-write
+        if kind == KIND_FULL:
+            checkpoint, deltas = view[start:start + length], []
+        elif kind == KIND_DELTA:
+            deltas.append(view[start:start + length])
+        else:
+            raise SaveError(f"Unknown snapshot kind: {kind}")
+        offset = start + length
+    if checkpoint is None:
+        raise SaveError("Save file has no checkpoint")
+
+    game = _restore_checkpoint(checkpoint, game_class(events=events))
+    for delta in deltas:
+        _apply_delta(game, delta)
+    return game
+
+
+def _restore_checkpoint(payload: memoryview, game: Game) -> Game:
+    """Fill a new game in from a full snapshot."""
+    turn, player_health, boss_health, cooldown, ready = _DYNAMIC.unpack_from(payload)
+    offset = _DYNAMIC.size
+    player_stats = _PLAYER.unpack_from(payload, offset)
+    offset += _PLAYER.size
+    boss_type, *boss_stats = _BOSS.unpack_from(payload, offset)
+    offset += _BOSS.size
+
+    player = Character("Hero", PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE, game.rng, game.events)
+    _restore_character(player, player_health, *player_stats)
+    boss: Boss = BOSS_TYPES[_BOSS_KEYS[boss_type]]()
+    boss.rng, boss.events = game.rng, game.events
+    boss.controller = game.boss_controller
+    if game.effects is not None:
+        boss.effects = game.effects
+    _restore_character(boss, boss_health, *boss_stats)
+    boss.set_ability_state(cooldown, ready)
+
+    game.player, game.boss, game.turn = player, boss, turn
+    _restore_rng(game, payload, offset)
+    return game
+
+
+def _restore_character(character: Character, health: float, base_damage: float,
+                       strength: int, agility: int, intelligence: int, weapon: int) -> None:
+    """Copy saved values onto a freshly created character."""
+    character.health = health
+    character.base_damage = base_damage
+    character.set_attribute("strength", strength)
+    character.set_attribute("agility", agility)
+    character.set_attribute("intelligence", intelligence)
+    character.weapon = None if weapon == _NO_WEAPON else get_weapon(_WEAPON_KEYS[weapon])
+
+
+def _apply_delta(game: Game, payload: memoryview) -> None:
+    """Update a restored game with a delta snapshot."""
+    turn, player_health, boss_health, cooldown, ready = _DYNAMIC.unpack_from(payload)
+    game.turn = turn
+    game.player.health = player_health
+    game.boss.health = boss_health
+    game.boss.set_ability_state(cooldown, ready)
+    _restore_rng(game, payload, _DYNAMIC.size)
+
+
+def _restore_rng(game: Game, payload: memoryview, offset: int) -> None:
+    """Set the game's random generator from a snapshot's RNG section."""
+    position, has_gauss, gauss, words_included = _RNG.unpack_from(payload, offset)
+    offset += _RNG.size
+    if words_included:
+        words_array = array("I")
+        words_array.frombytes(payload[offset:offset + _MT_WORDS * words_array.itemsize])
+        words = tuple(words_array)
+    else:
+        words = game.rng.getstate()[1][:_MT_WORDS]
+    game.rng.setstate((3, words + (position,), gauss if has_gauss else None))
+
+
+def main() -> None:
+    """Autosave a headless game every turn and report the cost."""
+    path = sys.argv[1] if len(sys.argv) > 1 else "autosave.bin"
+    game = Game(seed=1)
+    game.setup_game()
+    # Plenty of health so the fight lasts long enough to time
+    game.player.health = game.boss.health = 1e9
+    saver = Autosaver(game, path)
+    saves = 10_000
+    save_time = 0.0
+    clock = time.perf_counter
+    for turn in range(1, saves + 1):
+        start = clock()
+        saver.save(turn - 1)
+        save_time += clock() - start
+        game.turn = turn
+        game.player.attack(game.boss)
+        game.boss.attack(game.player)
+        game.boss.update()
+    saver.save()
+    saver.close()
+
+    start = clock()
+    restored = load_game(path)
+    load_time = clock() - start
+    assert restored.player.health == game.player.health and restored.boss.health == game.boss.health
+    print(f"{saves:,} autosaves in {os.path.getsize(path):,} bytes, "
+          f"{save_time / saves * 1e6:.1f} microseconds per autosave")
+    print(f"Loaded {restored.boss.name} fight at turn {restored.turn} in {load_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
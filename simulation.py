@@ -0,0 +1,327 @@
+"""
+Headless battle simulator.
+
+Runs Hero-vs-boss fights with the same rules as Game.run, but without any
+terminal input or output, so balance can be checked over millions of fights.
+"""
+import random
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from character import Character, Boss, BOSS_TYPES
+from weapon import WEAPON_TYPES, get_weapon
+from constants import (
+    PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE,
+    CRITICAL_HIT_CHANCE
+)
+
+# Width of the buckets used for the HP-remaining distributions
+HP_BUCKET_SIZE = 10
+
+# Safety net for pathological specs (e.g. zero damage) that would never end
+MAX_TURNS = 1000
+
+
+class FightSpec(NamedTuple):
+    """Pre-computed numbers describing one Hero-vs-boss matchup."""
+    player_health: float
+    player_damage: float
+    player_dodge: float
+    boss_health: float
+    boss_damage: float
+    boss_dodge: float
+    ability_damage: float
+    ability_cooldown: int
+    crit_chance: float
+
+
+class _DamageProbe:
+    """Stand-in target that records the damage it is asked to take."""
+    def __init__(self):
+        self.hits: List[float] = []
+
+    def take_damage(self, damage: float) -> None:
+        self.hits.append(damage)
+
+
+def create_player(weapon_type: str) -> Character:
+    """
+    Create the Hero exactly as Game.setup_game does.
+
+    Args:
+        weapon_type (str): Key into WEAPON_TYPES
+
+    Returns:
+        Character: The armed player character
+    """
+    player = Character("Hero", PLAYER_BASE_HEALTH, PLAYER_BASE_DAMAGE)
+    player.weapon = get_weapon(weapon_type)
+    return player
+
+
+def create_boss(boss_type: str, weapon_type: str) -> Boss:
+    """
+    Create a boss exactly as Game.setup_game does.
+
+    Args:
+        boss_type (str): Key into BOSS_TYPES
+        weapon_type (str): Key into WEAPON_TYPES for the boss's weapon
+
+    Returns:
+        Boss: The armed boss
+    """
+    boss = BOSS_TYPES[boss_type]()
+    boss.weapon = get_weapon(weapon_type)
+    return boss
+
+
+def spec_from_characters(player: Character, boss: Boss) -> FightSpec:
+    """
+    Measure a matchup by letting the real classes attack a probe target.
+
+    Using the classes' own attack methods keeps the simulator in step with
+    any change to the damage formulas.
+
+    Args:
+        player (Character): The player character
+        boss (Boss): The boss character
+
+    Returns:
+        FightSpec: Numbers the fast fight loop works from
+    """
+    probe = _DamageProbe()
+    player.attack(probe)
+    player_damage = probe.hits[0]
+
+    # Boss.attack mutates the cooldown state, so restore it afterwards
+    ready, cooldown = boss.ability_ready, boss.ability_cooldown
+    probe = _DamageProbe()
+    boss.set_ability_state(0, True)
+    boss.attack(probe)
+    ability_cooldown = boss.ability_cooldown
+    boss.set_ability_state(cooldown, ready)
+    boss_damage = probe.hits[-1]
+    ability_damage = probe.hits[0] if len(probe.hits) > 1 else 0.0
+
+    return FightSpec(
+        player_health=player.health,
+        player_damage=player_damage,
+        player_dodge=player.stats.dodge_chance,
+        boss_health=boss.health,
+        boss_damage=boss_damage,
+        boss_dodge=boss.stats.dodge_chance,
+        ability_damage=ability_damage,
+        ability_cooldown=ability_cooldown,
+        crit_chance=CRITICAL_HIT_CHANCE
+    )
+
+
+def fight_spec(boss_type: str, weapon_type: str, boss_weapon_type: str) -> FightSpec:
+    """
+    Build the FightSpec for a boss, player weapon and boss weapon.
+
+    Args:
+        boss_type (str): Key into BOSS_TYPES
+        weapon_type (str): Player weapon key into WEAPON_TYPES
+        boss_weapon_type (str): Boss weapon key into WEAPON_TYPES
+
+    Returns:
+        FightSpec: The matchup numbers
+    """
+    return spec_from_characters(create_player(weapon_type),
+                                create_boss(boss_type, boss_weapon_type))
+
+
+class SimulationResult:
+    """Aggregated outcome statistics for a batch of fights."""
+    def __init__(self):
+        """Initialise empty counters."""
+        self.fights = 0
+        self.wins = 0
+        self.total_turns = 0
+        self.turns = Counter()
+        # Player HP left after a win and boss HP left after a loss,
+        # bucketed by HP_BUCKET_SIZE
+        self.player_hp_remaining = Counter()
+        self.boss_hp_remaining = Counter()
+
+    @property
+    def losses(self) -> int:
+        """Number of fights the player lost."""
+        return self.fights - self.wins
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of fights the player won."""
+        return self.wins / self.fights if self.fights else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        """Average number of player turns per fight."""
+        return self.total_turns / self.fights if self.fights else 0.0
+
+    def merge(self, other: 'SimulationResult') -> None:
+        """
+        Add another result's counts into this one.
+
+        Args:
+            other (SimulationResult): Result to fold in
+        """
+        self.fights += other.fights
+        self.wins += other.wins
+        self.total_turns += other.total_turns
+        self.turns.update(other.turns)
+        self.player_hp_remaining.update(other.player_hp_remaining)
+        self.boss_hp_remaining.update(other.boss_hp_remaining)
+
+
+def run_fights(specs: List[FightSpec], fights: int, rng: random.Random,
+               result: Optional[SimulationResult] = None) -> SimulationResult:
+    """
+    Run a batch of fights, choosing one of specs at random for each fight.
+
+    The loop follows Game.run turn for turn and draws random numbers in the
+    same order, so for a single spec and a seeded generator it reproduces
+    the interactive game exactly. As in Game.run, the boss still swings in
+    the turn it falls and the player loses if both end up at 0 HP.
+
+    Args:
+        specs (List[FightSpec]): Candidate matchups (one per boss weapon)
+        fights (int): Number of fights to run
+        rng (random.Random): Source of randomness
+        result (SimulationResult, optional): Result to accumulate into
+
+    Returns:
+        SimulationResult: The accumulated statistics
+    """
+    if result is None:
+        result = SimulationResult()
+    rand = rng.random
+    choice = rng.choice
+    single = specs[0] if len(specs) == 1 else None
+    turns_seen = result.turns
+    player_hp_seen = result.player_hp_remaining
+    boss_hp_seen = result.boss_hp_remaining
+    wins = 0
+    total_turns = 0
+
+    for _ in range(fights):
+        (player_hp, player_damage, player_dodge, boss_hp, boss_damage,
+         boss_dodge, ability_damage, ability_cooldown, crit_chance) = single or choice(specs)
+        ability_ready = ability_damage > 0
+        cooldown = 0
+        turns = 0
+
+        while player_hp > 0 and boss_hp > 0 and turns < MAX_TURNS:
+            turns += 1
+
+            # Player's turn: a critical hit is simply a second attack
+            if rand() < crit_chance:
+                if rand() > boss_dodge:
+                    boss_hp -= player_damage
+                if rand() > boss_dodge:
+                    boss_hp -= player_damage
+            elif rand() > boss_dodge:
+                boss_hp -= player_damage
+
+            # Boss's turn: special ability first, then the normal attack
+            if ability_ready:
+                if rand() > player_dodge:
+                    player_hp -= ability_damage
+                ability_ready = False
+                cooldown = ability_cooldown
+            if rand() > player_dodge:
+                player_hp -= boss_damage
+
+            # Boss.update
+            if not ability_ready and ability_damage > 0:
+                cooldown -= 1
+                if cooldown <= 0:
+                    ability_ready = True
+
+        total_turns += turns
+        turns_seen[turns] += 1
+        if player_hp > 0 and boss_hp <= 0:
+            wins += 1
+            player_hp_seen[int(player_hp // HP_BUCKET_SIZE)] += 1
+        else:
+            boss_hp_seen[int(max(0, boss_hp) // HP_BUCKET_SIZE)] += 1
+
+    result.fights += fights
+    result.wins += wins
+    result.total_turns += total_turns
+    return result
+
+
+def simulate(boss_type: str, weapon_type: str, fights: int,
+             seed: Optional[int] = None,
+             boss_weapon_type: Optional[str] = None) -> SimulationResult:
+    """
+    Simulate fights between the Hero and one boss type.
+
+    Args:
+        boss_type (str): Key into BOSS_TYPES
+        weapon_type (str): Player weapon key into WEAPON_TYPES
+        fights (int): Number of fights to run
+        seed (int, optional): Seed for reproducible results
+        boss_weapon_type (str, optional): Fixed boss weapon; by default the
+            boss gets a random weapon each fight, as in Game.setup_game
+
+    Returns:
+        SimulationResult: The outcome statistics
+    """
+    boss_weapons = [boss_weapon_type] if boss_weapon_type else list(WEAPON_TYPES)
+    specs = [fight_spec(boss_type, weapon_type, boss_weapon) for boss_weapon in boss_weapons]
+    return run_fights(specs, fights, random.Random(seed))
+
+
+def simulate_all(fights: int, seed: Optional[int] = None) -> Dict[Tuple[str, str], SimulationResult]:
+    """
+    Simulate every boss against every player weapon.
+
+    Args:
+        fights (int): Number of fights per boss and weapon pairing
+        seed (int, optional): Seed for reproducible results
+
+    Returns:
+        Dict[Tuple[str, str], SimulationResult]: Results keyed by (boss, weapon)
+    """
+    rng = random.Random(seed)
+    return {
+        (boss_type, weapon_type): simulate(boss_type, weapon_type, fights, rng.getrandbits(64))
+        for boss_type in BOSS_TYPES
+        for weapon_type in WEAPON_TYPES
+    }
+
+
+def print_report(results: Dict[Tuple[str, str], SimulationResult]) -> None:
+    """
+    Print a table of win rates and fight lengths.
+
+    Args:
+        results (Dict[Tuple[str, str], SimulationResult]): Simulation results
+    """
+    print(f"{'Boss':<15}{'Weapon':<10}{'Win rate':>10}{'Turns':>8}  Player HP left (wins)")
+    for (boss_type, weapon_type), result in results.items():
+        hp = " ".join(f"{bucket * HP_BUCKET_SIZE}+:{count}"
+                      for bucket, count in sorted(result.player_hp_remaining.items()))
+        print(f"{boss_type:<15}{weapon_type:<10}{result.win_rate:>10.3f}"
+              f"{result.mean_turns:>8.2f}  {hp}")
+
+
+def main() -> None:
+    """Run a full simulation from the command line."""
+    fights = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    start = time.perf_counter()
+    results = simulate_all(fights, seed)
+    elapsed = time.perf_counter() - start
+    print_report(results)
+    total = fights * len(results)
+    print(f"\n{total} fights in {elapsed:.2f}s ({total / elapsed:,.0f} fights/second)")
+
+
+if __name__ == "__main__":
+    main()
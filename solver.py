@@ -0,0 +1,216 @@
+"""
+Exact win probabilities for Hero-vs-boss fights.
+
+A game.Game fight in which the player always attacks is a Markov chain.
+Its state at the start of a turn is the player's HP, the boss's HP and
+the boss's ability cooldown. Every damage amount in a matchup is fixed, so
+the HP values are tracked as counts of hits taken and stay exact. The
+solver works out the probability of every outcome and the expected fight
+length by dynamic programming over those states, memoising each one.
+
+Turns in which nobody is hurt only advance the cooldown, which repeats in
+a short cycle. The solver sums that cycle as a geometric series instead
+of recursing around it forever.
+"""
+import time
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+from character import BOSS_TYPES
+from weapon import WEAPON_TYPES
+from simulation import FightSpec, fight_spec
+
+# Boss ability state at the start of a turn: (ability ready, cooldown)
+Phase = Tuple[bool, int]
+
+
+class FightOdds(NamedTuple):
+    """Exact outcome probabilities and expected length of a fight."""
+    win: float
+    loss: float
+    # Both fall in the same turn; the game counts this as a loss
+    double_knockout: float
+    expected_turns: float
+
+
+def _next_phase(phase: Phase, cooldown: int, has_ability: bool) -> Phase:
+    """The boss's ability state one turn later, following Boss.attack and Boss.update."""
+    ready, remaining = phase
+    if ready and has_ability:
+        ready, remaining = False, cooldown
+    if not ready:
+        remaining -= 1
+        if remaining <= 0:
+            ready = True
+    return ready, remaining
+
+
+def solve(spec: FightSpec) -> FightOdds:
+    """
+    Compute the exact odds of one matchup.
+
+    As in run_fights, the player always attacks, a critical hit is a second
+    attack, and the boss still strikes in the turn it falls.
+
+    Args:
+        spec (FightSpec): The matchup
+
+    Returns:
+        FightOdds: Outcome probabilities and expected number of turns
+
+    Raises:
+        ValueError: If no damage can ever be dealt, so the fight never ends
+    """
+    (player_health, player_damage, player_dodge, boss_health, boss_damage,
+     boss_dodge, ability_damage, ability_cooldown, crit_chance) = spec
+    has_ability = ability_damage > 0
+
+    # Number of player hits landing on the boss this turn: 0, 1 or 2
+    miss = boss_dodge
+    land = 1.0 - boss_dodge
+    player_hits = (
+        (1 - crit_chance) * miss + crit_chance * miss * miss,
+        (1 - crit_chance) * land + crit_chance * 2 * land * miss,
+        crit_chance * land * land
+    )
+    boss_land = 1.0 - player_dodge
+
+    # The ability cycle does not depend on who gets hurt, so work it out once
+    start: Phase = (has_ability, 0)
+    phases = [start]
+    while True:
+        following = _next_phase(phases[-1], ability_cooldown, has_ability)
+        if following in phases:
+            cycle = phases[phases.index(following):]
+            break
+        phases.append(following)
+    next_phase = {phase: _next_phase(phase, ability_cooldown, has_ability) for phase in phases}
+
+    def transitions(phase: Phase) -> Tuple[List[Tuple[float, int, int, int]], float]:
+        """
+        One turn's outcomes from a phase.
+
+        Returns (probability, player hits, boss normal hits, boss ability
+        hits) for every outcome in which someone is hurt, and the
+        probability that nobody is.
+        """
+        boss_turn = [(1.0 - boss_land, 0), (boss_land, 1)]
+        abilities = boss_turn if phase[0] and has_ability else [(1.0, 0)]
+        moves = []
+        stay = 0.0
+        for player_hit_count, p_player in enumerate(player_hits):
+            for p_ability, ability_hit in abilities:
+                for p_normal, hit in boss_turn:
+                    probability = p_player * p_ability * p_normal
+                    if player_hit_count == 0 and hit == 0 and ability_hit == 0:
+                        stay += probability
+                    elif probability > 0.0:
+                        moves.append((probability, player_hit_count, hit, ability_hit))
+        return moves, stay
+
+    steps = {phase: transitions(phase) for phase in phases}
+    # Phases before the cycle, last first, so each one's successor is solved before it
+    transient = phases[:len(phases) - len(cycle)][::-1]
+
+    @lru_cache(maxsize=None)
+    def values(boss_hits: int, normal_hits: int,
+               ability_hits: int) -> Dict[Phase, Tuple[float, float, float]]:
+        """
+        (P(win), P(double knockout), expected turns) from the start of a
+        turn, for every phase of a state in which both are still standing.
+        """
+        progress = {}
+        for phase in phases:
+            moves, stay = steps[phase]
+            after = next_phase[phase]
+            win = knockout = turns = 0.0
+            for probability, player_hit_count, hit, ability_hit in moves:
+                next_boss_hits = boss_hits + player_hit_count
+                next_normal_hits = normal_hits + hit
+                next_ability_hits = ability_hits + ability_hit
+                boss_down = boss_health - next_boss_hits * player_damage <= 0
+                if player_health - (next_normal_hits * boss_damage
+                                    + next_ability_hits * ability_damage) <= 0:
+                    if boss_down:
+                        knockout += probability
+                elif boss_down:
+                    win += probability
+                else:
+                    next_win, next_knockout, next_turns = values(
+                        next_boss_hits, next_normal_hits, next_ability_hits)[after]
+                    win += probability * next_win
+                    knockout += probability * next_knockout
+                    turns += probability * next_turns
+            # Every turn counts once, whether or not anyone was hurt
+            progress[phase] = (win, knockout, turns + 1.0)
+
+        # Turns in which nobody is hurt go round the cycle; from each phase,
+        # V = sum(stay_before_m * progress_m) / (1 - stay_around_cycle)
+        result = {}
+        for position, phase in enumerate(cycle):
+            totals = [0.0, 0.0, 0.0]
+            stay_so_far = 1.0
+            for offset in range(len(cycle)):
+                current = cycle[(position + offset) % len(cycle)]
+                for index in range(3):
+                    totals[index] += stay_so_far * progress[current][index]
+                stay_so_far *= steps[current][1]
+            if stay_so_far >= 1.0:
+                raise ValueError("Nobody can be hurt in this matchup, so the fight never ends")
+            result[phase] = tuple(total / (1.0 - stay_so_far) for total in totals)
+        for phase in transient:
+            stay = steps[phase][1]
+            rest = result[next_phase[phase]]
+            result[phase] = tuple(progress[phase][index] + stay * rest[index] for index in range(3))
+        return result
+
+    win, knockout, expected_turns = values(0, 0, 0)[start]
+    return FightOdds(win, 1.0 - win - knockout, knockout, expected_turns)
+
+
+def solve_matchup(boss_type: str, weapon_type: str) -> FightOdds:
+    """
+    Odds for the Hero with one weapon against a boss holding a random weapon.
+
+    Game.setup_game gives the boss a weapon at random, so the odds are the
+    average over every boss weapon.
+
+    Args:
+        boss_type (str): Key into BOSS_TYPES
+        weapon_type (str): Player weapon key into WEAPON_TYPES
+
+    Returns:
+        FightOdds: The averaged odds
+    """
+    odds = [solve(fight_spec(boss_type, weapon_type, boss_weapon)) for boss_weapon in WEAPON_TYPES]
+    return FightOdds(*(sum(values) / len(odds) for values in zip(*odds)))
+
+
+def solve_all() -> Dict[Tuple[str, str], FightOdds]:
+    """
+    Solve every boss against every player weapon.
+
+    Returns:
+        Dict[Tuple[str, str], FightOdds]: Odds keyed by (boss, weapon)
+    """
+    return {
+        (boss_type, weapon_type): solve_matchup(boss_type, weapon_type)
+        for boss_type in BOSS_TYPES
+        for weapon_type in WEAPON_TYPES
+    }
+
+
+def main() -> None:
+    """Print the exact odds of every pairing."""
+    start = time.perf_counter()
+    results = solve_all()
+    elapsed = time.perf_counter() - start
+    print(f"{'Boss':<15}{'Weapon':<10}{'Win':>9}{'Loss':>9}{'Both KO':>9}{'Turns':>8}")
+    for (boss_type, weapon_type), odds in results.items():
+        print(f"{boss_type:<15}{weapon_type:<10}{odds.win:>9.4f}{odds.loss:>9.4f}"
+              f"{odds.double_knockout:>9.4f}{odds.expected_turns:>8.3f}")
+    print(f"\nSolved {len(results)} pairings exactly in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
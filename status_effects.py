@@ -0,0 +1,322 @@
+"""
+Status effects and cooldowns on a hierarchical timer wheel.
+
+Time is counted in turns. A TimerWheel keeps pending timers in buckets by
+due turn: level 0 has one bucket per turn for the next WHEEL_SIZE turns,
+and each higher level has buckets WHEEL_SIZE times as wide, whose timers
+are moved down a level as their turn comes near. Advancing a turn only
+touches the timers due then (and, every WHEEL_SIZE turns, one bucket of
+the level above), so the cost follows the number of timers due, not the
+number pending. Cancelling a timer is O(1).
+
+An EffectEngine puts lasting effects on that wheel:
+    burn, bleed   damage at the end of each turn, bleed stacking
+    freeze        the frozen player loses their next action
+    focus         a temporary attribute bonus
+Durations count ends of turns, starting with the turn the effect lands.
+
+Every Boss gets an engine when it first uses its ability; Boss.update
+advances it, and it runs the ability cooldown. Bosses only inflict effects when their engine is given
+ability_effects, e.g. game.Game(effects=EffectEngine(ABILITY_EFFECTS)),
+so the standard rules are unchanged.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from constants import (
+    ATTRIBUTE_STRENGTH,
+    EFFECT_BURN_DAMAGE, EFFECT_BURN_TURNS, EFFECT_BLEED_DAMAGE, EFFECT_BLEED_TURNS,
+    EFFECT_FREEZE_TURNS, EFFECT_FOCUS_STRENGTH, EFFECT_FOCUS_TURNS
+)
+from abilities import FIRE_BREATH, ICE_NOVA, SHADOW_STRIKE
+from rpg_game.utils.events import EffectEvent
+
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS  # Buckets per level
+WHEEL_LEVELS = 4  # Timers up to WHEEL_SIZE ** WHEEL_LEVELS turns ahead fit without re-filing
+
+_MASK = WHEEL_SIZE - 1
+
+
+class Timer:
+    """A callback due on a given turn; returned by TimerWheel.schedule."""
+    __slots__ = ("deadline", "callback")
+
+    def __init__(self, deadline: int, callback: Optional[Callable[[], None]]):
+        self.deadline = deadline
+        # None once cancelled or fired
+        self.callback = callback
+
+    @property
+    def active(self) -> bool:
+        """Whether the timer has yet to fire and has not been cancelled."""
+        return self.callback is not None
+
+
+class TimerWheel:
+    """Hierarchical timer wheel counting whole turns."""
+
+    def __init__(self):
+        """Initialise an empty wheel at turn 0."""
+        self.now = 0
+        # One dict per level: bucket number -> timers; buckets exist only while in use
+        self._levels: List[Dict[int, List[Timer]]] = [{} for _ in range(WHEEL_LEVELS)]
+        self.pending = 0
+
+    def schedule(self, delay: int, callback: Callable[[], None]) -> Timer:
+        """
+        Call a function after a number of turns.
+
+        Args:
+            delay (int): Turns from now; at least 1
+            callback (Callable[[], None]): Called when the timer is due
+
+        Returns:
+            Timer: Handle for cancel() and remaining()
+        """
+        timer = Timer(self.now + max(1, delay), callback)
+        self._file(timer)
+        self.pending += 1
+        return timer
+
+    def cancel(self, timer: Timer) -> None:
+        """
+        Stop a timer from firing; it is dropped from its bucket when that comes due.
+
+        Args:
+            timer (Timer): A timer from this wheel
+        """
+        if timer.callback is not None:
+            timer.callback = None
+            self.pending -= 1
+
+    def remaining(self, timer: Timer) -> int:
+        """
+        Turns until a timer fires.
+
+        Args:
+            timer (Timer): A timer from this wheel
+
+        Returns:
+            int: Turns left, or 0 if it has fired or been cancelled
+        """
+        return timer.deadline - self.now if timer.callback is not None else 0
+
+    def _file(self, timer: Timer) -> None:
+        """Put a timer in the bucket for its deadline."""
+        delta = timer.deadline - self.now
+        level = min((delta.bit_length() - 1) // WHEEL_BITS, WHEEL_LEVELS - 1) if delta > 0 else 0
+        bucket = (timer.deadline >> (WHEEL_BITS * level)) & _MASK
+        timers = self._levels[level].get(bucket)
+        if timers is None:
+            self._levels[level][bucket] = [timer]
+        else:
+            timers.append(timer)
+
+    def advance(self) -> int:
+        """
+        Move on one turn and fire the timers due.
+
+        Returns:
+            int: Number of timers fired
+        """
+        self.now = now = self.now + 1
+        if not self.pending:
+            # Buckets passed over hold only cancelled timers
+            return 0
+        levels = self._levels
+        if not now & _MASK:
+            # Level 0 has wrapped: move the next bucket of each higher level down
+            for level in range(1, WHEEL_LEVELS):
+                bucket = (now >> (WHEEL_BITS * level)) & _MASK
+                timers = levels[level].pop(bucket, None)
+                if timers:
+                    for timer in timers:
+                        if timer.callback is not None:
+                            self._file(timer)
+                if bucket:
+                    break
+        timers = levels[0].pop(now & _MASK, None)
+        if not timers:
+            return 0
+        fired = 0
+        for timer in timers:
+            callback = timer.callback
+            if callback is None:
+                continue
+            if timer.deadline > now:
+                self._file(timer)  # Beyond the top level's reach; filed again
+                continue
+            timer.callback = None
+            self.pending -= 1
+            fired += 1
+            callback()
+        return fired
+
+
+class Effect(NamedTuple):
+    """A kind of status effect."""
+    name: str
+    duration: int  # Ends of turns the effect lasts
+    damage: float = 0.0  # Dealt to the target at the end of each turn
+    stacks: bool = False  # Whether a second application adds to the first or restarts it
+    attribute: Optional[str] = None  # Attribute raised while the effect lasts
+    amount: int = 0
+
+
+BURN = Effect("burn", EFFECT_BURN_TURNS, damage=EFFECT_BURN_DAMAGE)
+BLEED = Effect("bleed", EFFECT_BLEED_TURNS, damage=EFFECT_BLEED_DAMAGE, stacks=True)
+FREEZE = Effect("freeze", EFFECT_FREEZE_TURNS)
+FOCUS = Effect("focus", EFFECT_FOCUS_TURNS, attribute=ATTRIBUTE_STRENGTH,
+               amount=EFFECT_FOCUS_STRENGTH)
+
+# Boss special ability id -> effect it inflicts when it lands
+ABILITY_EFFECTS = {
+    FIRE_BREATH.id: BURN,
+    ICE_NOVA.id: FREEZE,
+    SHADOW_STRIKE.id: BLEED,
+}
+# Effect of the player's special ability on the player
+PLAYER_ABILITY_EFFECT = FOCUS
+
+
+class ActiveEffect:
+    """One application of an effect to a character."""
+    __slots__ = ("target", "effect", "remaining", "timer")
+
+    def __init__(self, target: Any, effect: Effect):
+        self.target = target
+        self.effect = effect
+        self.remaining = effect.duration
+        self.timer: Optional[Timer] = None
+
+
+class EffectEngine:
+    """
+    Status effects on characters, ticked on a TimerWheel.
+
+    Damage-over-time effects fire every turn until they run out; other
+    effects fire once, when they end.
+    """
+
+    def __init__(self, ability_effects: Optional[Dict[int, Effect]] = None):
+        """
+        Initialise an engine with no effects active.
+
+        Args:
+            ability_effects (Dict[int, Effect], optional): Boss ability id
+                (abilities.Ability.id) -> effect it inflicts; bosses inflict
+                none by default
+        """
+        self.wheel = TimerWheel()
+        self.ability_effects = ability_effects or {}
+        # id(character) -> effect name -> applications in force
+        self._active: Dict[int, Dict[str, List[ActiveEffect]]] = {}
+
+    def advance(self) -> int:
+        """
+        End the turn: tick and expire the effects due.
+
+        Returns:
+            int: Number of timers fired, cooldowns included
+        """
+        return self.wheel.advance()
+
+    def apply(self, target: Any, effect: Effect) -> ActiveEffect:
+        """
+        Put an effect on a character.
+
+        Applying an effect that does not stack to a character that already
+        has it restarts its duration instead.
+
+        Args:
+            target (Character): The character affected
+            effect (Effect): What to apply
+
+        Returns:
+            ActiveEffect: The application in force
+        """
+        effects = self._active.setdefault(id(target), {})
+        applications = effects.get(effect.name)
+        if applications and not effect.stacks:
+            active = applications[0]
+            active.remaining = effect.duration
+            if not effect.damage:
+                # The single end-of-effect timer has to move
+                self.wheel.cancel(active.timer)
+                active.timer = self.wheel.schedule(effect.duration, lambda: self._fire(active))
+            return active
+        active = ActiveEffect(target, effect)
+        effects.setdefault(effect.name, []).append(active)
+        if effect.attribute:
+            target.set_attribute(effect.attribute,
+                                 target.get_attribute(effect.attribute) + effect.amount)
+        delay = 1 if effect.damage else effect.duration
+        active.timer = self.wheel.schedule(delay, lambda: self._fire(active))
+        return active
+
+    def _fire(self, active: ActiveEffect) -> None:
+        """Tick or end an effect whose timer came due."""
+        effect, target = active.effect, active.target
+        if effect.damage:
+            active.remaining -= 1
+            if target.is_alive():
+                target.health = max(0, target.health - effect.damage)
+                if target.events.active:
+                    target.events.emit(EffectEvent(target, effect.name, effect.damage))
+            if active.remaining > 0:
+                active.timer = self.wheel.schedule(1, lambda: self._fire(active))
+                return
+        self._end(active)
+
+    def _end(self, active: ActiveEffect) -> None:
+        """Take an application off its character."""
+        target, effect = active.target, active.effect
+        effects = self._active[id(target)]
+        applications = effects[effect.name]
+        applications.remove(active)
+        if not applications:
+            del effects[effect.name]
+            if not effects:
+                del self._active[id(target)]
+        if effect.attribute:
+            target.set_attribute(effect.attribute,
+                                 target.get_attribute(effect.attribute) - effect.amount)
+
+    def remove(self, target: Any, name: str) -> None:
+        """
+        End every application of an effect on a character now.
+
+        Args:
+            target (Character): The character affected
+            name (str): Effect name, e.g. BURN.name
+        """
+        for active in list(self._active.get(id(target), {}).get(name, ())):
+            self.wheel.cancel(active.timer)
+            self._end(active)
+
+    def has(self, target: Any, name: str) -> bool:
+        """
+        Whether a character is under an effect.
+
+        Args:
+            target (Character): The character
+            name (str): Effect name, e.g. FREEZE.name
+
+        Returns:
+            bool: True if at least one application is in force
+        """
+        effects = self._active.get(id(target))
+        return bool(effects) and name in effects
+
+    def effects_on(self, target: Any) -> Dict[str, int]:
+        """
+        Effects on a character.
+
+        Args:
+            target (Character): The character
+
+        Returns:
+            Dict[str, int]: Effect name -> applications in force
+        """
+        return {name: len(applications)
+                for name, applications in self._active.get(id(target), {}).items()}
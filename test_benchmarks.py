@@ -0,0 +1,30 @@
+"""
+Tests for the benchmark suite and its baselines.
+"""
+from benchmarks.suite import BENCHMARKS, run_suite, compare, save_baseline, load_baseline
+
+
+def test_suite_runs_and_flags_regressions(tmp_path, capsys):
+    """Every benchmark runs, baselines round-trip and slowdowns past the threshold are flagged."""
+    results = run_suite(scale=0.001, repeats=1)
+    assert list(results) == list(BENCHMARKS)
+    assert all(seconds > 0 for seconds in results.values())
+
+    path = str(tmp_path / "baselines" / "host.json")
+    assert load_baseline(path) is None
+    save_baseline({"fast": 1.0, "slow": 1.0}, path)
+    save_baseline({"slow": 2.0}, path)
+    assert load_baseline(path) == {"fast": 1.0, "slow": 2.0}
+
+    baseline = {"fast": 1.0, "slow": 1.0}
+    comparisons = compare(baseline, {"fast": 1.1, "slow": 1.5, "added": 1.0}, threshold=0.25)
+    assert [(item.name, item.regressed) for item in comparisons] == [
+        ("fast", False), ("slow", True), ("added", False)]
+    assert comparisons[2].ratio is None
+    capsys.readouterr()
+
+
+def test_bosses_stay_compact_until_they_use_an_ability():
+    """A boss carries no effect engine until its ability cooldown needs one."""
+    from benchmarks.bench_memory import measure, make_boss, make_compact
+    assert measure(make_boss, 5000) < 1.5 * measure(make_compact, 5000)
@@ -0,0 +1,543 @@
+"""
+Tests for the game loop and the tools built on its events.
+"""
+import random
+
+from event_log import EventLogReader, record_games, FLAG_ABILITY
+
+
+def test_event_log_round_trip(tmp_path):
+    """Recorded events can be read back by column and by fight."""
+    directory = str(tmp_path / "events")
+    recorder = record_games(directory, 300, seed=1)
+    with EventLogReader(directory) as log:
+        assert log.rows == recorder.rows > 300
+        fights = log.column("fight")
+        assert list(fights) == sorted(fights)
+        assert "Hero" in log.names
+        assert any(flags & FLAG_ABILITY for flags in log.column("flags"))
+        for fight in (0, 150, 299):
+            start, stop = log.fight_rows(fight)
+            assert stop > start
+            assert set(fights[start:stop]) == {fight}
+            assert list(log.fight(fight)["turn"])[0] == 1
+
+
+def test_event_log_names_beyond_one_byte(tmp_path):
+    """The name table holds more than 256 characters, and says so when full."""
+    import event_log
+    from character import Character
+    from rpg_game.utils.events import AttackEvent
+
+    recorder = event_log.EventRecorder(str(tmp_path / "events"))
+    hero = Character("Hero", 100, 10)
+    for number in range(300):
+        recorder(AttackEvent(hero, Character(f"Goblin {number}", 10, 1), 5.0, False))
+    recorder.close()
+    with EventLogReader(str(tmp_path / "events")) as log:
+        assert log.names[max(log.column("defender"))] == "Goblin 299"
+
+    recorder = event_log.EventRecorder(str(tmp_path / "full"))
+    recorder._names = {str(number): number for number in range(event_log.MAX_NAMES)}
+    try:
+        recorder(AttackEvent(hero, hero, 5.0, False))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a full name table should be reported")
+    recorder.close()
+
+
+def test_event_bus_and_console_renderer():
+    """Subscribers get the events they asked for, and a seeded game renders the same text every time."""
+    from console_renderer import ConsoleRenderer
+    from constants import WELCOME_MESSAGE, VICTORY_MESSAGE, GAME_OVER_MESSAGE
+    from game import Game
+    from rpg_game.utils.events import (
+        EventBus, GameStartEvent, TurnEvent, AttackEvent, DefeatEvent
+    )
+    from rpg_game.utils.input_providers import PolicyInput, always
+
+    bus = EventBus()
+    assert not bus.active
+    everything, attacks = [], []
+    # Kept so the same objects can be unsubscribed
+    to_everything, to_attacks = everything.append, attacks.append
+    bus.subscribe(to_everything)
+    bus.subscribe(to_attacks, AttackEvent)
+    assert bus.active
+    bus.emit(TurnEvent(None, None, 1))
+    bus.emit(AttackEvent(None, None, 5.0, False))
+    assert [type(event) for event in everything] == [TurnEvent, AttackEvent]
+    assert [type(event) for event in attacks] == [AttackEvent]
+    bus.unsubscribe(to_everything)
+    assert bus.active
+    bus.unsubscribe(to_attacks)
+    assert not bus.active
+    bus.emit(TurnEvent(None, None, 2))
+    assert len(everything) == 2 and len(attacks) == 1
+
+    def play(seed):
+        game = Game(seed, player_input=PolicyInput(always('1')))
+        events, lines = [], []
+        game.events.subscribe(events.append)
+        game.events.subscribe(ConsoleRenderer(lines.append))
+        game.run()
+        return game, events, lines
+
+    game, events, lines = play(5)
+    assert type(events[0]) is GameStartEvent and type(events[-1]) is DefeatEvent
+    turns = [event.turn for event in events if type(event) is TurnEvent]
+    assert turns == list(range(1, len(turns) + 1))
+    assert WELCOME_MESSAGE in lines[1]
+    assert "Player: Hero (HP: 100)" in lines
+    assert any(line.startswith("\nHero attacks ") for line in lines)
+    assert lines[-1] == (VICTORY_MESSAGE if game.player.is_alive() else GAME_OVER_MESSAGE)
+    assert play(5)[2] == lines
+
+
+def test_replay_reproduces_recorded_session(monkeypatch, tmp_path):
+    """A recorded session replays to the same end state, and tampering is caught."""
+    from replay import RecordingGame, SessionRecording, ReplayError, replay
+
+    answers = iter(["3", "1", "1", "1", "1", "1", "1", "1", "1", "1", "1", "1"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    game = RecordingGame(seed=1234)
+    game.run()
+    path = str(tmp_path / "session.json")
+    game.recording.save(path)
+
+    recording = SessionRecording.load(path)
+    assert recording.actions[0] == "3"
+    assert replay(recording) == game.recording.end_state
+
+    recording.seed += 1
+    try:
+        replay(recording)
+    except ReplayError:
+        pass
+    else:
+        raise AssertionError("replay with the wrong seed should diverge")
+
+    from status_effects import EffectEngine, ABILITY_EFFECTS
+    try:
+        RecordingGame(seed=1, effects=EffectEngine(ABILITY_EFFECTS))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a session with options a replay cannot rebuild should be refused")
+
+
+def test_savegame_resumes_identically(tmp_path):
+    """A loaded autosave plays on to the same end state as the original game."""
+    from game import Game
+    from replay import capture_end_state
+    from savegame import Autosaver, load_game
+
+    class AttackingGame(Game):
+        def get_player_action(self) -> str:
+            return "1"
+
+    path = str(tmp_path / "autosave.bin")
+    game = AttackingGame(seed=99)
+    game.setup_game()
+    game.player.health = game.boss.health = 400
+    saver = Autosaver(game, path, checkpoint_interval=3)
+    saver.save()
+    # Each snapshot reaches the file at once, so a crash after it keeps it
+    assert load_game(path, game_class=AttackingGame).turn == 0
+    game.play()
+    saver.close()
+    assert game.turn > 5
+
+    # A crash mid-write leaves a partial snapshot, which loading skips
+    with open(path, "ab") as save_file:
+        save_file.write(b"\x01\xff\x00")
+    restored = load_game(path, game_class=AttackingGame)
+    assert restored.turn == game.turn - 1
+    assert type(restored.boss) is type(game.boss)
+    assert restored.player.weapon is game.player.weapon
+
+    restored.play()
+    assert capture_end_state(restored) == capture_end_state(game)
+
+
+def test_game_server_sessions_and_idle_eviction():
+    """Concurrent sessions play independent games, and idle ones are closed."""
+    import asyncio
+    from game_server import GameServer, PROMPT, GAME_OVER_PROMPT, IDLE_CLOSED
+    from rpg_game.utils.metrics import Registry, GameMetrics, MetricsCollector
+
+    async def read_reply(reader):
+        lines = []
+        while not lines or lines[-1] not in (PROMPT, GAME_OVER_PROMPT, IDLE_CLOSED):
+            line = await reader.readline()
+            assert line, "connection closed mid-reply"
+            lines.append(line.decode().rstrip("\n"))
+        return lines
+
+    async def play(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        reply = await read_reply(reader)
+        for _ in range(20):
+            if reply[-1] == GAME_OVER_PROMPT:
+                break
+            writer.write(b"1\n")
+            reply = await read_reply(reader)
+        writer.write(b"QUIT\n")
+        writer.close()
+        return reply[-1]
+
+    async def scenario():
+        collector = MetricsCollector(GameMetrics(Registry()))
+        server = GameServer(port=0, idle_timeout=0.2, seed=3, metrics=collector)
+        await server.start()
+        results = await asyncio.gather(*(play(server.port) for _ in range(5)))
+        assert results == [GAME_OVER_PROMPT] * 5
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await read_reply(reader)
+        writer.write(b"fight\n")
+        assert (await read_reply(reader))[-2:] == ["Invalid choice. Please try again.", PROMPT]
+        assert (await asyncio.wait_for(read_reply(reader), 5))[-1] == IDLE_CLOSED
+        assert server.evicted == 1
+        writer.close()
+
+        # A player who leaves mid-fight leaves nothing behind in the metrics
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await read_reply(reader)
+        writer.write(b"1\n")
+        await read_reply(reader)
+        assert collector._fights
+        writer.close()
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        assert not server.sessions and not collector._fights
+        await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_boss_controller_decides_ability_use():
+    """Boss.attack asks its controller, and the search takes a sure kill within budget."""
+    from boss_ai import ExpectimaxController
+    from game import Game
+    from simulation import create_player, create_boss
+    from rpg_game.utils.input_providers import PolicyInput, always
+
+    class Hold:
+        def use_ability(self, boss, target):
+            return False
+
+    player, boss = create_player("rock"), create_boss("goblin_king", "sword")
+    player.rng = boss.rng = random.Random(0)
+    boss.controller = Hold()
+    player.set_attribute("agility", 0)
+    boss.attack(player)
+    assert boss.ability_ready
+    assert player.health == 100 - boss.stats.attack_damage
+
+    # Ability plus attack finish the player; the attack alone would not
+    player.health = boss.stats.attack_damage + 1
+    controller = ExpectimaxController(time_budget=1.0)
+    boss.controller = controller
+    boss.attack(player)
+    assert not boss.ability_ready and not player.is_alive()
+    assert controller.last_value == 1.0 and controller.moves == 1
+
+    controller = ExpectimaxController(time_budget=0.002)
+    for seed in range(20):
+        Game(seed, player_input=PolicyInput(always('1')), boss_controller=controller).run()
+    assert controller.moves > 0 and controller.max_search_time < 0.05
+
+    # A table hit on a cut-off value leaves the search inexact, so it goes deeper
+    player.health = 100
+    controller = ExpectimaxController(time_budget=1.0)
+    controller._model = controller.model(boss, player)
+    key = (round(player.health, 9), round(boss.health, 9), 0)
+    controller.table[key] = (5, 0.5, False)
+    controller._exact = True
+    assert controller._turn(player.health, boss.health, 0, 3) == 0.5 and not controller._exact
+
+    # With the budget gone the boss falls back on using its ability, searching nothing
+    controller = ExpectimaxController(time_budget=0.0)
+    boss.set_ability_state(0, True)
+    boss.controller = controller
+    boss.attack(player)
+    assert controller.last_depth == 0 and not boss.ability_ready
+
+
+def test_mcts_player_plays_without_touching_game_rng():
+    """The MCTS player attacks when that is best, reuses its node pool and leaves the game's dice alone."""
+    from game import Game
+    from mcts_player import MCTSPlayer, FightRules, FightState, ATTACK
+    from rpg_game.utils.input_providers import PolicyInput, always
+
+    player = MCTSPlayer(playouts=300, seed=1)
+    for seed in range(10):
+        searched = Game(seed, player_input=player)
+        searched.run()
+        scripted = Game(seed, player_input=PolicyInput(always('1')))
+        scripted.run()
+        assert (searched.turn, searched.player.health, searched.boss.health) == (
+            scripted.turn, scripted.player.health, scripted.boss.health)
+
+    capacity = len(player.pool.visits)
+    rules = FightRules(20.0, 0.1, 10.0, 0.1, 2.0, 3, 0.05)
+    assert player.search(FightState(100, 40, True, 0), rules) == ATTACK
+    assert sum(player.last_visits) == player.playouts
+    assert len(player.pool.visits) == capacity
+
+
+def test_metrics_count_every_fight_across_threads(tmp_path):
+    """Per-thread counters add up on scrape and export as Prometheus text."""
+    import threading
+    import urllib.request
+    from game import Game
+    from rpg_game.utils.input_providers import PolicyInput, always
+    from rpg_game.utils.metrics import Registry, GameMetrics, MetricsCollector
+
+    metrics = GameMetrics(Registry())
+    collector = MetricsCollector(metrics)
+
+    def play(seeds, action):
+        for seed in seeds:
+            game = Game(seed, player_input=PolicyInput(always(action)))
+            game.events.subscribe(collector)
+            game.run()
+
+    threads = [threading.Thread(target=play, args=(range(index * 25, index * 25 + 25), '1'))
+               for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    play(range(10), '2')
+
+    snapshot = metrics.registry.snapshot()
+    outcomes = snapshot["rpg_fights_total"]
+    assert sum(outcomes.values()) == 110
+    assert sum(count for (boss, outcome), count in outcomes.items() if outcome == "fled") == 10
+    turns = snapshot["rpg_fight_turns"]
+    assert sum(counts[-1] for counts in turns.values()) == 110
+    assert not collector._fights
+    attacks = snapshot["rpg_attacks_total"]
+    assert {attacker for boss, attacker in attacks} == {"player", "boss"}
+
+    # A worker process's snapshot folds into the parent's registry
+    parent = GameMetrics(Registry())
+    parent.registry.merge(snapshot)
+    parent.registry.merge(snapshot)
+    assert sum(parent.registry.snapshot()["rpg_fights_total"].values()) == 220
+
+    path = str(tmp_path / "rpg.prom")
+    metrics.registry.write(path)
+    with open(path) as metrics_file:
+        text = metrics_file.read()
+    assert "# TYPE rpg_fights_total counter" in text
+    assert 'rpg_fight_turns_bucket{boss="Goblin King",le="+Inf"}' in text
+    server = metrics.registry.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        assert urllib.request.urlopen(url).read().decode() == text
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_initiative_orders_combatants_by_agility():
+    """Faster combatants act more often; equal speeds alternate in the order added."""
+    from character import Character
+    from constants import ATTRIBUTE_AGILITY
+    from initiative import InitiativeScheduler, run_encounter
+
+    hero, boss = Character("Hero", 100, 10), Character("Boss", 100, 10)
+    scheduler = InitiativeScheduler()
+    scheduler.add(hero)
+    scheduler.add(boss)
+    assert [scheduler.next().name for _ in range(4)] == ["Hero", "Boss", "Hero", "Boss"]
+
+    fast, slow = Character("Fast", 100, 10), Character("Slow", 100, 10)
+    fast.set_attribute(ATTRIBUTE_AGILITY, 20)
+    slow.set_attribute(ATTRIBUTE_AGILITY, 0)
+    assert fast.stats.speed == 2 * slow.stats.speed
+    scheduler = InitiativeScheduler()
+    scheduler.add(slow)
+    scheduler.add(fast)
+    turns = [scheduler.next().name for _ in range(30)]
+    assert turns.count("Fast") == 20 and turns[0] == "Fast"
+    scheduler.remove(fast)
+    assert "Fast" not in {scheduler.next().name for _ in range(10)} and len(scheduler) == 1
+
+    rng = random.Random(3)
+    heroes = [Character(f"Hero {number}", 100, 10, rng) for number in range(500)]
+    bosses = [Character(f"Boss {number}", 100, 10, rng) for number in range(500)]
+    result = run_encounter((heroes, bosses), rng)
+    survivors = [sum(member.is_alive() for member in team) for team in (heroes, bosses)]
+    assert result.winner in (0, 1) and survivors[result.winner] > 0 == survivors[1 - result.winner]
+
+    # A boss's ability recharges with its own actions, as in game.Game
+    from constants import ABILITY_COOLDOWN_TURNS
+    from rpg_game.utils.events import EventBus, AbilityEvent
+    from simulation import create_boss
+    boss = create_boss("goblin_king", "sword")
+    boss.health = 1e9
+    boss.events = EventBus()
+    uses = []
+    boss.events.subscribe(uses.append, AbilityEvent)
+    hero = Character("Hero", 1e9, 10, rng)
+    hero.set_attribute(ATTRIBUTE_AGILITY, boss.get_attribute(ATTRIBUTE_AGILITY))
+    boss_actions = 4 * ABILITY_COOLDOWN_TURNS
+    run_encounter(([hero], [boss]), rng, max_actions=2 * boss_actions)
+    assert len(uses) == boss_actions // ABILITY_COOLDOWN_TURNS
+
+
+def test_timer_wheel_and_status_effects():
+    """Timers fire on their turn at any distance; effects tick, stack and wear off."""
+    from character import Character
+    from constants import ATTRIBUTE_STRENGTH, EFFECT_BURN_DAMAGE, EFFECT_BURN_TURNS
+    from simulation import create_boss
+    from status_effects import (
+        TimerWheel, EffectEngine, ABILITY_EFFECTS, BURN, BLEED, FREEZE, FOCUS
+    )
+
+    rng = random.Random(4)
+    wheel = TimerWheel()
+    fired = []
+    expected = {}
+    for number in range(2000):
+        delay = rng.choice((rng.randint(1, 70), rng.randint(60, 5000), rng.randint(4000, 300_000)))
+        timer = wheel.schedule(delay, lambda number=number: fired.append((wheel.now, number)))
+        if number % 7:
+            expected[number] = delay
+        else:
+            wheel.cancel(timer)
+    while wheel.pending:
+        wheel.advance()
+    assert sorted(fired) == sorted((delay, number) for number, delay in expected.items())
+
+    engine = EffectEngine()
+    hero = Character("Hero", 100, 10)
+    engine.apply(hero, BURN)
+    engine.apply(hero, BURN)  # Restarts rather than stacks
+    engine.apply(hero, BLEED)
+    engine.apply(hero, BLEED)
+    engine.apply(hero, FOCUS)
+    assert hero.get_attribute(ATTRIBUTE_STRENGTH) == 10 + FOCUS.amount
+    assert engine.effects_on(hero) == {"burn": 1, "bleed": 2, "focus": 1}
+    for _ in range(EFFECT_BURN_TURNS):
+        engine.advance()
+    assert hero.health == 100 - EFFECT_BURN_TURNS * (EFFECT_BURN_DAMAGE + 2 * BLEED.damage)
+    assert not engine.has(hero, "burn") and engine.has(hero, "bleed")
+    assert hero.get_attribute(ATTRIBUTE_STRENGTH) == 10
+    engine.remove(hero, "bleed")
+    assert not engine.effects_on(hero) and not engine.wheel.pending
+
+    # The ability cooldown runs on the boss's engine, turn for turn as before
+    shared = EffectEngine(ABILITY_EFFECTS)
+    boss = create_boss("ice_sorcerer", "staff")
+    boss.effects = shared
+    target = Character("Hero", 1e9, 10, random.Random(0))
+    target.set_attribute("agility", 0)
+    ready_turns = []
+    for turn in range(1, 10):
+        if boss.ability_ready:
+            ready_turns.append(turn)
+        boss.attack(target)
+        if turn == 1:
+            assert shared.has(target, FREEZE.name) and boss.ability_cooldown == 3
+        boss.update()
+    assert ready_turns == [1, 4, 7]
+    boss.set_ability_state(2, False)
+    assert (boss.ability_ready, boss.ability_cooldown) == (False, 2)
+
+
+def test_ability_registry_dispatches_by_id():
+    """Abilities come from the table, read constants.py and plug in without touching Boss."""
+    import pytest
+    import abilities
+    from character import Boss
+    from constants import ABILITY_ICE_NOVA_DAMAGE
+    from simulation import create_boss
+
+    boss = create_boss("ice_sorcerer", "staff")
+    assert boss.ability is abilities.ICE_NOVA is abilities.ABILITIES[boss.ability.id]
+    assert boss.stats.ability_damage == (
+        boss.base_damage * ABILITY_ICE_NOVA_DAMAGE * (1 + boss.get_attribute("intelligence") / 100))
+    boss.ability = boss.ability.with_scale(2 * ABILITY_ICE_NOVA_DAMAGE)
+    assert boss.ability.id == abilities.ICE_NOVA.id and abilities.ICE_NOVA.scale == ABILITY_ICE_NOVA_DAMAGE
+
+    class FlatAbility(abilities.Ability):
+        def damage(self, base_damage, intelligence):
+            return self.scale
+
+    try:
+        meteor = abilities.register("Meteor", 12.0, FlatAbility)
+        boss = Boss("Test Boss", 50, 8, "Meteor")
+        assert boss.ability is meteor and boss.stats.ability_damage == 12.0
+        target = Boss("Target", 100, 1)
+        target.set_attribute("agility", 0)
+        boss.attack(target)
+        assert target.health < 100 - 12.0 and not boss.ability_ready
+    finally:
+        abilities.ABILITIES.remove(meteor)
+        del abilities._BY_NAME["Meteor"]
+    assert Boss("Test Boss", 50, 8).ability is abilities.NO_ABILITY
+    with pytest.raises(ValueError):
+        Boss("Test Boss", 50, 8, "Unknown")
+
+
+def test_derived_stats_follow_every_change():
+    """The cached stats are recalculated after each setter, and shared weapons cannot be edited."""
+    import pytest
+    from character import Character
+    from weapon import Weapon, get_weapon
+
+    hero = Character("Hero", 100, 10)
+    assert hero.stats.attack_damage == 20.0
+    hero.base_damage = 20
+    assert hero.stats.attack_damage == 40.0
+    hero.weapon = get_weapon("sword")
+    assert hero.stats.attack_damage == 40.0 + get_weapon("sword").damage
+    hero.set_attribute("strength", 0)
+    assert hero.stats.attack_damage == 20.0 + get_weapon("sword").damage
+    hero.attributes["agility"] = 30
+    assert hero.stats.dodge_chance == 0.3
+
+    # A balance change is a new weapon, which the setter picks up
+    with pytest.raises(AttributeError):
+        get_weapon("sword").damage = 100
+    hero.weapon = Weapon("Sword", 100)
+    assert hero.stats.attack_damage == 120.0
+
+
+def test_compact_characters_and_shared_weapons():
+    """Characters and weapons carry no __dict__, weapons are shared, and attributes read like a dict."""
+    import pytest
+    from character import Character, GoblinKing
+    from weapon import WEAPON_TYPES, get_weapon
+    from simulation import create_player
+
+    for instance in (Character("Hero", 100, 10), GoblinKing(), get_weapon("bow")):
+        assert not hasattr(instance, "__dict__")
+    assert get_weapon("bow") is get_weapon("bow") is create_player("bow").weapon
+    assert WEAPON_TYPES["bow"]() is not get_weapon("bow")
+
+    hero = Character("Hero", 100, 10)
+    attributes = hero.attributes
+    assert dict(attributes) == {"strength": 10, "agility": 10, "intelligence": 10}
+    attributes["strength"] = 14
+    assert hero.get_attribute("strength") == 14 and hero.attributes["strength"] == 14
+    with pytest.raises(TypeError):
+        del attributes["strength"]
+
+    # Other attributes are kept as the old per-character dictionary kept them
+    hero.set_attribute("luck", 3)
+    assert hero.get_attribute("luck") == 0 and "luck" not in attributes
+    attributes["luck"] = 3
+    hero.set_attribute("luck", 5)
+    assert hero.get_attribute("luck") == 5 and len(attributes) == 4 and "luck" in dict(attributes)
+    del attributes["luck"]
+    assert "luck" not in attributes and Character("Other", 100, 10).get_attribute("luck") == 0
@@ -0,0 +1,191 @@
+"""
+Tests for the rpg_game package utilities.
+"""
+import os
+
+from rpg_game.character import Character, Boss
+from rpg_game.utils.logger import GameLogger, FileLogBackend
+
+
+def test_file_backend_writes_structured_records_and_rotates(tmp_path):
+    """Records reach the file as tab-separated lines and old files rotate."""
+    path = str(tmp_path / "combat.log")
+    player = Character("Hero", 100, 10, "Rock", 2)
+    boss = Boss("Goblin King", 50, 8)
+    with FileLogBackend(path, max_bytes=2000, backup_count=2, batch_size=10) as backend:
+        logger = GameLogger(log_to_console=False, backend=backend)
+        for damage in range(200):
+            logger.log_combat(player, boss, damage)
+        backend.flush()
+        assert backend.written == 200
+
+    assert os.path.exists(path + ".1") and os.path.exists(path + ".2")
+    assert not os.path.exists(path + ".3")
+    with open(path, encoding="utf-8") as log_file:
+        last = log_file.read().splitlines()[-1]
+    timestamp, kind, attacker, defender, damage = last.split("\t")
+    assert (kind, attacker, defender, damage) == ("COMBAT", "Hero", "Goblin King", "199")
+    assert len(timestamp) == 8
+
+
+def test_file_backend_counts_bytes_and_drops_across_threads(tmp_path):
+    """Rotation splits a batch by encoded size, and every record is written or counted as dropped."""
+    import threading
+
+    path = str(tmp_path / "combat.log")
+    player = Character("Héroïne ⚔", 100, 10, "Rock", 2)
+    boss = Boss("Roi gobelin ☠", 50, 8)
+    with FileLogBackend(path, max_bytes=1000, backup_count=5, batch_size=1000) as backend:
+        logger = GameLogger(log_to_console=False, backend=backend)
+        for damage in range(60):
+            logger.log_combat(player, boss, damage)
+    for name in [path] + [f"{path}.{index}" for index in range(1, 6)]:
+        if os.path.exists(name):
+            assert os.path.getsize(name) <= 1000
+
+    backend = FileLogBackend(str(tmp_path / "busy.log"), buffer_size=16, flush_interval=0.5)
+    threads = [threading.Thread(target=lambda: [backend.write(("t", "COMBAT", "a", "b", 1))
+                                                for _ in range(5000)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    backend.close()
+    assert backend.queued == 20000 and backend.dropped > 0
+    assert backend.written + backend.dropped == backend.queued
+
+
+def test_input_providers_drive_both_games_without_stdin(capsys):
+    """Scripted and policy players run both game loops in-process."""
+    import pytest
+    import game as top_level
+    from rpg_game.game import Game
+    from rpg_game.utils.input_providers import (
+        ScriptedInput, PolicyInput, InputExhausted, always
+    )
+
+    script = ScriptedInput(["ada", " scissors "])
+    game = Game(player_input=script)
+    game.run()
+    assert game.player.name == "Ada"
+    assert game.player.weapon.name == "Scissors"
+    assert script.used == 2
+
+    bot = top_level.Game(seed=5, player_input=PolicyInput(always('1')))
+    bot.run()
+    assert not (bot.player.is_alive() and bot.boss.is_alive())
+
+    with pytest.raises(InputExhausted):
+        top_level.Game(seed=5, player_input=ScriptedInput([])).run()
+    with pytest.raises(ValueError):
+        Game(player_input=ScriptedInput(["Ada", "Spoon"])).run()
+    capsys.readouterr()
+
+
+def test_screen_renderer_redraws_only_changed_lines(monkeypatch):
+    """After the first frame, only lines that changed are sent to the terminal."""
+    import io
+    import os
+    from rpg_game.utils.screen import ScreenRenderer, CLEAR_SCREEN, move_to
+
+    class Terminal(io.StringIO):
+        def isatty(self):
+            return True
+
+    monkeypatch.setattr("shutil.get_terminal_size", lambda: os.terminal_size((80, 24)))
+    terminal = Terminal()
+    renderer = ScreenRenderer(terminal)
+    renderer.render("Hero\nHealth: 100\nGoblin King\nHealth: 50")
+    assert terminal.getvalue().startswith(CLEAR_SCREEN)
+
+    terminal.seek(0)
+    terminal.truncate()
+    renderer.render("Hero\nHealth: 100\nGoblin King\nHealth: 41")
+    output = terminal.getvalue()
+    assert CLEAR_SCREEN not in output
+    assert move_to(3) + "Health: 41" in output
+    assert "Hero" not in output and "Goblin King" not in output
+    assert renderer.frames == 2 and renderer.lines_written == 5
+
+    # A line too wide for the terminal forces a full redraw
+    terminal.seek(0)
+    terminal.truncate()
+    renderer.render("x" * 100)
+    assert terminal.getvalue().startswith(CLEAR_SCREEN)
+
+    # Messages and a prompt printed below a game's frame leave it drawn in full next time
+    from rpg_game.game import Game
+    from rpg_game.utils.input_providers import ScriptedInput
+    from rpg_game.utils.instrumentation import Instrumentation
+
+    class AtKeyboard(ScriptedInput):
+        interactive = True
+
+    timings = Instrumentation()
+    game = Game(player_input=AtKeyboard([]), timings=timings)
+    game._screen = ScreenRenderer(terminal, timings)
+    game.show_screen("Hero\nHealth: 100")
+    game.show_screen("Hero\nHealth: 90")
+    assert terminal.getvalue().count(CLEAR_SCREEN) == 2
+    game.press_enter()
+    game.show_screen("Hero\nHealth: 80")
+    assert terminal.getvalue().count(CLEAR_SCREEN) == 3
+    # Frame times reach the RPG_TIMINGS report
+    assert timings.phases["render"].count == 3 and "render" in timings.report()
+
+
+def test_startup_path_is_lazy_and_leaves_sys_path_alone():
+    """Importing the package loads nothing eagerly, and the game path skips deferred modules."""
+    import subprocess
+    import sys
+    from benchmarks.bench_import import DEFERRED_MODULES
+
+    script = (
+        "import sys\n"
+        "before = list(sys.path)\n"
+        "import rpg_game\n"
+        "assert 'rpg_game.game' not in sys.modules\n"
+        "import rpg_game.main\n"
+        "assert sys.path == before, 'sys.path was modified'\n"
+        f"print([name for name in {DEFERRED_MODULES!r} if name in sys.modules])\n"
+        "assert rpg_game.Game is rpg_game.main.Game\n"
+        "from rpg_game.constants import VICTORY_MESSAGE\n"
+        "assert 'rpg_game.messages' in sys.modules\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "[]"
+
+
+def test_phase_instrumentation_records_both_game_loops(capsys):
+    """Enabled instrumentation fills a histogram per phase; disabled records nothing."""
+    import game as top_level
+    from rpg_game.game import Game
+    from rpg_game.utils.input_providers import PolicyInput, always
+    from rpg_game.utils.instrumentation import Instrumentation, LatencyHistogram
+
+    histogram = LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value * 1000)
+    assert histogram.count == 100_000 and histogram.max == 100_000_000
+    for percent in (50, 90, 99):
+        assert abs(histogram.percentile(percent) - percent * 1_000_000) <= percent * 20_000
+    merged = LatencyHistogram()
+    merged.merge(histogram)
+    merged.merge(histogram)
+    assert merged.count == 200_000 and merged.percentile(50) == histogram.percentile(50)
+
+    timings = Instrumentation()
+    top_level.Game(seed=2, player_input=PolicyInput(always('1')), timings=timings).run()
+    assert {"input", "player_attack", "boss_attack", "boss_update"} <= set(timings.phases)
+    timings.reset()
+    Game(player_input=PolicyInput(always("Rock")), timings=timings).run()
+    assert {"display", "player_attack", "boss_attack", "logging"} <= set(timings.phases)
+    assert "logging" in timings.report()
+
+    disabled = Instrumentation(enabled=False)
+    Game(player_input=PolicyInput(always("Rock")), timings=disabled).run()
+    assert not disabled.phases
+    capsys.readouterr()
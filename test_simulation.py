@@ -0,0 +1,162 @@
+"""
+Tests for the headless battle simulator.
+"""
+import random
+
+from game import Game
+from simulation import create_player, create_boss, fight_spec, run_fights, simulate
+from weapon import WEAPON_TYPES
+
+
+class _FixedGame(Game):
+    """Game with a fixed matchup instead of random selection."""
+    def __init__(self, boss_type, weapon_type, boss_weapon_type, seed):
+        super().__init__(seed)
+        self.matchup = (boss_type, weapon_type, boss_weapon_type)
+        self.turns = 0
+
+    def setup_game(self):
+        boss_type, weapon_type, boss_weapon_type = self.matchup
+        self.player = create_player(weapon_type)
+        self.boss = create_boss(boss_type, boss_weapon_type)
+        self.player.rng = self.boss.rng = self.rng
+
+    def get_player_action(self):
+        self.turns += 1
+        return '1'
+
+
+def test_simulator_replays_game_exactly(capsys):
+    """With the same seed the simulator reproduces Game.run fight for fight."""
+    for boss_type, weapon_type, boss_weapon_type in [
+        ("goblin_king", "rock", "sword"),
+        ("ice_sorcerer", "staff", "bow"),
+        ("shadow_knight", "paper", "scissors"),
+    ]:
+        spec = fight_spec(boss_type, weapon_type, boss_weapon_type)
+        for seed in range(50):
+            game = _FixedGame(boss_type, weapon_type, boss_weapon_type, seed)
+            game.run()
+            won = game.player.is_alive() and not game.boss.is_alive()
+
+            result = run_fights([spec], 1, random.Random(seed))
+            assert result.wins == int(won)
+            assert result.turns == {game.turns: 1}
+    capsys.readouterr()
+
+
+def test_simulate_is_reproducible():
+    """The same seed gives the same statistics."""
+    first = simulate("goblin_king", "sword", 2000, seed=7)
+    second = simulate("goblin_king", "sword", 2000, seed=7)
+    assert first.fights == 2000
+    assert first.wins == second.wins
+    assert first.turns == second.turns
+    assert first.player_hp_remaining == second.player_hp_remaining
+
+
+def test_batch_simulation_matches_simulator():
+    """The vectorised kernel agrees with the scalar simulator statistically."""
+    from batch_simulation import simulate_batch
+
+    for boss_type, weapon_type in [("goblin_king", "rock"), ("shadow_knight", "sword")]:
+        scalar = simulate(boss_type, weapon_type, 40000, seed=1)
+        batch = simulate_batch(boss_type, weapon_type, 40000, seed=1, chunk_size=15000)
+        assert batch.fights == 40000
+        assert abs(scalar.win_rate - batch.win_rate) < 0.02
+        assert abs(scalar.mean_turns - batch.mean_turns) < 0.05
+
+
+def test_batch_takes_ability_damage_from_the_boss(monkeypatch):
+    """A custom Ability.damage() reaches the vectorised kernel unchanged."""
+    import numpy as np
+    import abilities
+    from batch_simulation import DuelBatch
+    from constants import ABILITY_COOLDOWN_TURNS
+
+    class FlatAbility(abilities.Ability):
+        def damage(self, base_damage, intelligence):
+            return self.scale
+
+    fire = abilities.FIRE_BREATH
+    monkeypatch.setitem(abilities._BY_NAME, fire.name, FlatAbility(fire.id, fire.name, 12.0))
+    batch = DuelBatch.from_matchup("goblin_king", "rock", 4, np.random.default_rng(0))
+    assert (batch.ability_damage == 12.0).all()
+    assert (batch.ability_recharge == ABILITY_COOLDOWN_TURNS).all()
+
+
+def test_parallel_results_do_not_depend_on_worker_count():
+    """Merged statistics are identical for one or several workers."""
+    from parallel_simulation import simulate_parallel, CHUNK_FIGHTS
+
+    pairings = [("goblin_king", "bow"), ("ice_sorcerer", "rock")]
+    fights = CHUNK_FIGHTS * 2 + 123
+    single = simulate_parallel(fights, master_seed=3, workers=1, pairings=pairings)
+    pooled = simulate_parallel(fights, master_seed=3, workers=3, pairings=pairings)
+    for pairing in pairings:
+        assert single[pairing].fights == fights
+        assert vars(single[pairing]) == vars(pooled[pairing])
+
+
+def test_solver_matches_exact_cases_and_simulation():
+    """The Markov solver is exact on a deterministic fight and agrees with sampling."""
+    from simulation import FightSpec
+    from solver import solve, solve_matchup
+
+    certain = FightSpec(100, 50.0, 0.0, 100, 40.0, 0.0, 0.0, 3, 0.0)
+    assert solve(certain) == (1.0, 0.0, 0.0, 2.0)
+    # Boss dies on turn 2 but still swings: both reach 0 HP
+    trade = FightSpec(100, 50.0, 0.0, 100, 50.0, 0.0, 0.0, 3, 0.0)
+    assert solve(trade) == (0.0, 0.0, 1.0, 2.0)
+
+    odds = solve_matchup("shadow_knight", "sword")
+    assert abs(odds.win + odds.loss + odds.double_knockout - 1.0) < 1e-12
+    result = simulate("shadow_knight", "sword", 100_000, seed=3)
+    standard_error = (odds.win * (1 - odds.win) / result.fights) ** 0.5
+    assert abs(result.win_rate - odds.win) < 5 * standard_error
+    assert abs(result.mean_turns - odds.expected_turns) < 0.05
+
+
+def test_balance_tuner_specs_and_search():
+    """Tuner specs match the game at the current constants, and the search is reproducible."""
+    from balance_tuner import PAIRINGS, build_specs, current_parameters, tune
+
+    specs = build_specs(current_parameters())
+    for boss_type, weapon_type in PAIRINGS:
+        assert specs[(boss_type, weapon_type)] == [
+            fight_spec(boss_type, weapon_type, boss_weapon) for boss_weapon in WEAPON_TYPES]
+
+    first = tune(generations=3, population=4, seed=5, workers=1, stages=(100, 400))
+    second = tune(generations=3, population=4, seed=5, workers=1, stages=(100, 400))
+    assert first.parameters == second.parameters
+    assert [record[:-1] for record in first.history] == [record[:-1] for record in second.history]
+    assert len(first.history) == 3
+    assert all(record.fights > 0 for record in first.history)
+
+
+def test_matrix_runner_recomputes_only_changed_cells(tmp_path, monkeypatch):
+    """A rerun is served from the cache, and a weapon edit only re-solves its own cells."""
+    from matrix_runner import ResultCache, run_matrix, write_columns, read_columns
+    import weapon
+    from weapon import Weapon, get_weapon
+
+    grid = {"strength": (10,), "agility": (5, 10), "intelligence": (10,)}
+    cache = ResultCache(str(tmp_path / "cache"))
+    first = run_matrix(grid, cache)
+    assert first.cells == 6 * 3 * 6 * 2 and first.solved > 0
+    assert first.solved + first.cached == first.cells
+
+    again = run_matrix(grid, cache)
+    assert again.solved == 0 and again.rows == first.rows
+
+    # Cells where the sword is held by either side: 3 bosses x 2 grid points x 11 pairs
+    # Weapons are shared and read-only, so an edit swaps in a new one
+    sword = get_weapon("sword")
+    monkeypatch.setitem(weapon._shared_weapons, "sword",
+                        Weapon(sword.name, 9, sword.special_effect))
+    edited = run_matrix(grid, cache)
+    assert 0 < edited.solved <= 3 * 2 * 11
+    assert edited.rows != first.rows
+
+    write_columns(edited.rows, str(tmp_path / "columns"))
+    assert read_columns(str(tmp_path / "columns")) == edited.rows
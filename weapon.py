@@ -1,11 +1,19 @@
-from typing import Optional
+from typing import Dict, Optional
 from constants import (
     WEAPON_ROCK_DAMAGE, WEAPON_PAPER_DAMAGE, WEAPON_SCISSORS_DAMAGE,
     WEAPON_SWORD_DAMAGE, WEAPON_BOW_DAMAGE, WEAPON_STAFF_DAMAGE
 )
 
 class Weapon:
-    """Base class for all weapons in the game."""
+    """
+    Base class for all weapons in the game.
+    
+    Damage is read-only: characters share weapons (see get_weapon) and
+    cache stats worked out from them, so a balance change takes a new
+    Weapon rather than editing one in use.
+    """
+    __slots__ = ("name", "_damage", "special_effect")
+
     def __init__(self, name: str, damage: int, special_effect: str = None):
         """
         Initialize a weapon with a name, damage value, and optional special effect.
@@ -16,9 +24,14 @@ class Weapon:
             special_effect (str, optional): Special effect description
         """
         self.name = name
-        self.damage = damage
+        self._damage = damage
         self.special_effect = special_effect
 
+    @property
+    def damage(self) -> int:
+        """Base damage value of the weapon."""
+        return self._damage
+
     def attack(self) -> int:
         """
         Return the weapon's damage value.
@@ -26,7 +39,7 @@ class Weapon:
         Returns:
             int: The damage value of the weapon
         """
-        return self.damage
+        return self._damage
 
     def get_description(self) -> str:
         """
@@ -42,31 +55,43 @@ class Weapon:
 
 class Rock(Weapon):
     """Basic melee weapon."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Rock", WEAPON_ROCK_DAMAGE, "Basic blunt force")
 
 class Paper(Weapon):
     """Light projectile weapon."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Paper", WEAPON_PAPER_DAMAGE, "Light and quick")
 
 class Scissors(Weapon):
     """Sharp melee weapon."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Scissors", WEAPON_SCISSORS_DAMAGE, "Sharp and precise")
 
 class Sword(Weapon):
     """Powerful melee weapon."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Sword", WEAPON_SWORD_DAMAGE, "Heavy slashing damage")
 
 class Bow(Weapon):
     """Ranged weapon."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Bow", WEAPON_BOW_DAMAGE, "Long-range precision")
 
 class Staff(Weapon):
     """Magical weapon."""
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Staff", WEAPON_STAFF_DAMAGE, "Channel magical energy")
 
@@ -79,3 +104,25 @@ WEAPON_TYPES = {
     "bow": Bow,
     "staff": Staff
 }
+
+# One shared instance per weapon type, handed out by get_weapon()
+_shared_weapons: Dict[str, Weapon] = {}
+
+def get_weapon(weapon_type: str) -> Weapon:
+    """
+    Return the shared instance of a weapon type.
+    
+    Weapons are never changed during play, so every character can hold the
+    same object (a flyweight) instead of its own copy. Create the class
+    directly, e.g. WEAPON_TYPES["rock"](), if a private copy is needed.
+    
+    Args:
+        weapon_type (str): Key into WEAPON_TYPES
+        
+    Returns:
+        Weapon: The shared weapon
+    """
+    weapon = _shared_weapons.get(weapon_type)
+    if weapon is None:
+        weapon = _shared_weapons[weapon_type] = WEAPON_TYPES[weapon_type]()
+    return weapon